@@ -1,6 +1,7 @@
 # backend/api/admin.py
 from django.contrib import admin
 from .models import College, Department, Course, Issue, Notification
+from .notification_templates import render_notification
 
 @admin.register(College)
 class CollegeAdmin(admin.ModelAdmin):
@@ -107,9 +108,14 @@ class IssueAdmin(admin.ModelAdmin):
 
 @admin.register(Notification)
 class NotificationAdmin(admin.ModelAdmin):
-    list_display = ('user', 'notification_type', 'message', 'created_at', 'read')
+    list_display = ('user', 'notification_type', 'rendered_message', 'created_at', 'read')
     list_filter = ('notification_type', 'read', 'created_at')
-    search_fields = ('message', 'user__email', 'user__first_name', 'user__last_name')
+    list_select_related = ('user', 'issue__course')
+    search_fields = ('message', 'issue__title', 'user__email', 'user__first_name', 'user__last_name')
     date_hierarchy = 'created_at'
     readonly_fields = ('created_at',)
     list_per_page = 25
+
+    @admin.display(description='Message')
+    def rendered_message(self, obj):
+        return render_notification(obj)
@@ -0,0 +1,94 @@
+# backend/api/analytics.py
+"""
+Resolution-time analytics over ``IssueStatusHistory``.
+
+Per issue, the first assignment and the first move to Solved are looked up
+with correlated subqueries (served by the history indexes). Percentiles are
+then picked in the database with window functions: rows are numbered by
+duration within each group and only the rows at the nearest-rank positions
+``ceil(p * n)`` are returned, so the result is at most one row per group and
+percentile whatever the number of issues.
+"""
+import math
+
+from django.db.models import (
+    Count, DurationField, ExpressionWrapper, F, OuterRef, Q, Subquery, Value, Window,
+)
+from django.db.models.functions import Ceil, RowNumber
+
+from .models import IssueStatusHistory
+
+DEFAULT_PERCENTILES = (50, 90, 95)
+
+# Grouping dimensions: name -> (group key, label) lookups on Issue; the key
+# doubles as the label when the latter is None
+DIMENSIONS = {
+    'department': ('course__department_id', 'course__department__department_name'),
+    'course': ('course_id', 'course__course_code'),
+    'issue_type': ('issue_type', None),
+}
+
+
+def _first_transition(condition):
+    return Subquery(
+        IssueStatusHistory.objects.filter(condition, issue=OuterRef('pk'))
+        .order_by('changed_at')
+        .values('changed_at')[:1]
+    )
+
+
+def with_transition_times(issues):
+    """
+    Annotate ``time_to_assign`` and ``time_to_solve`` (durations from
+    creation, NULL when the transition never happened).
+    """
+    return issues.annotate(
+        first_assigned_at=_first_transition(Q(to_assignee__isnull=False)),
+        first_solved_at=_first_transition(Q(to_status='Solved')),
+    ).annotate(
+        time_to_assign=ExpressionWrapper(F('first_assigned_at') - F('created_at'), output_field=DurationField()),
+        time_to_solve=ExpressionWrapper(F('first_solved_at') - F('created_at'), output_field=DurationField()),
+    )
+
+
+def _percentile_rows(issues, metric, group, label, percentiles):
+    ranked = (
+        with_transition_times(issues.order_by())
+        .filter(**{f'{metric}__isnull': False})
+        .annotate(
+            position=Window(RowNumber(), partition_by=F(group), order_by=[F(metric).asc(), F('pk').asc()]),
+            size=Window(Count('pk'), partition_by=F(group)),
+        )
+    )
+    wanted = Q(position=F('size'))
+    for p in percentiles:
+        wanted |= Q(position=Ceil(F('size') * Value(p / 100)))
+    return ranked.filter(wanted).values_list(group, label or group, 'position', 'size', metric)
+
+
+def resolution_time_percentiles(issues, dimension, percentiles=DEFAULT_PERCENTILES):
+    """
+    Time-to-assign and time-to-solve percentiles (in seconds) of ``issues``
+    grouped by ``dimension``, one query per metric.
+    """
+    group, label = DIMENSIONS[dimension]
+    groups = {}
+    for metric in ('time_to_assign', 'time_to_solve'):
+        for row in _percentile_rows(issues, metric, group, label, percentiles):
+            key, name, position, size, duration = row if label else (row[0], *row)
+            entry = groups.setdefault(key, {"id": key, "name": name})
+            stats = entry.setdefault(metric, {"count": size})
+            for p in percentiles:
+                if math.ceil(size * (p / 100)) == position:
+                    stats[f"p{p}"] = duration.total_seconds()
+            if position == size:
+                stats["max"] = duration.total_seconds()
+
+    empty = {"count": 0}
+    return sorted(
+        (
+            {**entry, "time_to_assign": entry.get("time_to_assign", empty), "time_to_solve": entry.get("time_to_solve", empty)}
+            for entry in groups.values()
+        ),
+        key=lambda entry: str(entry["name"]),
+    )
@@ -1,13 +1,13 @@
 from django.apps import AppConfig
+from django.core import checks
 
 
 class ApiConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'api'
 
-class IssuesConfig(AppConfig):
-    default_auto_field = 'django.db.models.BigAutoField'
-    name = 'issues'
-
     def ready(self):
-        from . import signals 
\ No newline at end of file
+        from . import signals  # noqa: F401
+        from .search import check_search_index
+
+        checks.register(check_search_index, checks.Tags.database)
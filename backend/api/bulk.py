@@ -0,0 +1,140 @@
+# backend/api/bulk.py
+"""
+Set-wise issue operations: one permission check, one UPDATE and one
+``bulk_create`` per batch instead of a ``save()`` per issue.
+
+``QuerySet.update()`` bypasses ``save()`` and its signals, so everything the
+per-issue paths get from ``post_save`` (notifications, tombstones for the
+previous assignee, statistics counters, dashboard cache invalidation) is
+written here explicitly.
+"""
+from django.db import transaction
+from django.utils import timezone
+
+from .models import Issue, IssueStatusHistory, IssueTombstone
+from .notifications import NotificationFanout
+from .dashboard_cache import invalidate_issue_audience
+from .statistics import bump_counters
+
+
+class BulkPermissionDenied(Exception):
+    def __init__(self, message, issue_ids):
+        super().__init__(message)
+        self.issue_ids = issue_ids
+
+
+def _count_status_moves(rows, new_status):
+    deltas = {}
+    for row in rows:
+        if row['status'] != new_status:
+            deltas[('issues.status', row['status'])] = deltas.get(('issues.status', row['status']), 0) - 1
+            deltas[('issues.status', new_status)] = deltas.get(('issues.status', new_status), 0) + 1
+    bump_counters(deltas)
+
+
+def _invalidate_dashboards(rows, *user_ids, admin=True):
+    invalidate_issue_audience(
+        [*user_ids, *(row['student_id'] for row in rows), *(row['assigned_to_id'] for row in rows)],
+        [row['course_id'] for row in rows],
+        admin=admin,
+    )
+
+
+def _lock_issues(queryset, issue_ids):
+    """
+    Lock and load the requested issues from ``queryset`` (the set the actor
+    may act on). Raise BulkPermissionDenied listing any ids outside it.
+    """
+    rows = list(
+        queryset.select_for_update()
+        .filter(id__in=issue_ids)
+        .order_by('id')
+        .values('id', 'status', 'student_id', 'assigned_to_id', 'course_id')
+    )
+    missing = sorted(set(issue_ids) - {row['id'] for row in rows})
+    if missing:
+        raise BulkPermissionDenied(
+            "Some issues do not exist or you do not have permission to change them.",
+            missing,
+        )
+    return rows
+
+
+def bulk_assign_issues(queryset, issue_ids, assignee, actor=None):
+    """
+    Assign every issue in ``issue_ids`` to ``assignee`` and move it to
+    InProgress, as ``IssueViewSet.assign`` does for a single issue. Issues
+    already assigned to ``assignee`` are left untouched. ``actor`` is
+    recorded in the status history. Returns the number of issues reassigned.
+    """
+    with transaction.atomic():
+        rows = [row for row in _lock_issues(queryset, issue_ids) if row['assigned_to_id'] != assignee.pk]
+        if not rows:
+            return 0
+        now = timezone.now()
+        Issue.objects.filter(id__in=[row['id'] for row in rows]).update(
+            assigned_to=assignee, status='InProgress', updated_at=now
+        )
+        _count_status_moves(rows, 'InProgress')
+        # Assignments alone do not show on the admin dashboard; status counts do
+        _invalidate_dashboards(rows, assignee.pk, admin=any(row['status'] != 'InProgress' for row in rows))
+
+        IssueStatusHistory.objects.bulk_create([
+            IssueStatusHistory(
+                issue_id=row['id'],
+                from_status=row['status'],
+                to_status='InProgress',
+                from_assignee_id=row['assigned_to_id'],
+                to_assignee=assignee,
+                changed_by=actor,
+            )
+            for row in rows
+        ])
+
+        IssueTombstone.objects.bulk_create([
+            IssueTombstone(issue_id=row['id'], assigned_to_id=row['assigned_to_id'], reason='UNASSIGNED')
+            for row in rows
+            if row['assigned_to_id']
+        ])
+
+        fanout = NotificationFanout()
+        for row in rows:
+            fanout.issue_assigned(row['id'], row['student_id'], assignee)
+        fanout.send()
+    return len(rows)
+
+
+def bulk_update_issue_status(queryset, issue_ids, new_status, actor):
+    """
+    Move every issue in ``issue_ids`` to ``new_status``, notifying students
+    (and assignees other than ``actor``) of issues whose status changed.
+    Returns the number of issues whose status changed.
+    """
+    with transaction.atomic():
+        rows = _lock_issues(queryset, issue_ids)
+        changed = [row for row in rows if row['status'] != new_status]
+        if not changed:
+            return 0
+        Issue.objects.filter(id__in=[row['id'] for row in changed]).update(
+            status=new_status, updated_at=timezone.now()
+        )
+        _count_status_moves(changed, new_status)
+        _invalidate_dashboards(changed)
+
+        IssueStatusHistory.objects.bulk_create([
+            IssueStatusHistory(
+                issue_id=row['id'],
+                from_status=row['status'],
+                to_status=new_status,
+                from_assignee_id=row['assigned_to_id'],
+                to_assignee_id=row['assigned_to_id'],
+                changed_by=actor,
+            )
+            for row in changed
+        ])
+
+        fanout = NotificationFanout()
+        for row in changed:
+            fanout.status_changed(row['id'], row['student_id'], row['assigned_to_id'], new_status, actor.pk)
+        fanout.send()
+    return len(changed)
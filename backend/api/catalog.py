@@ -0,0 +1,85 @@
+# backend/api/catalog.py
+"""
+Cached responses for the public catalog: the college, department and course
+lists read by registration and form pages.
+
+Each list is serialized and rendered to JSON once per version of the
+``catalog`` scope of ``api.dashboard_cache``, which every College, Department
+and Course write invalidates (``api.signals``). The rendered body and a strong
+ETag over it are cached together, so a request in steady state reads no rows:
+it is answered from the cache, or with 304 when the client's copy matches.
+Invalidation only reaches other processes through a shared dashboard cache;
+with the default per-process one, a body is rebuilt at least every
+``CATALOG_CACHE_TIMEOUT`` seconds.
+
+Only the plain JSON representation is cached. Requests with query parameters
+(``?fields=``, ``?expand=``) or asking for another format are rendered per
+request by the view, as before.
+
+``catalog_tree()`` loads the college -> department -> course hierarchy, with
+issue counts per node, in three queries. It depends on issues, so it is not
+cached here.
+"""
+import hashlib
+
+from django.conf import settings
+from django.db.models import Count, Prefetch, Q
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_cache_control
+from rest_framework.renderers import JSONRenderer
+
+from .dashboard_cache import CATALOG_SCOPE, cached_value
+from .models import College, Course, Department
+
+CATALOG_CACHE_MAX_AGE = getattr(settings, 'CATALOG_CACHE_MAX_AGE', 3600)
+CATALOG_CACHE_TIMEOUT = getattr(settings, 'CATALOG_CACHE_TIMEOUT', 60)
+
+
+def _render(data):
+    body = JSONRenderer().render(data)
+    return body, '"%s"' % hashlib.md5(body, usedforsecurity=False).hexdigest()
+
+
+def _cache_headers(response, etag):
+    response['ETag'] = etag
+    patch_cache_control(response, public=True, max_age=CATALOG_CACHE_MAX_AGE)
+    return response
+
+
+def catalog_response(request, name, serialize):
+    """
+    The cached JSON response for catalog list ``name``, whose data is
+    ``serialize()``; None when the request needs a response of its own.
+    """
+    if request.query_params or request.accepted_renderer.format != 'json':
+        return None
+    body, etag = cached_value(
+        f'catalog:{name}', [CATALOG_SCOPE], lambda: _render(serialize()), timeout=CATALOG_CACHE_TIMEOUT,
+    )
+    response = get_conditional_response(request, etag=etag)
+    if response is None:
+        response = HttpResponse(body, content_type='application/json')
+    return _cache_headers(response, etag)
+
+
+def catalog_tree(college_id=None, department_id=None):
+    """
+    Colleges with their departments and courses prefetched (one query per
+    level), optionally narrowed to one college or department. Every node is
+    annotated with ``issue_count``; narrowed to a department, its college
+    only counts that department's issues.
+    """
+    college_issues = Q(department__pk=department_id) if department_id is not None else None
+    colleges = College.objects.annotate(issue_count=Count('department__course__issues', filter=college_issues))
+    departments = Department.objects.annotate(issue_count=Count('course__issues'))
+    courses = Course.objects.annotate(issue_count=Count('issues'))
+    if college_id is not None:
+        colleges = colleges.filter(pk=college_id)
+    if department_id is not None:
+        colleges = colleges.filter(pk__in=Department.objects.filter(pk=department_id).values('college_id'))
+        departments = departments.filter(pk=department_id)
+    return colleges.order_by('id').prefetch_related(
+        Prefetch('department_set', queryset=departments.order_by('id').prefetch_related(
+            Prefetch('course_set', queryset=courses.order_by('id')),
+        )),
+    )
@@ -0,0 +1,121 @@
+# backend/api/conditional.py
+"""
+Conditional GET support (weak ETag / Last-Modified) for list and detail views.
+
+Validators come from a cheap aggregate over the queryset being listed,
+``Max(updated_at)`` plus ``Count``, so a matching ``If-None-Match`` or
+``If-Modified-Since`` request is answered with 304 before anything is
+serialized. The count catches deletions, which ``updated_at`` alone cannot;
+as ``If-None-Match`` takes precedence, clients sending both get exact results.
+
+Nested data is covered by passing the serialized relations as ``related``:
+the same aggregate then joins them and adds each one's ``Max(updated_at)``,
+and a count of non-null references, which catches ``SET_NULL`` on delete.
+"""
+import hashlib
+from calendar import timegm
+
+from django.db.models import Count, Max
+from django.utils.cache import get_conditional_response
+from django.utils.http import http_date
+from rest_framework.response import Response
+
+
+def _etag(request, *parts):
+    user = getattr(request, 'user', None)
+    key = [
+        request.get_full_path(),
+        getattr(request, 'accepted_media_type', '') or '',
+        str(getattr(user, 'pk', '') or ''),
+        str(getattr(user, 'role', '') or ''),
+    ]
+    key.extend(str(part) for part in parts)
+    digest = hashlib.md5('|'.join(key).encode('utf-8'), usedforsecurity=False).hexdigest()
+    return f'W/"{digest}"'
+
+
+def _timestamp(value):
+    return timegm(value.utctimetuple()) if value else None
+
+
+def _related_aggregates(related):
+    aggregates = {}
+    for relation in related:
+        aggregates[f'{relation}__modified'] = Max(f'{relation}__updated_at')
+        aggregates[f'{relation}__count'] = Count(relation)
+    return aggregates
+
+
+def _validators(request, last_modified, *parts, related_stats=None):
+    related_stats = related_stats or {}
+    timestamps = [last_modified, *(value for key, value in related_stats.items() if key.endswith('__modified'))]
+    etag = _etag(request, *parts, last_modified.isoformat() if last_modified else '', *related_stats.values())
+    return etag, _timestamp(max(filter(None, timestamps), default=None))
+
+
+def collection_validators(request, queryset, field='updated_at', related=()):
+    """
+    Return ``(etag, last_modified)`` for a list response over ``queryset``,
+    whose rows are serialized with the relations in ``related`` nested.
+    """
+    stats = queryset.order_by().aggregate(
+        last_modified=Max(field), count=Count('pk'), **_related_aggregates(related)
+    )
+    last_modified, count = stats.pop('last_modified'), stats.pop('count')
+    return _validators(request, last_modified, count, related_stats=stats)
+
+
+def object_validators(request, obj, field='updated_at', related=()):
+    """
+    Return ``(etag, last_modified)`` for a detail response for ``obj``,
+    serialized with the relations in ``related`` nested.
+    """
+    stats = None
+    if related:
+        stats = type(obj)._base_manager.filter(pk=obj.pk).aggregate(**_related_aggregates(related))
+    return _validators(request, getattr(obj, field), obj.pk, related_stats=stats)
+
+
+def not_modified(request, validators):
+    """
+    Return a 304 response when the request's preconditions match, else None.
+    """
+    etag, last_modified = validators
+    return get_conditional_response(request, etag=etag, last_modified=last_modified)
+
+
+def set_validators(response, validators):
+    etag, last_modified = validators
+    if response.status_code == 200:
+        response['ETag'] = etag
+        if last_modified is not None:
+            response['Last-Modified'] = http_date(last_modified)
+    return response
+
+
+class ConditionalGetMixin:
+    """
+    ViewSet mixin answering conditional ``list`` and ``retrieve`` requests
+    with 304 Not Modified. ``last_modified_related`` lists the relations
+    the serializer nests.
+    """
+    last_modified_field = 'updated_at'
+    last_modified_related = ()
+
+    def list(self, request, *args, **kwargs):
+        validators = collection_validators(
+            request, self.filter_queryset(self.get_queryset()), self.last_modified_field, self.last_modified_related
+        )
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        return set_validators(super().list(request, *args, **kwargs), validators)
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        validators = object_validators(request, instance, self.last_modified_field, self.last_modified_related)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), validators)
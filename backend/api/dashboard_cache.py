@@ -0,0 +1,168 @@
+# backend/api/dashboard_cache.py
+"""
+Per-user cache for dashboard payloads.
+
+Payloads are stored under keys that embed the current *version* of every
+scope they depend on: ``user:<id>`` for anything the user sees as student,
+assignee or HOD, ``admin`` for the admin dashboard and ``catalog`` for
+course and department names. Invalidation bumps the versions of the affected
+scopes once the writing transaction commits, so stale entries are never read
+again and simply expire.
+
+``cached_value()`` applies the same versioning to other derived data, such as
+the notification recipient sets in ``api.recipients``.
+
+The cache alias is ``DASHBOARD_CACHE_ALIAS`` (process-local memory by default;
+point it at a shared backend when running several workers). Hits and misses
+are counted in the same cache and exposed by ``DashboardCacheStatsView``.
+"""
+import hashlib
+import time
+from functools import wraps
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+DASHBOARD_CACHE_ALIAS = getattr(settings, 'DASHBOARD_CACHE_ALIAS', 'default')
+DASHBOARD_CACHE_TIMEOUT = getattr(settings, 'DASHBOARD_CACHE_TIMEOUT', 300)
+
+ADMIN_SCOPE = 'admin'
+CATALOG_SCOPE = 'catalog'
+
+_PREFIX = 'dashboard'
+_STATS = ('hits', 'misses')
+
+
+def _cache():
+    return caches[DASHBOARD_CACHE_ALIAS]
+
+
+def user_scope(user_id):
+    return f'user:{user_id}'
+
+
+def _version_key(scope):
+    return f'{_PREFIX}:version:{scope}'
+
+
+def _fresh_version():
+    # Never reuse a version after eviction, or stale payloads would come back
+    return time.time_ns()
+
+
+def _versions(scopes):
+    cache = _cache()
+    keys = [_version_key(scope) for scope in scopes]
+    found = cache.get_many(keys)
+    missing = {key: _fresh_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def _bump(scopes):
+    cache = _cache()
+    for scope in set(scopes):
+        try:
+            cache.incr(_version_key(scope))
+        except ValueError:
+            cache.set(_version_key(scope), _fresh_version(), timeout=None)
+
+
+def invalidate(*scopes):
+    """Invalidate every payload depending on ``scopes`` once the current transaction commits."""
+    if scopes:
+        transaction.on_commit(lambda: _bump(scopes))
+
+
+def invalidate_issue_audience(user_ids, course_ids=(), admin=True):
+    """
+    Invalidate the dashboards of everyone who sees an issue: the given
+    students and assignees, the HODs of the issues' departments and, when
+    ``admin``, the admin dashboard (pass False when nothing it shows changed).
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    course_ids = {course_id for course_id in course_ids if course_id}
+
+    def bump():
+        from .models import Course
+        from .recipients import department_hod_ids
+
+        hods = set()
+        if course_ids:
+            department_ids = Course.objects.filter(pk__in=course_ids).values_list('department_id', flat=True)
+            hods = department_hod_ids(set(department_ids))
+        _bump([*([ADMIN_SCOPE] if admin else []), *(user_scope(user_id) for user_id in user_ids | hods)])
+
+    transaction.on_commit(bump)
+
+
+def cached_value(name, scopes, compute, timeout=DASHBOARD_CACHE_TIMEOUT):
+    """
+    Return ``compute()``, cached under ``name`` until one of ``scopes`` is
+    invalidated or ``timeout`` seconds pass. ``compute`` must not return None.
+    """
+    key = f'{_PREFIX}:value:{name}:' + '.'.join(map(str, _versions(scopes)))
+    value = _cache().get(key)
+    if value is None:
+        value = compute()
+        _cache().set(key, value, timeout=timeout)
+    return value
+
+
+def _count(stat):
+    cache = _cache()
+    key = f'{_PREFIX}:stats:{stat}'
+    if not cache.add(key, 1, timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+
+def cache_stats():
+    cache = _cache()
+    values = cache.get_many([f'{_PREFIX}:stats:{stat}' for stat in _STATS])
+    hits, misses = (values.get(f'{_PREFIX}:stats:{stat}', 0) for stat in _STATS)
+    lookups = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_rate": round(hits / lookups, 4) if lookups else None,
+        "backend": settings.CACHES[DASHBOARD_CACHE_ALIAS]['BACKEND'],
+    }
+
+
+def cached_dashboard(*scopes, catalog=True):
+    """
+    Cache successful responses of a dashboard ``get`` per user, role and URL.
+    ``scopes`` are added to the user's own scope and, unless ``catalog`` is
+    False, the catalog scope.
+    """
+    def decorator(get):
+        @wraps(get)
+        def wrapper(self, request, *args, **kwargs):
+            user = request.user
+            depends_on = [user_scope(user.pk), *([CATALOG_SCOPE] if catalog else []), *scopes]
+            versions = _versions(depends_on)
+            url = hashlib.md5(request.build_absolute_uri().encode('utf-8'), usedforsecurity=False).hexdigest()
+            key = f'{_PREFIX}:{user.pk}:{user.role}:{int(user.is_staff)}:{url}:' + '.'.join(map(str, versions))
+
+            data = _cache().get(key)
+            if data is not None:
+                _count('hits')
+                response = Response(data)
+                response['X-Dashboard-Cache'] = 'HIT'
+                return response
+
+            _count('misses')
+            response = get(self, request, *args, **kwargs)
+            if response.status_code == 200:
+                _cache().set(key, response.data, timeout=DASHBOARD_CACHE_TIMEOUT)
+            response['X-Dashboard-Cache'] = 'MISS'
+            return response
+        return wrapper
+    return decorator
@@ -0,0 +1,148 @@
+# backend/api/digests.py
+"""
+Email digests of unread notifications.
+
+Each recipient gets at most one email per period (daily or weekly, per role,
+see ``EMAIL_DIGEST_FREQUENCIES``) listing the notifications they have not
+read. Building a period is one pass over the ``Notification`` table in
+id-ordered chunks, grouping rows per recipient in memory, and ends with a
+``bulk_create`` of the digests. ``DigestRun`` records the period as done.
+
+Sending opens one connection per batch of ``EMAIL_BATCH_SIZE`` digests
+(``django.core.mail.get_connection``, so any email backend works) and records
+the outcome on each digest. Failures are retried on the next run, up to
+``EMAIL_MAX_ATTEMPTS``.
+"""
+import logging
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.db import IntegrityError, transaction
+from django.db.models import F
+from django.utils import timezone
+
+from .models import DigestRun, EmailDigest, Notification
+from .notification_templates import RENDER_FIELDS, render_row
+
+logger = logging.getLogger(__name__)
+
+EMAIL_DIGEST_FREQUENCIES = getattr(settings, 'EMAIL_DIGEST_FREQUENCIES', {})
+EMAIL_DIGEST_CHUNK_SIZE = getattr(settings, 'EMAIL_DIGEST_CHUNK_SIZE', 2000)
+EMAIL_DIGEST_MAX_ITEMS = getattr(settings, 'EMAIL_DIGEST_MAX_ITEMS', 20)
+EMAIL_BATCH_SIZE = getattr(settings, 'EMAIL_BATCH_SIZE', 100)
+EMAIL_MAX_ATTEMPTS = getattr(settings, 'EMAIL_MAX_ATTEMPTS', 3)
+
+PERIOD_NAMES = {'DAILY': 'daily', 'WEEKLY': 'weekly'}
+
+
+def last_period(frequency, now=None):
+    """``(start, end)`` of the last complete day, or week starting on Monday, in local time."""
+    today = timezone.localtime(now).replace(hour=0, minute=0, second=0, microsecond=0)
+    if frequency == 'DAILY':
+        return today - timedelta(days=1), today
+    week = today - timedelta(days=today.weekday())
+    return week - timedelta(days=7), week
+
+
+def _chunks(queryset):
+    last_id = 0
+    while True:
+        rows = list(queryset.filter(id__gt=last_id).order_by('id')[:EMAIL_DIGEST_CHUNK_SIZE])
+        if not rows:
+            return
+        yield rows
+        last_id = rows[-1]['id']
+
+
+def _digest(user_id, frequency, start, end, count, items):
+    lines = [f"You have {count} unread notification{'s' if count != 1 else ''}:", ""]
+    lines.extend(
+        f"- {timezone.localtime(row['created_at']):%Y-%m-%d %H:%M}  {render_row(row)}" for row in items
+    )
+    if count > len(items):
+        lines.append(f"... and {count - len(items)} more.")
+    return EmailDigest(
+        user_id=user_id, frequency=frequency, period_start=start, period_end=end, notification_count=count,
+        subject=f"Your {PERIOD_NAMES[frequency]} issue tracker digest: {count} unread",
+        body="\n".join(lines) + "\n",
+    )
+
+
+def build_digests(frequency, now=None):
+    """
+    Build the digests of the last complete ``frequency`` period, unless that
+    period was already built. Returns the number of digests created.
+    """
+    roles = [role for role, wanted in EMAIL_DIGEST_FREQUENCIES.items() if wanted == frequency]
+    start, end = last_period(frequency, now)
+    if not roles or DigestRun.objects.filter(frequency=frequency, period_start=start).exists():
+        return 0
+
+    unread = Notification.objects.filter(
+        created_at__gte=start, created_at__lt=end, read=False,
+        user__role__in=roles, user__is_active=True,
+    ).exclude(user__email='').values('id', 'user_id', 'created_at', *RENDER_FIELDS)
+    counts, items = {}, {}
+    for rows in _chunks(unread):
+        for row in rows:
+            counts[row['user_id']] = counts.get(row['user_id'], 0) + 1
+            listed = items.setdefault(row['user_id'], [])
+            if len(listed) < EMAIL_DIGEST_MAX_ITEMS:
+                listed.append(row)
+
+    digests = [_digest(user_id, frequency, start, end, count, items[user_id]) for user_id, count in counts.items()]
+    try:
+        with transaction.atomic():
+            # A concurrent build of the same period loses on the unique run
+            DigestRun.objects.create(frequency=frequency, period_start=start, digests=len(digests))
+            EmailDigest.objects.bulk_create(digests, batch_size=500, ignore_conflicts=True)
+    except IntegrityError:
+        return 0
+    return len(digests)
+
+
+def send_digests(batch_size=EMAIL_BATCH_SIZE):
+    """
+    Send the pending digests, reusing one connection per batch. Returns
+    ``(sent, failed)``; failed digests are retried on the next call.
+    """
+    sent = failed = 0
+    last_id = 0
+    while True:
+        batch = list(
+            EmailDigest.objects.filter(status='PENDING', id__gt=last_id)
+            .select_related('user').order_by('id')[:batch_size]
+        )
+        if not batch:
+            return sent, failed
+        last_id = batch[-1].id
+
+        delivered = []
+        with get_connection() as connection:
+            for digest in batch:
+                message = EmailMessage(
+                    digest.subject, digest.body, to=[digest.user.email], connection=connection,
+                )
+                try:
+                    message.send()
+                except Exception as exc:
+                    logger.warning("Sending %s failed: %s", digest, exc)
+                    EmailDigest.objects.filter(pk=digest.pk).update(
+                        attempts=F('attempts') + 1, last_error=str(exc),
+                        status='FAILED' if digest.attempts + 1 >= EMAIL_MAX_ATTEMPTS else 'PENDING',
+                    )
+                    failed += 1
+                else:
+                    delivered.append(digest.pk)
+        EmailDigest.objects.filter(pk__in=delivered).update(
+            status='SENT', sent_at=timezone.now(), attempts=F('attempts') + 1, last_error='',
+        )
+        sent += len(delivered)
+
+
+def deliver_digests(now=None):
+    """Build every due period, then send what is pending."""
+    for frequency in PERIOD_NAMES:
+        build_digests(frequency, now)
+    return send_digests()
@@ -0,0 +1,333 @@
+# backend/api/events.py
+"""
+Server-Sent Events stream of the connected user's notifications
+(``notifications/stream/``), meant to be served over ASGI (see README).
+
+Each process runs one ``NotificationBroker`` poll loop shared by every stream
+it serves: one query per ``SSE_POLL_INTERVAL_SECONDS`` reads the notifications
+changed since a watermark (whichever worker wrote them) and routes them to the
+subscribed users, followed by one lookup of their unread counters. Writes
+made in this process wake the loop at commit, so they are pushed immediately.
+The loop stops when nobody is subscribed, and an idle stream is a coroutine
+parked on its queue, woken only for a heartbeat comment.
+
+Events:
+- ``notification``: a new or updated notification, shaped like
+  ``NotificationSerializer``; its ``id:`` field is a resume token sent back as
+  ``Last-Event-ID`` on reconnect
+- ``unread_count``: ``{"unread": n}`` on connect and whenever it may change
+
+Under WSGI an open stream would hold a worker thread for as long as it lasts.
+There the view answers once instead, with the events after ``Last-Event-ID``
+and an ``unread_count`` event whose id is where to resume, and closes; the
+browser's EventSource reconnects after ``retry`` milliseconds, which turns the
+stream into polling every ``SSE_POLL_INTERVAL_SECONDS``. A poll only sends
+rows older than ``SSE_OVERLAP``, which have committed, so it can resume
+strictly after the last event delivered and never sends one twice.
+
+EventSource cannot set headers, so browsers authenticate with ``?ticket=``,
+from ``POST notifications/stream/ticket/``: a signed ticket that only opens
+this stream, expires after ``SSE_TICKET_SECONDS`` and dies with the user's
+tokens. A stream rejected with 403 should get a new ticket and reconnect,
+passing its last event id as ``?last_event_id=``. Other clients can send the
+access token in the Authorization header.
+"""
+import asyncio
+import logging
+import time
+from datetime import timedelta
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core import signing
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import close_old_connections, transaction
+from django.core.handlers.asgi import ASGIRequest
+from django.db.models import Q
+from django.http import HttpResponse, HttpResponseForbidden, StreamingHttpResponse
+from django.utils import timezone
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from users.authentication import ClaimsJWTAuthentication
+from users.models import User
+from users.tokens import current_token_version
+
+from .models import Notification, UnreadNotificationCount
+from .notification_templates import RENDER_FIELDS, render_row
+from .sync import InvalidWatermark, decode_watermark, encode_watermark
+
+logger = logging.getLogger(__name__)
+
+SSE_POLL_INTERVAL_SECONDS = getattr(settings, 'SSE_POLL_INTERVAL_SECONDS', 2)
+SSE_HEARTBEAT_SECONDS = getattr(settings, 'SSE_HEARTBEAT_SECONDS', 15)
+SSE_BATCH_SIZE = getattr(settings, 'SSE_BATCH_SIZE', 500)
+SSE_REPLAY_LIMIT = 100
+SSE_TICKET_SECONDS = getattr(settings, 'SSE_TICKET_SECONDS', 60)
+SSE_TICKET_SALT = 'api.events.stream-ticket'
+# Rows get updated_at when saved, not when committed: re-read a short window
+SSE_OVERLAP = timedelta(seconds=getattr(settings, 'ISSUE_SYNC_OVERLAP_SECONDS', 2))
+
+_FIELDS = ('id', 'user_id', 'issue_id', 'notification_type', 'created_at', 'updated_at', 'read', *RENDER_FIELDS)
+_encoder = DjangoJSONEncoder(separators=(',', ':'))
+
+
+def _event(name, data, event_id=None):
+    lines = [f"event: {name}"]
+    if event_id:
+        lines.append(f"id: {event_id}")
+    lines.append(f"data: {_encoder.encode(data)}")
+    return "\n".join(lines) + "\n\n"
+
+
+def _notification_event(row):
+    payload = {
+        'id': row['id'],
+        'user': row['user_id'],
+        'issue': row['issue_id'],
+        'message': render_row(row),
+        'notification_type': row['notification_type'],
+        'created_at': row['created_at'],
+        'read': row['read'],
+    }
+    return _event('notification', payload, encode_watermark(row['updated_at'], row['id']))
+
+
+def _unread_counts(user_ids):
+    counts = dict(UnreadNotificationCount.objects.filter(user_id__in=user_ids).values_list('user_id', 'unread'))
+    return {user_id: counts.get(user_id, 0) for user_id in user_ids}
+
+
+class NotificationBroker:
+    def __init__(self):
+        self._subscribers = {}
+        self._loop = None
+        self._task = None
+        self._wakeup = None
+        self._watermark = None
+        self._position = None
+        self._seen = {}
+
+    def subscribe(self, user_id):
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop:
+            self._loop, self._task, self._wakeup = loop, None, asyncio.Event()
+        queue = asyncio.Queue()
+        self._subscribers.setdefault(user_id, set()).add(queue)
+        if self._task is None or self._task.done():
+            self._task = loop.create_task(self._run())
+        return queue
+
+    def unsubscribe(self, user_id, queue):
+        queues = self._subscribers.get(user_id, set())
+        queues.discard(queue)
+        if not queues:
+            self._subscribers.pop(user_id, None)
+
+    def wake(self):
+        """Poll now instead of at the next interval; safe from any thread."""
+        if self._loop is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    async def _run(self):
+        self._watermark, self._position = timezone.now(), None
+        while self._subscribers:
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=SSE_POLL_INTERVAL_SECONDS)
+            except asyncio.TimeoutError:
+                pass
+            self._wakeup.clear()
+            if not self._subscribers:
+                break
+            try:
+                messages, more = await sync_to_async(self._poll, thread_sensitive=False)(set(self._subscribers))
+            except Exception:
+                logger.exception("Notification stream poll failed")
+                continue
+            for user_id, chunks in messages.items():
+                for queue in self._subscribers.get(user_id, ()):
+                    queue.put_nowait(chunks)
+            if more:
+                self._wakeup.set()
+
+    def _poll(self, user_ids):
+        """
+        Read the rows changed since the watermark and build the events for
+        the subscribed users. Returns ``({user_id: [event, ...]}, more)``.
+        """
+        if self._position is None:
+            changed = Q(updated_at__gte=self._watermark - SSE_OVERLAP)
+        else:
+            # Continuing a truncated batch: resume exactly after the last row read
+            since, last_id = self._position
+            changed = Q(updated_at__gt=since) | Q(updated_at=since, id__gt=last_id)
+        close_old_connections()
+        try:
+            rows = list(
+                Notification.objects.filter(changed)
+                .order_by('updated_at', 'id').values(*_FIELDS)[:SSE_BATCH_SIZE]
+            )
+        finally:
+            close_old_connections()
+
+        messages = {}
+        for row in rows:
+            marker = (row['id'], row['updated_at'])
+            if marker in self._seen:
+                continue
+            self._seen[marker] = row['updated_at']
+            if row['user_id'] in user_ids:
+                messages.setdefault(row['user_id'], []).append(_notification_event(row))
+        more = len(rows) == SSE_BATCH_SIZE
+        self._position = (rows[-1]['updated_at'], rows[-1]['id']) if more else None
+        if rows:
+            self._watermark = max(self._watermark, rows[-1]['updated_at'])
+        horizon = self._watermark - SSE_OVERLAP
+        self._seen = {marker: at for marker, at in self._seen.items() if at >= horizon}
+
+        if messages:
+            for user_id, unread in _unread_counts(list(messages)).items():
+                messages[user_id].append(_event('unread_count', {'unread': unread}))
+        return messages, more
+
+
+broker = NotificationBroker()
+
+
+def notifications_changed():
+    """Push notification writes made in this process once they commit."""
+    transaction.on_commit(broker.wake)
+
+
+def stream_ticket(user):
+    """A ticket authenticating ``user`` on the notification stream only."""
+    return signing.dumps({'user': user.pk, 'ver': user.token_version}, salt=SSE_TICKET_SALT)
+
+
+def _ticket_user(ticket):
+    try:
+        payload = signing.loads(ticket, salt=SSE_TICKET_SALT, max_age=SSE_TICKET_SECONDS)
+    except signing.BadSignature:
+        return None
+    version = current_token_version(payload['user'])
+    if version is None or version != payload['ver']:
+        return None
+    return User.from_claims(id=payload['user'], is_active=True, token_version=version)
+
+
+def _authenticate(request):
+    ticket = request.GET.get('ticket')
+    if ticket is not None:
+        return _ticket_user(ticket)
+    auth = ClaimsJWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else None
+    if raw_token is None:
+        return None
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+def _last_event_id(request):
+    return request.headers.get('Last-Event-ID') or request.GET.get('last_event_id')
+
+
+def _unread_event(user, event_id=None):
+    return _event('unread_count', {'unread': _unread_counts([user.pk])[user.pk]}, event_id)
+
+
+def _initial_events(user, last_event_id):
+    """The events replayed when a stream connects."""
+    events = []
+    if last_event_id:
+        try:
+            since, _ = decode_watermark(last_event_id)
+        except InvalidWatermark:
+            since = None
+        if since is not None:
+            rows = list(
+                Notification.objects.filter(user=user, updated_at__gte=since - SSE_OVERLAP)
+                .order_by('updated_at', 'id').values(*_FIELDS)[:SSE_REPLAY_LIMIT]
+            )
+            events.extend(_notification_event(row) for row in rows)
+    events.append(_unread_event(user))
+    return events
+
+
+def _polling_events(user, last_event_id):
+    """
+    The events of one poll: the rows changed after the position in
+    ``last_event_id``, closed by an ``unread_count`` event whose id is the
+    position the next poll resumes from.
+    """
+    settled = timezone.now() - SSE_OVERLAP
+    since, last_id = settled, 0
+    if last_event_id:
+        try:
+            since, last_id = decode_watermark(last_event_id)
+        except InvalidWatermark:
+            pass
+        last_id = last_id or 0
+    rows = list(
+        Notification.objects.filter(user=user, updated_at__lt=settled)
+        .filter(Q(updated_at__gt=since) | Q(updated_at=since, id__gt=last_id))
+        .order_by('updated_at', 'id').values(*_FIELDS)[:SSE_REPLAY_LIMIT]
+    )
+    events = [_notification_event(row) for row in rows]
+    if len(rows) == SSE_REPLAY_LIMIT:
+        resume = encode_watermark(rows[-1]['updated_at'], rows[-1]['id'])
+    elif settled > since:
+        # Everything up to the settled horizon has been sent
+        resume = encode_watermark(settled, 0)
+    else:
+        resume = encode_watermark(since, last_id)
+    events.append(_unread_event(user, resume))
+    return events
+
+
+async def _stream(user_id, queue, initial):
+    try:
+        yield f"retry: {int(SSE_POLL_INTERVAL_SECONDS * 1000)}\n\n"
+        for chunk in initial:
+            yield chunk
+        deadline = time.monotonic() + SSE_HEARTBEAT_SECONDS
+        while True:
+            try:
+                chunks = await asyncio.wait_for(queue.get(), timeout=max(deadline - time.monotonic(), 0))
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                deadline = time.monotonic() + SSE_HEARTBEAT_SECONDS
+                continue
+            for chunk in chunks:
+                yield chunk
+    finally:
+        broker.unsubscribe(user_id, queue)
+
+
+async def notification_stream(request):
+    """
+    Server-Sent Events of the authenticated user's notifications. Authenticate
+    with a stream ticket as ``?ticket=`` or a JWT access token in the
+    Authorization header.
+    """
+    user = await sync_to_async(_authenticate)(request)
+    if user is None:
+        return HttpResponseForbidden("Authentication credentials were not provided or are invalid.")
+
+    if not isinstance(request, ASGIRequest):
+        events = await sync_to_async(_polling_events)(user, _last_event_id(request))
+        response = HttpResponse(
+            f"retry: {int(SSE_POLL_INTERVAL_SECONDS * 1000)}\n\n" + "".join(events),
+            content_type='text/event-stream',
+        )
+        response['Cache-Control'] = 'no-cache'
+        return response
+
+    # Subscribe before reading the initial state so nothing falls in between
+    queue = broker.subscribe(user.pk)
+    initial = await sync_to_async(_initial_events)(user, _last_event_id(request))
+
+    response = StreamingHttpResponse(_stream(user.pk, queue, initial), content_type='text/event-stream')
+    response['Cache-Control'] = 'no-cache'
+    response['X-Accel-Buffering'] = 'no'
+    return response
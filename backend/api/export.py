@@ -0,0 +1,127 @@
+# backend/api/export.py
+"""
+Streaming CSV / NDJSON exports.
+
+Rows are read with ``values_list(...).iterator()``, which fetches them in
+chunks (through a server-side cursor on PostgreSQL) without building model
+instances, and each row is written out as soon as it is read. Memory stays
+flat whatever the size of the export, and the first bytes leave immediately.
+
+CSV text cells that a spreadsheet would read as a formula are prefixed with
+``'``. NDJSON is written as is.
+"""
+import csv
+import json
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import StreamingHttpResponse
+from django.utils import timezone
+from rest_framework.renderers import BaseRenderer
+
+from .notification_templates import RENDER_FIELDS, render_message
+
+EXPORT_CHUNK_SIZE = getattr(settings, 'EXPORT_CHUNK_SIZE', 2000)
+
+# Leading characters that make spreadsheets evaluate a cell (CSV injection)
+CSV_FORMULA_PREFIXES = ('=', '+', '-', '@', '\t', '\r')
+
+ISSUE_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('title', 'title'),
+    ('issue_type', 'issue_type'),
+    ('status', 'status'),
+    ('description', 'description'),
+    ('student_email', 'student__email'),
+    ('course_code', 'course__course_code'),
+    ('department', 'course__department__department_name'),
+    ('assigned_to_email', 'assigned_to__email'),
+    ('created_at', 'created_at'),
+    ('updated_at', 'updated_at'),
+]
+
+NOTIFICATION_EXPORT_COLUMNS = [
+    ('id', 'id'),
+    ('user_email', 'user__email'),
+    ('issue_id', 'issue_id'),
+    ('notification_type', 'notification_type'),
+    ('message', RENDER_FIELDS, render_message),
+    ('read', 'read'),
+    ('created_at', 'created_at'),
+]
+
+
+class _ExportRenderer(BaseRenderer):
+    """
+    Lets DRF negotiate an export format from ``?format=`` or ``Accept``. Export
+    bodies are streamed by the view; the renderer only renders error payloads.
+    """
+    charset = 'utf-8'
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return json.dumps(data, cls=DjangoJSONEncoder).encode(self.charset)
+
+
+class CSVRenderer(_ExportRenderer):
+    media_type = 'text/csv'
+    format = 'csv'
+
+
+class NDJSONRenderer(_ExportRenderer):
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+
+
+class _Echo:
+    """File-like object whose ``write`` returns the value, for csv.writer."""
+    def write(self, value):
+        return value
+
+
+def _csv_cell(value):
+    if isinstance(value, str) and value.startswith(CSV_FORMULA_PREFIXES):
+        return "'" + value
+    return value
+
+
+def _csv_lines(headers, rows):
+    writer = csv.writer(_Echo())
+    yield writer.writerow(headers)
+    for row in rows:
+        yield writer.writerow([_csv_cell(value) for value in row])
+
+
+def _ndjson_lines(headers, rows):
+    encoder = DjangoJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield encoder.encode(dict(zip(headers, row))) + '\n'
+
+
+def stream_export(queryset, columns, export_format, name):
+    """
+    Stream ``queryset`` as CSV or NDJSON. ``columns`` is a list of
+    ``(header, lookup)`` pairs passed to ``values_list``, or of
+    ``(header, lookups, function)`` for a value computed from several lookups.
+    """
+    headers, lookups, getters = [], [], []
+    for header, lookup, *function in columns:
+        headers.append(header)
+        if function:
+            getters.append((slice(len(lookups), len(lookups) + len(lookup)), function[0]))
+            lookups.extend(lookup)
+        else:
+            getters.append((len(lookups), None))
+            lookups.append(lookup)
+    rows = (
+        tuple(function(*row[index]) if function else row[index] for index, function in getters)
+        for row in queryset.values_list(*lookups).iterator(chunk_size=EXPORT_CHUNK_SIZE)
+    )
+    if export_format == 'ndjson':
+        content, content_type, extension = _ndjson_lines(headers, rows), NDJSONRenderer.media_type, 'ndjson'
+    else:
+        content, content_type, extension = _csv_lines(headers, rows), CSVRenderer.media_type, 'csv'
+
+    response = StreamingHttpResponse(content, content_type=content_type)
+    filename = f"{name}-{timezone.now():%Y%m%d-%H%M%S}.{extension}"
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
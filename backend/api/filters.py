@@ -0,0 +1,165 @@
+# backend/api/filters.py
+from datetime import datetime, time, timedelta
+
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+from .models import Issue, Notification
+
+
+def _split(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _parse_ids(param, value):
+    try:
+        return [int(part) for part in _split(value)]
+    except ValueError:
+        raise ValidationError({param: "Expected an id or a comma separated list of ids."})
+
+
+def _parse_bound(param, value, upper):
+    """
+    Parse a datetime or date query parameter into an aware datetime.
+
+    Plain dates cover the whole day: a lower bound starts at midnight and an
+    upper bound stops just before the following midnight, so both stay
+    sargable range conditions on the indexed column.
+    """
+    try:
+        # Dates first: parse_datetime() also accepts a bare date, as midnight
+        day = parse_date(value)
+        parsed = None if day else parse_datetime(value)
+    except ValueError:
+        day = parsed = None
+    if day is not None:
+        if upper:
+            day += timedelta(days=1)
+        return timezone.make_aware(datetime.combine(day, time.min)), not upper
+    if parsed is None:
+        raise ValidationError({param: "Expected an ISO 8601 date or datetime."})
+    if timezone.is_naive(parsed):
+        parsed = timezone.make_aware(parsed)
+    return parsed, True
+
+
+class IssueFilterBackend(BaseFilterBackend):
+    """
+    Server-side filtering for issue listings.
+
+    Supported query parameters (comma separated lists are OR-ed):
+    - status, issue_type
+    - course, student, assigned_to (``assigned_to=none`` for unassigned issues)
+    - department, college (through the issue's course)
+    - created_after, created_before, updated_after, updated_before
+    """
+    exact_filters = {
+        'course': 'course_id',
+        'student': 'student_id',
+        'department': 'course__department_id',
+        'college': 'course__department__college_id',
+    }
+    range_filters = {
+        'created_after': ('created_at', False),
+        'created_before': ('created_at', True),
+        'updated_after': ('updated_at', False),
+        'updated_before': ('updated_at', True),
+    }
+
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        for param, choices in (('status', Issue.STATUS_CHOICES), ('issue_type', Issue.ISSUE_TYPE_CHOICES)):
+            if params.get(param):
+                values = _split(params[param])
+                invalid = set(values) - set(dict(choices))
+                if invalid:
+                    raise ValidationError({param: f"Invalid value(s): {', '.join(sorted(invalid))}"})
+                queryset = queryset.filter(**{f'{param}__in': values})
+
+        for param, lookup in self.exact_filters.items():
+            if params.get(param):
+                queryset = queryset.filter(**{f'{lookup}__in': _parse_ids(param, params[param])})
+
+        assigned_to = params.get('assigned_to')
+        if assigned_to:
+            if assigned_to.lower() == 'none':
+                queryset = queryset.filter(assigned_to__isnull=True)
+            else:
+                queryset = queryset.filter(assigned_to_id__in=_parse_ids('assigned_to', assigned_to))
+
+        for param, (field, upper) in self.range_filters.items():
+            if params.get(param):
+                bound, inclusive = _parse_bound(param, params[param], upper)
+                if upper:
+                    lookup = 'lte' if inclusive else 'lt'
+                else:
+                    lookup = 'gte'
+                queryset = queryset.filter(**{f'{field}__{lookup}': bound})
+
+        return queryset
+
+
+class NotificationFilterBackend(BaseFilterBackend):
+    """
+    Filtering for notification listings and exports.
+
+    Supported query parameters:
+    - notification_type (comma separated), read (true/false)
+    - user (ids; only narrows what the view already exposes)
+    - created_after, created_before
+    """
+    def filter_queryset(self, request, queryset, view):
+        params = request.query_params
+
+        if params.get('notification_type'):
+            values = _split(params['notification_type'])
+            invalid = set(values) - set(dict(Notification.NOTIFICATION_TYPES))
+            if invalid:
+                raise ValidationError({'notification_type': f"Invalid value(s): {', '.join(sorted(invalid))}"})
+            queryset = queryset.filter(notification_type__in=values)
+
+        read = params.get('read')
+        if read:
+            if read.lower() not in ('true', 'false', '1', '0'):
+                raise ValidationError({'read': "Expected true or false."})
+            queryset = queryset.filter(read=read.lower() in ('true', '1'))
+
+        if params.get('user'):
+            queryset = queryset.filter(user_id__in=_parse_ids('user', params['user']))
+
+        if params.get('created_after'):
+            bound, _ = _parse_bound('created_after', params['created_after'], upper=False)
+            queryset = queryset.filter(created_at__gte=bound)
+        if params.get('created_before'):
+            bound, inclusive = _parse_bound('created_before', params['created_before'], upper=True)
+            queryset = queryset.filter(**{'created_at__lte' if inclusive else 'created_at__lt': bound})
+
+        return queryset
+
+
+class IssueOrderingFilter(BaseFilterBackend):
+    """
+    Whitelisted ordering via ``?ordering=``. The primary key is always appended
+    as a tiebreaker so the result can be keyset paginated.
+    """
+    ordering_param = 'ordering'
+    ordering_fields = ('created_at', 'updated_at')
+    default_ordering = ('-created_at', '-id')
+
+    def get_keyset_ordering(self, request, view):
+        value = request.query_params.get(self.ordering_param)
+        if not value:
+            return self.default_ordering
+        field = value.strip()
+        if field.lstrip('-') not in self.ordering_fields:
+            raise ValidationError({
+                self.ordering_param: f"Ordering must be one of: {', '.join(self.ordering_fields)} (prefix with '-' for descending)."
+            })
+        tiebreaker = '-id' if field.startswith('-') else 'id'
+        return (field, tiebreaker)
+
+    def filter_queryset(self, request, queryset, view):
+        return queryset.order_by(*self.get_keyset_ordering(request, view))
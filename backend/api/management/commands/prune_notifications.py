@@ -0,0 +1,28 @@
+from django.core.management.base import BaseCommand
+
+from api.retention import (
+    NOTIFICATION_ARCHIVE, NOTIFICATION_RETENTION_BATCH_SIZE, enforce_retention, expired_notifications,
+    superseded_notifications,
+)
+
+
+class Command(BaseCommand):
+    help = "Collapse repeated notifications and delete or archive expired ones (settings.NOTIFICATION_RETENTION)."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--archive', action='store_true', default=NOTIFICATION_ARCHIVE,
+                            help="Move expired notifications to the archive table instead of deleting them.")
+        parser.add_argument('--batch-size', type=int, default=NOTIFICATION_RETENTION_BATCH_SIZE)
+        parser.add_argument('--pause', type=float, default=0, help="Seconds to sleep between batches.")
+        parser.add_argument('--dry-run', action='store_true', help="Only count the rows that would be removed.")
+
+    def handle(self, *args, archive, batch_size, pause, dry_run, **options):
+        if dry_run:
+            counts = {'collapsed': superseded_notifications().count()}
+            counts.update((label, queryset.count()) for label, queryset in expired_notifications())
+        else:
+            counts = enforce_retention(archive=archive, batch_size=batch_size, pause=pause)
+        for label, n in counts.items():
+            self.stdout.write(f"{label}: {n}")
+        verb = "Would remove" if dry_run else ("Archived or removed" if archive else "Removed")
+        self.stdout.write(self.style.SUCCESS(f"{verb} {sum(counts.values())} notifications."))
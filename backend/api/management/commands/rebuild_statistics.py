@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from api.notifications import rebuild_unread_counts
+from api.statistics import rebuild_statistics
+
+
+class Command(BaseCommand):
+    help = "Recompute the dashboard statistics and unread notification counters from the source tables."
+
+    def handle(self, *args, **options):
+        counts = rebuild_statistics()
+        rebuild_unread_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {len(counts)} statistics counters and the unread counts."))
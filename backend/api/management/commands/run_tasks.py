@@ -0,0 +1,54 @@
+import os
+import socket
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections, connection
+
+from api.tasks import claim_tasks, recover_stale_tasks, run_task, schedule_periodic_tasks
+
+
+def _run_in_thread(task):
+    try:
+        return run_task(task)
+    finally:
+        # Each pool thread has its own connection; don't leave it idle
+        connection.close()
+
+
+class Command(BaseCommand):
+    help = "Run queued background tasks (see api.tasks). Start as many workers as needed."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=4, help="Tasks run in parallel (threads).")
+        parser.add_argument('--poll-interval', type=float, default=1.0, help="Seconds to wait when the queue is empty.")
+        parser.add_argument('--once', action='store_true', help="Run every due task, then exit.")
+        parser.add_argument('--worker-id', default=f"{socket.gethostname()}:{os.getpid()}")
+
+    def handle(self, *args, concurrency, poll_interval, once, worker_id, **options):
+        self.stdout.write(f"Worker {worker_id} started with {concurrency} threads.")
+        running = set()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            try:
+                while True:
+                    close_old_connections()
+                    recover_stale_tasks()
+                    schedule_periodic_tasks()
+
+                    claimed = claim_tasks(worker_id, concurrency - len(running))
+                    running.update(pool.submit(_run_in_thread, task) for task in claimed)
+
+                    if not running:
+                        if once:
+                            break
+                        time.sleep(poll_interval)
+                        continue
+                    done, running = wait(
+                        running, timeout=None if len(running) == concurrency else poll_interval,
+                        return_when=FIRST_COMPLETED,
+                    )
+                    running = set(running)
+            except KeyboardInterrupt:
+                self.stdout.write("Stopping; waiting for running tasks to finish.")
+        self.stdout.write(self.style.SUCCESS(f"Worker {worker_id} stopped."))
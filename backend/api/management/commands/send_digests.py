@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from api.digests import PERIOD_NAMES, build_digests, send_digests
+
+
+class Command(BaseCommand):
+    help = "Build the notification email digests of the last complete periods and send pending ones."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--frequency', choices=list(PERIOD_NAMES), action='append',
+                            help="Only build digests of this frequency (repeatable).")
+        parser.add_argument('--no-build', action='store_true', help="Only send digests already built.")
+        parser.add_argument('--no-send', action='store_true', help="Only build digests.")
+
+    def handle(self, *args, frequency, no_build, no_send, **options):
+        if not no_build:
+            for name in frequency or PERIOD_NAMES:
+                self.stdout.write(f"{name}: built {build_digests(name)} digests")
+        if not no_send:
+            sent, failed = send_digests()
+            self.stdout.write(self.style.SUCCESS(f"Sent {sent} digests, {failed} failed."))
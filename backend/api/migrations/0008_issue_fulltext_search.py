@@ -0,0 +1,73 @@
+from django.db import migrations
+
+# The DDL is copied here rather than imported from api.search, so this
+# migration keeps creating the same index whatever that module becomes.
+
+SQLITE_INSTALL = [
+    """CREATE VIRTUAL TABLE IF NOT EXISTS api_issue_fts USING fts5(
+        title, description,
+        content='api_issue', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS api_issue_fts_ai AFTER INSERT ON api_issue BEGIN
+        INSERT INTO api_issue_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS api_issue_fts_ad AFTER DELETE ON api_issue BEGIN
+        INSERT INTO api_issue_fts(api_issue_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS api_issue_fts_au AFTER UPDATE OF title, description ON api_issue BEGIN
+        INSERT INTO api_issue_fts(api_issue_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO api_issue_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    "INSERT INTO api_issue_fts(api_issue_fts) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    "DROP TRIGGER IF EXISTS api_issue_fts_ai",
+    "DROP TRIGGER IF EXISTS api_issue_fts_ad",
+    "DROP TRIGGER IF EXISTS api_issue_fts_au",
+    "DROP TABLE IF EXISTS api_issue_fts",
+]
+
+POSTGRES_INSTALL = [
+    """ALTER TABLE api_issue ADD COLUMN IF NOT EXISTS search_vector tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('english', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(description, '')), 'B')
+        ) STORED""",
+    """CREATE INDEX IF NOT EXISTS api_issue_search_gin
+        ON api_issue USING GIN (search_vector)""",
+]
+
+POSTGRES_UNINSTALL = [
+    "DROP INDEX IF EXISTS api_issue_search_gin",
+    "ALTER TABLE api_issue DROP COLUMN IF EXISTS search_vector",
+]
+
+
+def run(schema_editor, statements):
+    for statement in statements.get(schema_editor.connection.vendor, []):
+        schema_editor.execute(statement)
+
+
+def forwards(apps, schema_editor):
+    run(schema_editor, {'sqlite': SQLITE_INSTALL, 'postgresql': POSTGRES_INSTALL})
+
+
+def backwards(apps, schema_editor):
+    run(schema_editor, {'sqlite': SQLITE_UNINSTALL, 'postgresql': POSTGRES_UNINSTALL})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0007_issue_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
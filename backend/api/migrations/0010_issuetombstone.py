@@ -0,0 +1,28 @@
+# Generated by Django 5.2 on 2026-10-18 03:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0009_notification_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='IssueTombstone',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('issue_id', models.IntegerField()),
+                ('student_id', models.BigIntegerField(blank=True, null=True)),
+                ('assigned_to_id', models.BigIntegerField(blank=True, null=True)),
+                ('reason', models.CharField(choices=[('DELETED', 'Deleted'), ('UNASSIGNED', 'Unassigned')], default='DELETED', max_length=20)),
+                ('deleted_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['deleted_at'],
+                'indexes': [models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx')],
+            },
+        ),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2 on 2026-10-18 03:42
+
+from django.db import migrations, models
+
+from api.statistics import rebuild_statistics
+
+
+def populate_counters(apps, schema_editor):
+    rebuild_statistics(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0010_issuetombstone'),
+        ('users', '0003_user_department'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='StatCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(max_length=50)),
+                ('key', models.CharField(max_length=50)),
+                ('value', models.BigIntegerField(default=0)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('scope', 'key'), name='unique_stat_counter')],
+            },
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,37 @@
+# Generated by Django 5.2 on 2026-10-18 03:53
+
+from django.conf import settings
+from django.db import migrations, models
+
+from api.notifications import rebuild_unread_counts
+
+
+def populate_counters(apps, schema_editor):
+    rebuild_unread_counts(apps)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0013_task'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='UnreadNotificationCount',
+            fields=[
+                ('user_id', models.BigIntegerField(primary_key=True, serialize=False)),
+                ('unread', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', 'read', '-created_at', '-id'], name='notif_user_read_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+        ),
+        migrations.RunPython(populate_counters, migrations.RunPython.noop),
+    ]
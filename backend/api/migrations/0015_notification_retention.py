@@ -0,0 +1,40 @@
+# Generated by Django 5.2 on 2026-10-18 03:55
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0014_notification_inbox'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationArchive',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('notification_id', models.BigIntegerField(unique=True)),
+                ('user_id', models.BigIntegerField()),
+                ('issue_id', models.IntegerField(blank=True, null=True)),
+                ('message', models.CharField(max_length=255)),
+                ('notification_type', models.CharField(choices=[('ISSUE_CREATED', 'Issue Created'), ('ISSUE_ASSIGNED', 'Issue Assigned'), ('STATUS_CHANGED', 'Status Changed'), ('NEW_ISSUE', 'New Issue'), ('STATUS_UPDATE', 'Status Update')], max_length=20)),
+                ('created_at', models.DateTimeField()),
+                ('read', models.BooleanField(default=False)),
+                ('archived_at', models.DateTimeField(auto_now_add=True)),
+            ],
+            options={
+                'ordering': ['created_at'],
+            },
+        ),
+        migrations.AddIndex(
+            model_name='notification',
+            index=models.Index(fields=['notification_type', 'read', 'created_at'], name='notif_type_read_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='notificationarchive',
+            index=models.Index(fields=['user_id', 'created_at'], name='notif_archive_user_idx'),
+        ),
+    ]
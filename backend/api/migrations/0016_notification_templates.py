@@ -0,0 +1,117 @@
+# Generated by Django 5.2 on 2026-10-18 03:57
+
+import re
+
+from django.db import migrations, models, transaction
+
+BATCH_SIZE = 1000
+
+# Frozen copies of the templates and legacy patterns in api.notification_templates
+# as of this migration; later changes there must not alter what it does.
+TEMPLATES = {
+    'issue_created': "New issue created: {title}",
+    'issue_created_for_course': "New issue '{title}' has been created for {course}",
+    'issue_created_by': "New issue '{title}' has been created by {student}",
+    'issue_assigned': "Issue '{title}' has been assigned to you",
+    'own_issue_assigned': "Your issue '{title}' has been assigned to {assignee}",
+    'issue_status_changed': "Issue '{title}' status changed to {status}",
+    'own_issue_status_changed': "Your issue '{title}' status changed to {status}",
+    'own_issue_status_updated': "Your issue '{title}' status has been updated to {status}",
+}
+
+LEGACY_PATTERNS = [
+    (re.compile(r"New issue created: (?P<title>.*)", re.S), 'issue_created'),
+    (re.compile(r"New issue '(?P<title>.*)' has been created for (?P<course>.*)", re.S), 'issue_created_for_course'),
+    (re.compile(r"New issue '(?P<title>.*)' has been created by (?P<student>.*)", re.S), 'issue_created_by'),
+    (re.compile(r"Issue '(?P<title>.*)' has been assigned to you", re.S), 'issue_assigned'),
+    (re.compile(r"Your issue '(?P<title>.*)' has been assigned to (?P<assignee>.*)", re.S), 'own_issue_assigned'),
+    (re.compile(r"Your issue '(?P<title>.*)' status changed to (?P<status>\w+)", re.S), 'own_issue_status_changed'),
+    (re.compile(r"Your issue '(?P<title>.*)' status has been updated to (?P<status>\w+)", re.S), 'own_issue_status_updated'),
+    (re.compile(r"Issue '(?P<title>.*)' status changed to (?P<status>\w+)", re.S), 'issue_status_changed'),
+]
+
+
+def parse_legacy_message(message, title):
+    for pattern, template in LEGACY_PATTERNS:
+        match = pattern.fullmatch(message)
+        if match is None or match['title'] != title:
+            continue
+        return template, {
+            name: value for name, value in match.groupdict().items() if name not in ('title', 'course')
+        }
+    return None
+
+
+def render_message(template, params, message, title, course):
+    if template not in TEMPLATES:
+        return message
+    return TEMPLATES[template].format(title=title or '', course=course or '', **params)
+
+
+def _batches(queryset):
+    last_id = 0
+    while True:
+        batch = list(queryset.filter(id__gt=last_id).select_related('issue__course').order_by('id')[:BATCH_SIZE])
+        if not batch:
+            return
+        yield batch
+        last_id = batch[-1].id
+
+
+def templatize_messages(apps, schema_editor):
+    """Replace rendered messages that match a template by the template and its params."""
+    Notification = apps.get_model('api', 'Notification')
+    for batch in _batches(Notification.objects.filter(template='', issue__isnull=False)):
+        changed = []
+        for notification in batch:
+            parsed = parse_legacy_message(notification.message, notification.issue.title)
+            if parsed:
+                notification.template, notification.params = parsed
+                notification.message = ''
+                changed.append(notification)
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Notification.objects.bulk_update(changed, ['template', 'params', 'message'])
+
+
+def render_messages(apps, schema_editor):
+    Notification = apps.get_model('api', 'Notification')
+    for batch in _batches(Notification.objects.exclude(template='')):
+        for notification in batch:
+            issue = notification.issue
+            notification.message = render_message(
+                notification.template, notification.params, notification.message,
+                issue.title if issue else None, issue.course.course_name if issue else None,
+            )[:255]
+        with transaction.atomic(using=schema_editor.connection.alias):
+            Notification.objects.bulk_update(batch, ['message'])
+
+
+class Migration(migrations.Migration):
+    # Rewriting every notification in one transaction would hold the write
+    # lock for the whole run; each batch commits on its own instead. The
+    # forward step only picks up rows still without a template, so it
+    # resumes where an interrupted run stopped.
+    atomic = False
+
+    dependencies = [
+        ('api', '0015_notification_retention'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='notification',
+            name='params',
+            field=models.JSONField(blank=True, default=dict),
+        ),
+        migrations.AddField(
+            model_name='notification',
+            name='template',
+            field=models.CharField(blank=True, default='', max_length=40),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='message',
+            field=models.CharField(blank=True, default='', max_length=255),
+        ),
+        migrations.RunPython(templatize_messages, render_messages),
+    ]
@@ -172,6 +172,134 @@ class Issue(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Backs keyset pagination on (created_at, id)
+            models.Index(fields=['-created_at', '-id'], name='issue_created_id_idx'),
+            models.Index(fields=['-updated_at', '-id'], name='issue_updated_id_idx'),
+            # Common filter combinations from the issues API and dashboards
+            models.Index(fields=['assigned_to', 'status', '-created_at'], name='issue_assignee_status_idx'),
+            models.Index(fields=['student', 'status', '-created_at'], name='issue_student_status_idx'),
+            models.Index(fields=['course', 'status', '-created_at'], name='issue_course_status_idx'),
+            models.Index(fields=['status', '-created_at'], name='issue_status_created_idx'),
+        ]
+
+class IssueTombstone(models.Model):
+    """
+    Record of an issue leaving a user's view, so delta-sync clients can drop
+    it: either the issue was deleted, or it was reassigned away from a staff
+    member. Ids are plain integers because the rows they point to may be gone.
+    """
+    REASON_CHOICES = [
+        ('DELETED', 'Deleted'),
+        ('UNASSIGNED', 'Unassigned'),
+    ]
+
+    issue_id = models.IntegerField()
+    student_id = models.BigIntegerField(null=True, blank=True)
+    assigned_to_id = models.BigIntegerField(null=True, blank=True)
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES, default='DELETED')
+    deleted_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.issue_id} - {self.reason} ({self.deleted_at.strftime('%Y-%m-%d %H:%M')})"
+
+    class Meta:
+        ordering = ['deleted_at']
+        indexes = [
+            models.Index(fields=['deleted_at'], name='tombstone_deleted_at_idx'),
+        ]
+
+class IssueStatusHistory(models.Model):
+    """
+    Append-only log of issue status and assignment transitions, including the
+    creation of the issue. Backs the resolution-time analytics in
+    ``api.analytics``.
+    """
+    issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='history')
+    from_status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES, null=True, blank=True)
+    to_status = models.CharField(max_length=20, choices=Issue.STATUS_CHOICES)
+    from_assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    to_assignee = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    changed_by = models.ForeignKey(
+        settings.AUTH_USER_MODEL, on_delete=models.SET_NULL, null=True, blank=True, related_name='+'
+    )
+    changed_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.issue_id}: {self.from_status} -> {self.to_status} ({self.changed_at.strftime('%Y-%m-%d %H:%M')})"
+
+    class Meta:
+        ordering = ['changed_at', 'id']
+        verbose_name_plural = 'issue status history'
+        indexes = [
+            # An issue's timeline, and "first time it reached X" lookups
+            models.Index(fields=['issue', 'changed_at'], name='history_issue_changed_idx'),
+            models.Index(fields=['to_status', 'issue', 'changed_at'], name='history_status_issue_idx'),
+        ]
+
+class StatCounter(models.Model):
+    """
+    Incrementally maintained counter backing dashboard statistics, e.g.
+    ``('issues.status', 'Pending')`` or ``('users.role', 'STUDENT')``.
+    See ``api.statistics`` for the scopes and how they are kept current.
+    """
+    scope = models.CharField(max_length=50)
+    key = models.CharField(max_length=50)
+    value = models.BigIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.scope}:{self.key} = {self.value}"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['scope', 'key'], name='unique_stat_counter')
+        ]
+
+class Task(models.Model):
+    """
+    A background job for ``manage.py run_tasks``. See ``api.tasks``.
+    """
+    STATUS_CHOICES = [
+        ('QUEUED', 'Queued'),
+        ('RUNNING', 'Running'),
+        ('DONE', 'Done'),
+        ('FAILED', 'Failed'),
+    ]
+
+    name = models.CharField(max_length=100)
+    kwargs = models.JSONField(default=dict, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='QUEUED')
+    run_at = models.DateTimeField()
+    attempts = models.PositiveIntegerField(default=0)
+    max_attempts = models.PositiveIntegerField(default=5)
+    # At most one queued or running task per key (periodic jobs, debouncing)
+    dedupe_key = models.CharField(max_length=100, null=True, blank=True)
+    locked_by = models.CharField(max_length=100, blank=True, default='')
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.name} #{self.pk} ({self.status})"
+
+    class Meta:
+        ordering = ['run_at', 'id']
+        indexes = [
+            # The worker's claim query: due queued tasks in run_at order
+            models.Index(fields=['status', 'run_at'], name='task_status_run_at_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(
+                fields=['dedupe_key'],
+                condition=models.Q(status__in=['QUEUED', 'RUNNING']),
+                name='unique_pending_task_key',
+            )
+        ]
 
 class Notification(models.Model):
     NOTIFICATION_TYPES = [
@@ -184,9 +312,14 @@ class Notification(models.Model):
     
     user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='notifications')
     issue = models.ForeignKey(Issue, on_delete=models.CASCADE, related_name='notifications', null=True, blank=True)
-    message = models.CharField(max_length=255)
+    # Rendered at read time from the template, its params and the issue; see
+    # api.notification_templates. message only holds text without a template.
+    template = models.CharField(max_length=40, blank=True, default='')
+    params = models.JSONField(default=dict, blank=True)
+    message = models.CharField(max_length=255, blank=True, default='')
     notification_type = models.CharField(max_length=20, choices=NOTIFICATION_TYPES)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
     read = models.BooleanField(default=False)
     
     def __str__(self):
@@ -194,3 +327,102 @@ class Notification(models.Model):
     
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Inbox pages (optionally filtered on read) and the unread badge
+            models.Index(fields=['user', 'read', '-created_at', '-id'], name='notif_user_read_created_idx'),
+            models.Index(fields=['user', '-created_at', '-id'], name='notif_user_created_idx'),
+            # Retention sweeps (api.retention)
+            models.Index(fields=['notification_type', 'read', 'created_at'], name='notif_type_read_created_idx'),
+        ]
+
+class NotificationArchive(models.Model):
+    """
+    Expired notification moved out of the live table by ``api.retention``
+    when ``NOTIFICATION_ARCHIVE`` is set. Ids are plain integers because the
+    rows they point to may be gone.
+    """
+    notification_id = models.BigIntegerField(unique=True)
+    user_id = models.BigIntegerField()
+    issue_id = models.IntegerField(null=True, blank=True)
+    message = models.CharField(max_length=255)
+    notification_type = models.CharField(max_length=20, choices=Notification.NOTIFICATION_TYPES)
+    created_at = models.DateTimeField()
+    read = models.BooleanField(default=False)
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.notification_type} - {self.user_id} - {self.created_at.strftime('%Y-%m-%d %H:%M')}"
+
+    class Meta:
+        ordering = ['created_at']
+        indexes = [
+            models.Index(fields=['user_id', 'created_at'], name='notif_archive_user_idx'),
+        ]
+
+class UnreadNotificationCount(models.Model):
+    """
+    Per-user unread notification counter, kept in sync by ``api.notifications``
+    and ``api.signals``. The user id is a plain integer, like the tombstone
+    ids, so cascading user deletes never race counter updates.
+    """
+    user_id = models.BigIntegerField(primary_key=True)
+    unread = models.IntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.user_id}: {self.unread} unread"
+
+class EmailDigest(models.Model):
+    """
+    One recipient's email digest of their unread notifications for a period,
+    with its delivery state. Built and sent by ``api.digests``.
+    """
+    FREQUENCY_CHOICES = [
+        ('DAILY', 'Daily'),
+        ('WEEKLY', 'Weekly'),
+    ]
+    STATUS_CHOICES = [
+        ('PENDING', 'Pending'),
+        ('SENT', 'Sent'),
+        ('FAILED', 'Failed'),
+    ]
+
+    user = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name='email_digests')
+    frequency = models.CharField(max_length=10, choices=FREQUENCY_CHOICES)
+    period_start = models.DateTimeField()
+    period_end = models.DateTimeField()
+    notification_count = models.PositiveIntegerField(default=0)
+    subject = models.CharField(max_length=200)
+    body = models.TextField()
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default='PENDING')
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True, default='')
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    def __str__(self):
+        return f"{self.frequency} digest for {self.user_id} from {self.period_start:%Y-%m-%d} ({self.status})"
+
+    class Meta:
+        ordering = ['-period_start', 'id']
+        indexes = [
+            # The sender's queue
+            models.Index(fields=['status', 'id'], name='digest_status_idx'),
+        ]
+        constraints = [
+            models.UniqueConstraint(fields=['user', 'frequency', 'period_start'], name='unique_user_digest_period')
+        ]
+
+class DigestRun(models.Model):
+    """Marks a digest period as built, so it is scanned once."""
+    frequency = models.CharField(max_length=10, choices=EmailDigest.FREQUENCY_CHOICES)
+    period_start = models.DateTimeField()
+    digests = models.PositiveIntegerField(default=0)
+    finished_at = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return f"{self.frequency} {self.period_start:%Y-%m-%d}: {self.digests} digests"
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['frequency', 'period_start'], name='unique_digest_run')
+        ]
@@ -0,0 +1,88 @@
+# backend/api/notification_templates.py
+"""
+Notification message templates.
+
+A notification stores a ``template`` code and a small ``params`` payload
+(e.g. ``{"status": "Solved"}``) instead of its rendered text. The issue title
+and course name are read from the related issue when the message is
+rendered, so renaming an issue never rewrites its notifications. Rendering
+goes through an LRU cache keyed on everything the text depends on.
+
+Rows without a template (older messages that did not match one) keep their
+text in ``Notification.message``, which is returned as is.
+"""
+import re
+from functools import lru_cache
+
+from django.conf import settings
+
+NOTIFICATION_RENDER_CACHE_SIZE = getattr(settings, 'NOTIFICATION_RENDER_CACHE_SIZE', 4096)
+
+TEMPLATES = {
+    'issue_created': "New issue created: {title}",
+    'issue_created_for_course': "New issue '{title}' has been created for {course}",
+    'issue_created_by': "New issue '{title}' has been created by {student}",
+    'issue_assigned': "Issue '{title}' has been assigned to you",
+    'own_issue_assigned': "Your issue '{title}' has been assigned to {assignee}",
+    'issue_status_changed': "Issue '{title}' status changed to {status}",
+    'own_issue_status_changed': "Your issue '{title}' status changed to {status}",
+    'own_issue_status_updated': "Your issue '{title}' status has been updated to {status}",
+}
+
+# Lookups on Notification needed to render a row read with values()
+RENDER_FIELDS = ('template', 'params', 'message', 'issue__title', 'issue__course__course_name')
+
+# Legacy rendered messages -> template, title and course being read from the issue
+_LEGACY_PATTERNS = [
+    (re.compile(r"New issue created: (?P<title>.*)", re.S), 'issue_created'),
+    (re.compile(r"New issue '(?P<title>.*)' has been created for (?P<course>.*)", re.S), 'issue_created_for_course'),
+    (re.compile(r"New issue '(?P<title>.*)' has been created by (?P<student>.*)", re.S), 'issue_created_by'),
+    (re.compile(r"Issue '(?P<title>.*)' has been assigned to you", re.S), 'issue_assigned'),
+    (re.compile(r"Your issue '(?P<title>.*)' has been assigned to (?P<assignee>.*)", re.S), 'own_issue_assigned'),
+    (re.compile(r"Your issue '(?P<title>.*)' status changed to (?P<status>\w+)", re.S), 'own_issue_status_changed'),
+    (re.compile(r"Your issue '(?P<title>.*)' status has been updated to (?P<status>\w+)", re.S), 'own_issue_status_updated'),
+    (re.compile(r"Issue '(?P<title>.*)' status changed to (?P<status>\w+)", re.S), 'issue_status_changed'),
+]
+
+
+@lru_cache(maxsize=NOTIFICATION_RENDER_CACHE_SIZE)
+def _render(template, params, title, course):
+    return TEMPLATES[template].format(title=title or '', course=course or '', **dict(params))
+
+
+def render_message(template, params, message='', title=None, course=None):
+    """The text of a notification; ``message`` when it has no (known) template."""
+    if template not in TEMPLATES:
+        return message
+    return _render(template, tuple(sorted((params or {}).items())), title, course)
+
+
+def render_notification(notification):
+    """Render a Notification instance; load it with ``select_related('issue__course')``."""
+    issue = notification.issue
+    return render_message(
+        notification.template, notification.params, notification.message,
+        issue.title if issue else None, issue.course.course_name if issue else None,
+    )
+
+
+def render_row(row):
+    """Render a notification read with ``values(*RENDER_FIELDS)``."""
+    return render_message(
+        row['template'], row['params'], row['message'], row['issue__title'], row['issue__course__course_name'],
+    )
+
+
+def parse_legacy_message(message, title=None):
+    """
+    ``(template, params)`` for a pre-rendered ``message`` about an issue named
+    ``title``, or None when it matches no template.
+    """
+    for pattern, template in _LEGACY_PATTERNS:
+        match = pattern.fullmatch(message)
+        if match is None or (title is not None and match['title'] != title):
+            continue
+        return template, {
+            name: value for name, value in match.groupdict().items() if name not in ('title', 'course')
+        }
+    return None
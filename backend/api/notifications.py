@@ -0,0 +1,126 @@
+# backend/api/notifications.py
+"""
+Notification fan-out and inbox bookkeeping.
+
+Every notification about an issue goes through ``NotificationFanout``: the
+event methods queue ``(recipient, issue, event)`` entries, duplicates keep the
+first template, and ``send()`` writes everything with a single
+``bulk_create``. Rows hold a template code and its params, not rendered text
+(see ``api.notification_templates``).
+Recipient sets are resolved with at most one query per event, never one per
+recipient.
+
+Unread counts live in ``UnreadNotificationCount``. Set-wise writes here apply
+their deltas directly; single-row saves and deletes go through
+``api.signals``.
+"""
+from collections import Counter
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import Case, Count, F, IntegerField, Value, When
+from django.utils import timezone
+
+from .events import notifications_changed
+from .models import Notification, UnreadNotificationCount
+from .recipients import admin_ids, department_hod_ids
+
+
+def bump_unread(deltas):
+    """Apply ``{user_id: delta}`` to the unread counters in two queries."""
+    deltas = {user_id: delta for user_id, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        UnreadNotificationCount.objects.bulk_create(
+            [UnreadNotificationCount(user_id=user_id) for user_id in deltas],
+            ignore_conflicts=True,
+        )
+        UnreadNotificationCount.objects.filter(user_id__in=deltas).update(unread=F('unread') + Case(
+            *[When(user_id=user_id, then=Value(delta)) for user_id, delta in deltas.items()],
+            default=Value(0),
+            output_field=IntegerField(),
+        ))
+
+
+def unread_count(user_id):
+    return UnreadNotificationCount.objects.filter(user_id=user_id).values_list('unread', flat=True).first() or 0
+
+
+def mark_read(user, ids=None):
+    """
+    Mark ``user``'s unread notifications (all, or those in ``ids``) as read
+    with one UPDATE. Returns the number of notifications changed.
+    """
+    unread = Notification.objects.filter(user=user, read=False)
+    if ids is not None:
+        unread = unread.filter(id__in=ids)
+    with transaction.atomic():
+        updated = unread.update(read=True, updated_at=timezone.now())
+        bump_unread({user.pk: -updated})
+        notifications_changed()
+    return updated
+
+
+def rebuild_unread_counts(apps=global_apps):
+    """
+    Recompute every unread counter with one GROUP BY. ``apps`` may be a
+    migration's historical app registry.
+    """
+    Notification = apps.get_model('api', 'Notification')
+    UnreadNotificationCount = apps.get_model('api', 'UnreadNotificationCount')
+    counts = (
+        Notification.objects.filter(read=False).order_by()
+        .values('user_id').annotate(n=Count('id')).values_list('user_id', 'n')
+    )
+    with transaction.atomic():
+        UnreadNotificationCount.objects.all().delete()
+        UnreadNotificationCount.objects.bulk_create([
+            UnreadNotificationCount(user_id=user_id, unread=n) for user_id, n in counts
+        ])
+
+
+class NotificationFanout:
+    def __init__(self):
+        self._pending = {}
+
+    def add(self, user_id, issue_id, event, template, **params):
+        if user_id:
+            self._pending.setdefault((user_id, issue_id, event), (template, params))
+
+    def issue_created(self, issue):
+        """Admins and the HODs of the issue's department, from the cached recipient sets."""
+        admins = admin_ids()
+        for user_id in admins:
+            self.add(user_id, issue.pk, 'ISSUE_CREATED', 'issue_created')
+        for user_id in department_hod_ids([issue.course.department_id]) - admins:
+            self.add(user_id, issue.pk, 'ISSUE_CREATED', 'issue_created_for_course')
+
+    def issue_assigned(self, issue_id, student_id, assignee):
+        """The new assignee and the student."""
+        self.add(assignee.pk, issue_id, 'ISSUE_ASSIGNED', 'issue_assigned')
+        self.add(
+            student_id, issue_id, 'ISSUE_ASSIGNED', 'own_issue_assigned',
+            assignee=f"{assignee.first_name} {assignee.last_name}",
+        )
+
+    def status_changed(self, issue_id, student_id, assignee_id, new_status, actor_id=None):
+        """The student, and the assignee unless they made the change."""
+        self.add(student_id, issue_id, 'STATUS_CHANGED', 'own_issue_status_changed', status=new_status)
+        if assignee_id != actor_id:
+            self.add(assignee_id, issue_id, 'STATUS_CHANGED', 'issue_status_changed', status=new_status)
+
+    def send(self):
+        """Write the queued notifications; returns them."""
+        notifications = [
+            Notification(user_id=user_id, issue_id=issue_id, notification_type=event, template=template, params=params)
+            for (user_id, issue_id, event), (template, params) in self._pending.items()
+        ]
+        self._pending = {}
+        if not notifications:
+            return []
+        with transaction.atomic():
+            created = Notification.objects.bulk_create(notifications)
+            bump_unread(Counter(notification.user_id for notification in notifications))
+            notifications_changed()
+        return created
@@ -0,0 +1,176 @@
+# backend/api/optimization.py
+from django.core.exceptions import FieldDoesNotExist
+from rest_framework import serializers
+from rest_framework.permissions import SAFE_METHODS
+
+
+class EagerLoadingMixin:
+    """
+    Serializer mixin declaring the relations the serializer reads, so views
+    can load them up front instead of once per row.
+
+    ``select_related_fields`` / ``prefetch_related_fields`` list the paths the
+    serializer itself touches. Paths needed by nested serializers are picked up
+    automatically and prefixed with the nested field's source.
+    """
+    select_related_fields = ()
+    prefetch_related_fields = ()
+
+    @classmethod
+    def get_related_paths(cls):
+        select = list(cls.select_related_fields)
+        prefetch = list(cls.prefetch_related_fields)
+
+        for name, field in cls._declared_fields.items():
+            many = isinstance(field, serializers.ListSerializer)
+            nested = field.child if many else field
+            if not isinstance(nested, EagerLoadingMixin):
+                continue
+            source = (field.source or name).replace('.', '__')
+            nested_select, nested_prefetch = nested.get_related_paths()
+            if many:
+                prefetch.append(source)
+                prefetch.extend(f'{source}__{path}' for path in nested_select + nested_prefetch)
+            else:
+                select.append(source)
+                select.extend(f'{source}__{path}' for path in nested_select)
+                prefetch.extend(f'{source}__{path}' for path in nested_prefetch)
+
+        return _dedupe(select), _dedupe(prefetch)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, request=None):
+        select, prefetch = cls.get_related_paths()
+        return _apply_paths(queryset, select, prefetch)
+
+
+class SparseFieldsetMixin(EagerLoadingMixin):
+    """
+    Serializer mixin adding ``?fields=`` and ``?expand=`` to read requests.
+
+    Without either parameter the serializer behaves as before. Otherwise
+    ``fields=id,title,status`` keeps only the listed fields, and nested
+    relations are rendered as primary keys unless named in ``expand=``
+    (e.g. ``expand=student,course``).
+
+    ``setup_eager_loading`` honours the same parameters: only expanded
+    relations are joined and ``QuerySet.only()`` restricts the columns to the
+    ones the output reads, so e.g. ``Issue.description`` is never fetched
+    unless it is asked for.
+    """
+    fields_query_param = 'fields'
+    expand_query_param = 'expand'
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        params = self.get_sparse_params(self.context.get('request'))
+        if params is not None:
+            self._apply_sparse_fieldset(*params)
+
+    @classmethod
+    def get_sparse_params(cls, request):
+        """
+        Return ``(fields, expand)`` for the request, or None when the full
+        representation applies. ``fields`` is None when it was not given.
+        """
+        if request is None or request.method not in SAFE_METHODS:
+            return None
+        params = getattr(request, 'query_params', request.GET)
+        if cls.fields_query_param not in params and cls.expand_query_param not in params:
+            return None
+        fields = params.get(cls.fields_query_param)
+        if fields is not None:
+            fields = set(_split(fields))
+        return fields, set(_split(params.get(cls.expand_query_param, '')))
+
+    def _apply_sparse_fieldset(self, requested, expand):
+        fields = self.fields
+        if requested is not None:
+            for name in list(fields):
+                if name not in requested:
+                    fields.pop(name)
+        for name, field in list(fields.items()):
+            if not isinstance(field, serializers.BaseSerializer) or name in expand:
+                continue
+            kwargs = {'read_only': True}
+            if isinstance(field, serializers.ListSerializer):
+                kwargs['many'] = True
+            if field.source != name:
+                kwargs['source'] = field.source
+            fields[name] = serializers.PrimaryKeyRelatedField(**kwargs)
+
+    @classmethod
+    def setup_eager_loading(cls, queryset, request=None):
+        if cls.get_sparse_params(request) is None:
+            return super().setup_eager_loading(queryset, request)
+
+        select, prefetch = cls.get_related_paths()
+        opts = queryset.model._meta
+        columns = {opts.pk.name}
+        traversed = set()
+        restrict_columns = True
+
+        for field in cls(context={'request': request}).fields.values():
+            if field.source == '*':
+                # e.g. a SerializerMethodField: we cannot tell what it reads
+                restrict_columns = False
+                traversed.update(path.split('__')[0] for path in select + prefetch)
+                continue
+            attr = field.source_attrs[0]
+            try:
+                model_field = opts.get_field(attr)
+            except FieldDoesNotExist:
+                restrict_columns = False
+                continue
+            if model_field.concrete:
+                columns.add(attr)
+            if isinstance(field, serializers.BaseSerializer) or len(field.source_attrs) > 1:
+                traversed.add(attr)
+
+        select = [path for path in select if path.split('__')[0] in traversed]
+        prefetch = [path for path in prefetch if path.split('__')[0] in traversed]
+        queryset = _apply_paths(queryset, select, prefetch)
+        if restrict_columns:
+            queryset = queryset.only(*columns)
+        return queryset
+
+
+class EagerLoadingViewMixin:
+    """
+    Generic view mixin applying the active serializer's eager-loading paths to
+    every queryset the view lists or looks objects up in.
+    """
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        return optimize_queryset(queryset, self.get_serializer_class(), self.request)
+
+
+def optimize_queryset(queryset, serializer_class, request=None):
+    """
+    Apply ``serializer_class``'s eager-loading paths to ``queryset`` when it
+    declares any; for use in plain APIViews and function views. Pass the
+    request to honour ``?fields=`` / ``?expand=``.
+    """
+    if issubclass(serializer_class, EagerLoadingMixin):
+        return serializer_class.setup_eager_loading(queryset, request)
+    return queryset
+
+
+def _apply_paths(queryset, select, prefetch):
+    if select:
+        queryset = queryset.select_related(*select)
+    if prefetch:
+        queryset = queryset.prefetch_related(*prefetch)
+    return queryset
+
+
+def _split(value):
+    return [part.strip() for part in value.split(',') if part.strip()]
+
+
+def _dedupe(paths):
+    seen = []
+    for path in paths:
+        if path not in seen:
+            seen.append(path)
+    return seen
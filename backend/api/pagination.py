@@ -0,0 +1,200 @@
+# backend/api/pagination.py
+import base64
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Cursor pagination keyed on a unique tuple of columns.
+
+    Unlike DRF's CursorPagination (which keys on the first ordering field and
+    falls back to an OFFSET for ties) every page is located with a plain
+    ``WHERE (a, b) < (x, y)`` range condition, so deep pages cost the same as
+    the first one as long as an index covers the ordering.
+    """
+    cursor_query_param = 'cursor'
+    page_size_query_param = 'page_size'
+    page_size = 25
+    max_page_size = 100
+    # The last field must be unique so that the tuple identifies one row.
+    ordering = ('-id',)
+    invalid_cursor_message = 'Invalid cursor'
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+        self.page_size = self.get_page_size(request)
+        self.fields = [field.lstrip('-') for field in self.ordering]
+
+        position, reverse = self.decode_cursor(request, queryset)
+        self.cursor = position
+
+        ordering = self.ordering
+        if reverse:
+            ordering = [self._flip(field) for field in ordering]
+        queryset = queryset.order_by(*ordering)
+        queryset = self._load_ordering_fields(queryset)
+        if position is not None:
+            queryset = queryset.filter(self._after(position, ordering))
+
+        # Fetch one extra row to find out whether another page follows.
+        results = list(queryset[:self.page_size + 1])
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = position is not None
+            self.has_previous = has_more
+        else:
+            self.has_next = has_more
+            self.has_previous = position is not None
+
+        return self.page
+
+    def get_ordering(self, request, queryset, view):
+        # An explicit ordering on the view wins; otherwise defer to an ordering
+        # filter on the view, as DRF's CursorPagination does.
+        if getattr(view, 'keyset_ordering', None):
+            return tuple(view.keyset_ordering)
+        for backend in getattr(view, 'filter_backends', ()):
+            if hasattr(backend, 'get_keyset_ordering'):
+                return tuple(backend().get_keyset_ordering(request, view))
+        return tuple(self.ordering)
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, self.page_size))
+        except (TypeError, ValueError):
+            return self.page_size
+        if page_size <= 0:
+            return self.page_size
+        return min(page_size, self.max_page_size)
+
+    def get_next_link(self):
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_cursor(self.page[0], reverse=True)
+
+    def get_paginated_response(self, data):
+        return Response({
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            'type': 'object',
+            'required': ['results'],
+            'properties': {
+                'next': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'previous': {'type': 'string', 'nullable': True, 'format': 'uri'},
+                'results': schema,
+            },
+        }
+
+    def decode_cursor(self, request, queryset):
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(encoded.encode('ascii')).decode('utf-8'))
+            values = payload['p']
+            reverse = bool(payload.get('r', False))
+            if len(values) != len(self.fields):
+                raise ValueError('cursor does not match ordering')
+            position = [
+                self._to_python(queryset, name, value)
+                for name, value in zip(self.fields, values)
+            ]
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+        return position, reverse
+
+    def encode_cursor(self, instance, reverse):
+        values = []
+        for name in self.fields:
+            value = getattr(instance, name)
+            values.append(value.isoformat() if hasattr(value, 'isoformat') else value)
+        payload = {'p': values}
+        if reverse:
+            payload['r'] = 1
+        encoded = base64.urlsafe_b64encode(
+            json.dumps(payload, separators=(',', ':')).encode('utf-8')
+        ).decode('ascii')
+        url = remove_query_param(self.base_url, self.cursor_query_param)
+        return replace_query_param(url, self.cursor_query_param, encoded)
+
+    def _after(self, position, ordering):
+        """
+        Build ``(f1, f2, ...) > (v1, v2, ...)`` honouring each field's direction
+        as an OR of prefix-equal terms, which every backend can index.
+        """
+        condition = Q()
+        for i, field in enumerate(ordering):
+            name = field.lstrip('-')
+            lookup = 'lt' if field.startswith('-') else 'gt'
+            term = Q(**{f'{name}__{lookup}': position[i]})
+            for prior, value in zip(self.fields[:i], position[:i]):
+                term &= Q(**{prior: value})
+            condition |= term
+        return condition
+
+    def _load_ordering_fields(self, queryset):
+        # Cursors are built from the ordering values, so make sure a sparse
+        # ``only()`` selection has not deferred them.
+        field_names, defer = queryset.query.deferred_loading
+        if defer or not field_names:
+            return queryset
+        missing = [
+            name for name in self.fields
+            if name not in field_names and name not in queryset.query.annotations
+        ]
+        return queryset.only(*field_names, *missing) if missing else queryset
+
+    @staticmethod
+    def _to_python(queryset, name, value):
+        # Annotations (e.g. a search rank) are not model fields; JSON already
+        # round-trips their numeric values exactly.
+        if name in queryset.query.annotations:
+            if not isinstance(value, (int, float)):
+                raise ValueError('invalid annotation value')
+            return value
+        return queryset.model._meta.get_field(name).to_python(value)
+
+    @staticmethod
+    def _flip(field):
+        return field[1:] if field.startswith('-') else f'-{field}'
+
+
+class IssueCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for issue listings, matching ``Issue.Meta.ordering``
+    with ``id`` as the tiebreaker.
+    """
+    page_size = getattr(settings, 'ISSUE_PAGE_SIZE', 25)
+    max_page_size = getattr(settings, 'ISSUE_MAX_PAGE_SIZE', 100)
+    ordering = ('-created_at', '-id')
+
+
+class NotificationCursorPagination(KeysetPagination):
+    """
+    Keyset pagination for the notification inbox, newest first.
+    """
+    page_size = getattr(settings, 'NOTIFICATION_PAGE_SIZE', 25)
+    max_page_size = getattr(settings, 'NOTIFICATION_MAX_PAGE_SIZE', 100)
+    ordering = ('-created_at', '-id')
@@ -0,0 +1,130 @@
+# backend/api/policies.py
+"""
+Department-scoped access policies and a request-scoped identity map.
+
+Admins (``is_staff`` or role ADMIN) may manage every department, course and
+issue; HODs those of their own department. A policy answers that for one
+object (``allows``) or a whole queryset (``scope``, a single filter), and
+loads objects through the request's ``IdentityMap``: the permission class
+and the view it guards share one instance, fetched with its related rows
+joined, instead of each querying it.
+"""
+from django.core.exceptions import ValidationError
+from rest_framework import permissions
+
+from .models import Course, Department, Issue
+
+
+def is_admin(user):
+    return user.is_staff or user.role == 'ADMIN'
+
+
+class IdentityMap:
+    """Objects loaded during one request, by model and primary key."""
+    def __init__(self):
+        self._objects = {}
+
+    def get(self, model, pk, select_related=()):
+        """The object, or None when it does not exist; queried once per request."""
+        try:
+            key = (model, model._meta.pk.to_python(pk))
+        except ValidationError:
+            return None
+        if key not in self._objects:
+            self._objects[key] = model._default_manager.select_related(*select_related).filter(pk=key[1]).first()
+        return self._objects[key]
+
+
+def request_objects(request):
+    """The identity map of ``request`` (a DRF Request or the HttpRequest it wraps)."""
+    request = getattr(request, '_request', request)
+    if not hasattr(request, '_identity_map'):
+        request._identity_map = IdentityMap()
+    return request._identity_map
+
+
+class DepartmentScopedPolicy:
+    model = None
+    # Related rows joined when loading an object
+    select_related = ()
+    # Lookup from the model to its department id
+    department_lookup = None
+
+    def get(self, request, pk):
+        return request_objects(request).get(self.model, pk, self.select_related)
+
+    def is_admin(self, user):
+        return is_admin(user)
+
+    def department_id(self, obj):
+        for attr in self.department_lookup.split('__'):
+            obj = getattr(obj, attr)
+        return obj
+
+    def allows(self, user, obj):
+        if self.is_admin(user):
+            return True
+        return user.role == 'HOD' and user.department_id is not None and self.department_id(obj) == user.department_id
+
+    def scope(self, user, queryset=None):
+        """The part of ``queryset`` (default: every object) ``user`` may manage."""
+        if queryset is None:
+            queryset = self.model._default_manager.all()
+        if self.is_admin(user):
+            return queryset
+        if user.role == 'HOD' and user.department_id:
+            return queryset.filter(**{self.department_lookup: user.department_id})
+        return queryset.none()
+
+
+class DepartmentPolicy(DepartmentScopedPolicy):
+    model = Department
+    select_related = ('college',)
+    department_lookup = 'id'
+
+
+class StaffDepartmentPolicy(DepartmentPolicy):
+    """
+    The department issues, staff and courses endpoints only admit ``is_staff``
+    users as admins, not every user with role ADMIN.
+    """
+    def is_admin(self, user):
+        return user.is_staff
+
+
+class CoursePolicy(DepartmentScopedPolicy):
+    model = Course
+    select_related = ('department',)
+    department_lookup = 'department_id'
+
+
+class IssuePolicy(DepartmentScopedPolicy):
+    model = Issue
+    select_related = ('course',)
+    department_lookup = 'course__department_id'
+
+
+department_policy = DepartmentPolicy()
+staff_department_policy = StaffDepartmentPolicy()
+course_policy = CoursePolicy()
+issue_policy = IssuePolicy()
+
+
+class PolicyPermission(permissions.BasePermission):
+    """
+    Admins, and HODs for objects of their department (the view's ``pk``).
+    A missing object is let through for admins, so the view can answer 404,
+    and refused for HODs, who cannot tell it from another department's.
+    """
+    policy = None
+
+    def has_permission(self, request, view):
+        user = request.user
+        if self.policy.is_admin(user):
+            return True
+        if user.role != 'HOD':
+            return False
+        if 'pk' not in view.kwargs:
+            return True
+        obj = self.policy.get(request, view.kwargs['pk'])
+        return obj is not None and self.policy.allows(user, obj)
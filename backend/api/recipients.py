@@ -0,0 +1,71 @@
+# backend/api/recipients.py
+"""
+Cached notification recipient sets: admins (``is_staff`` or role ADMIN) and
+each department's HODs. They rarely change, so fan-out and dashboard
+invalidation read them from the dashboard cache instead of the user table.
+``api.signals`` invalidates them when a user's role, ``is_staff`` flag or
+department changes, or when a user or department is deleted.
+
+Fan-out mostly runs in the ``run_tasks`` worker, which does not see
+invalidations made by web processes unless the dashboard cache is shared, so
+the sets are also recomputed every ``RECIPIENT_CACHE_TIMEOUT`` seconds.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db.models import Q
+
+from .dashboard_cache import cached_value, invalidate
+
+RECIPIENT_CACHE_TIMEOUT = getattr(settings, 'RECIPIENT_CACHE_TIMEOUT', 60)
+
+ADMINS_SCOPE = 'recipients:admins'
+
+
+def department_hods_scope(department_id):
+    return f'recipients:hods:{department_id}'
+
+
+def is_admin(role, is_staff):
+    return bool(is_staff) or role == 'ADMIN'
+
+
+def admin_ids():
+    def compute():
+        return list(
+            get_user_model().objects.filter(Q(is_staff=True) | Q(role='ADMIN')).values_list('pk', flat=True)
+        )
+    return frozenset(cached_value('admins', [ADMINS_SCOPE], compute, timeout=RECIPIENT_CACHE_TIMEOUT))
+
+
+def department_hod_ids(department_ids):
+    """Ids of the HODs of any of ``department_ids``."""
+    hods = set()
+    for department_id in department_ids:
+        if department_id is None:
+            continue
+        def compute(department_id=department_id):
+            return list(
+                get_user_model().objects.filter(role='HOD', department_id=department_id).values_list('pk', flat=True)
+            )
+        hods.update(cached_value(
+            f'hods:{department_id}', [department_hods_scope(department_id)], compute, timeout=RECIPIENT_CACHE_TIMEOUT,
+        ))
+    return hods
+
+
+def invalidate_recipients(old, new):
+    """
+    Invalidate the sets a user leaves or joins. ``old`` and ``new`` are
+    ``(role, is_staff, department_id)``; ``old`` is None for a new user.
+    """
+    scopes = set()
+    for state in (old, new):
+        if state is None:
+            continue
+        role, is_staff, department_id = state
+        if is_admin(role, is_staff):
+            scopes.add(ADMINS_SCOPE)
+        if role == 'HOD' and department_id is not None:
+            scopes.add(department_hods_scope(department_id))
+    if old != new:
+        invalidate(*scopes)
@@ -0,0 +1,123 @@
+# backend/api/retention.py
+"""
+Notification retention.
+
+``NOTIFICATION_RETENTION`` maps a notification type (or ``'default'``) to the
+number of days read and unread rows are kept; ``None`` keeps them forever.
+Expired rows are deleted, or moved to ``NotificationArchive`` when
+``NOTIFICATION_ARCHIVE`` is set. Repeated status notifications for the same
+issue and recipient are collapsed into the latest one.
+
+Everything is processed in batches of ``NOTIFICATION_RETENTION_BATCH_SIZE``
+rows, each in its own short transaction, and unread counters are adjusted
+once per batch.
+"""
+import time
+from collections import Counter
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connections, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from .models import Notification, NotificationArchive
+from .notification_templates import RENDER_FIELDS, render_row
+from .notifications import bump_unread
+
+NOTIFICATION_RETENTION = getattr(settings, 'NOTIFICATION_RETENTION', {})
+NOTIFICATION_COLLAPSE_TYPES = getattr(settings, 'NOTIFICATION_COLLAPSE_TYPES', ())
+NOTIFICATION_ARCHIVE = getattr(settings, 'NOTIFICATION_ARCHIVE', False)
+NOTIFICATION_RETENTION_BATCH_SIZE = getattr(settings, 'NOTIFICATION_RETENTION_BATCH_SIZE', 1000)
+
+_ARCHIVED_FIELDS = ('id', 'user_id', 'issue_id', 'notification_type', 'created_at', 'read')
+
+
+def expired_notifications(now=None):
+    """
+    One queryset per retention rule, as ``[(label, queryset), ...]``, each
+    served by the (notification_type, read, created_at) index.
+    """
+    now = now or timezone.now()
+    explicit = [name for name in NOTIFICATION_RETENTION if name != 'default']
+    rules = []
+    for name, ttl in NOTIFICATION_RETENTION.items():
+        for state, read in (('read', True), ('unread', False)):
+            days = ttl.get(state)
+            if days is None:
+                continue
+            if name == 'default':
+                types = Notification.objects.exclude(notification_type__in=explicit)
+            else:
+                types = Notification.objects.filter(notification_type=name)
+            rules.append((
+                f"{name}:{state}",
+                types.filter(read=read, created_at__lt=now - timedelta(days=days)),
+            ))
+    return rules
+
+
+def superseded_notifications():
+    """Collapsible notifications with a newer one of the same type for the same issue and user."""
+    newer = Notification.objects.filter(
+        user=OuterRef('user'), issue=OuterRef('issue'),
+        notification_type=OuterRef('notification_type'), id__gt=OuterRef('id'),
+    )
+    return Notification.objects.filter(
+        notification_type__in=NOTIFICATION_COLLAPSE_TYPES, issue__isnull=False,
+    ).filter(Exists(newer))
+
+
+def _delete_rows(ids):
+    """
+    Delete notifications by id with one plain DELETE. No table references
+    notifications, so there is nothing to cascade, and ``purge`` adjusts the
+    unread counters once per batch: going through ``QuerySet.delete()`` would
+    load every row and bump the counters row by row in its delete signals.
+    """
+    connection = connections[Notification.objects.db]
+    db_table = connection.ops.quote_name(Notification._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(f"DELETE FROM {db_table} WHERE id IN ({', '.join(['%s'] * len(ids))})", ids)
+
+
+def purge(queryset, archive=False, batch_size=NOTIFICATION_RETENTION_BATCH_SIZE, pause=0):
+    """
+    Delete (or archive) the notifications in ``queryset``, oldest first, one
+    batch per transaction. Returns the number of rows removed.
+    """
+    removed = 0
+    while True:
+        with transaction.atomic():
+            rows = list(
+                queryset.order_by('created_at', 'id').select_for_update(of=('self',))
+                .values(*_ARCHIVED_FIELDS, *(RENDER_FIELDS if archive else ()))[:batch_size]
+            )
+            if not rows:
+                return removed
+            ids = [row['id'] for row in rows]
+            if archive:
+                NotificationArchive.objects.bulk_create([
+                    NotificationArchive(
+                        notification_id=row['id'], message=render_row(row)[:255],
+                        **{field: row[field] for field in _ARCHIVED_FIELDS if field != 'id'},
+                    )
+                    for row in rows
+                ])
+            _delete_rows(ids)
+            bump_unread({
+                user_id: -n for user_id, n in Counter(row['user_id'] for row in rows if not row['read']).items()
+            })
+        removed += len(rows)
+        if len(rows) < batch_size:
+            return removed
+        if pause:
+            time.sleep(pause)
+
+
+def enforce_retention(archive=NOTIFICATION_ARCHIVE, batch_size=NOTIFICATION_RETENTION_BATCH_SIZE, pause=0):
+    """Collapse repeated notifications, then expire old ones. Returns ``{label: rows}``."""
+    removed = {'collapsed': purge(superseded_notifications(), batch_size=batch_size, pause=pause)}
+    for label, queryset in expired_notifications():
+        removed[label] = purge(queryset, archive=archive, batch_size=batch_size, pause=pause)
+    return removed
@@ -0,0 +1,197 @@
+# backend/api/search.py
+"""
+Full-text search over issue titles and descriptions.
+
+SQLite uses an external-content FTS5 table kept in sync by triggers, and
+PostgreSQL uses a stored generated ``tsvector`` column with a GIN index. Both
+indexes are maintained by the database on every insert, update and delete, so
+they never need a full rebuild. Other backends fall back to ``icontains``.
+"""
+import re
+
+from django.core import checks
+from django.db import connection, connections
+from django.db.migrations.recorder import MigrationRecorder
+from django.db.models import BooleanField, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+ISSUE_TABLE = 'api_issue'
+SQLITE_FTS_TABLE = 'api_issue_fts'
+POSTGRES_SEARCH_COLUMN = 'search_vector'
+POSTGRES_SEARCH_CONFIG = 'english'
+
+SQLITE_INSTALL = [
+    f"""CREATE VIRTUAL TABLE IF NOT EXISTS {SQLITE_FTS_TABLE} USING fts5(
+        title, description,
+        content='{ISSUE_TABLE}', content_rowid='id',
+        tokenize='porter unicode61'
+    )""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ai AFTER INSERT ON {ISSUE_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_ad AFTER DELETE ON {ISSUE_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END""",
+    f"""CREATE TRIGGER IF NOT EXISTS {SQLITE_FTS_TABLE}_au AFTER UPDATE OF title, description ON {ISSUE_TABLE} BEGIN
+        INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO {SQLITE_FTS_TABLE}(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END""",
+    f"INSERT INTO {SQLITE_FTS_TABLE}({SQLITE_FTS_TABLE}) VALUES ('rebuild')",
+]
+
+SQLITE_UNINSTALL = [
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {SQLITE_FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {SQLITE_FTS_TABLE}",
+]
+
+POSTGRES_INSTALL = [
+    f"""ALTER TABLE {ISSUE_TABLE} ADD COLUMN IF NOT EXISTS {POSTGRES_SEARCH_COLUMN} tsvector
+        GENERATED ALWAYS AS (
+            setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(title, '')), 'A') ||
+            setweight(to_tsvector('{POSTGRES_SEARCH_CONFIG}', coalesce(description, '')), 'B')
+        ) STORED""",
+    f"""CREATE INDEX IF NOT EXISTS {ISSUE_TABLE}_search_gin
+        ON {ISSUE_TABLE} USING GIN ({POSTGRES_SEARCH_COLUMN})""",
+]
+
+POSTGRES_UNINSTALL = [
+    f"DROP INDEX IF EXISTS {ISSUE_TABLE}_search_gin",
+    f"ALTER TABLE {ISSUE_TABLE} DROP COLUMN IF EXISTS {POSTGRES_SEARCH_COLUMN}",
+]
+
+
+def install_search_index(schema_editor):
+    """
+    Create the full-text index for the current backend. Safe to run again,
+    e.g. to repair a database flagged by ``check_search_index``. Migrations
+    keep their own copy of these statements instead of calling this.
+    """
+    statements = {
+        'sqlite': SQLITE_INSTALL,
+        'postgresql': POSTGRES_INSTALL,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+def uninstall_search_index(schema_editor):
+    statements = {
+        'sqlite': SQLITE_UNINSTALL,
+        'postgresql': POSTGRES_UNINSTALL,
+    }.get(schema_editor.connection.vendor, [])
+    for statement in statements:
+        schema_editor.execute(statement)
+
+
+INDEX_MIGRATION = ('api', '0008_issue_fulltext_search')
+
+SQLITE_OBJECTS = {
+    SQLITE_FTS_TABLE, f'{SQLITE_FTS_TABLE}_ai', f'{SQLITE_FTS_TABLE}_ad', f'{SQLITE_FTS_TABLE}_au',
+}
+
+
+def missing_search_objects(conn):
+    """
+    Return the names of the full-text index objects missing from ``conn``.
+    SQLite drops triggers when it remakes a table, e.g. for an ``AlterField``
+    on ``Issue``, so a later migration can silently stop the index syncing.
+    """
+    with conn.cursor() as cursor:
+        if conn.vendor == 'sqlite':
+            cursor.execute(
+                "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+                [f'{SQLITE_FTS_TABLE}%'],
+            )
+            return sorted(SQLITE_OBJECTS - {row[0] for row in cursor.fetchall()})
+        if conn.vendor == 'postgresql':
+            cursor.execute(
+                "SELECT 1 FROM information_schema.columns WHERE table_name = %s AND column_name = %s",
+                [ISSUE_TABLE, POSTGRES_SEARCH_COLUMN],
+            )
+            return [] if cursor.fetchone() else [POSTGRES_SEARCH_COLUMN]
+    return []
+
+
+def check_search_index(app_configs=None, databases=None, **kwargs):
+    errors = []
+    for alias in databases or ():
+        conn = connections[alias]
+        if INDEX_MIGRATION not in MigrationRecorder(conn).applied_migrations():
+            continue
+        missing = missing_search_objects(conn)
+        if missing:
+            errors.append(checks.Error(
+                f"Full-text search index is incomplete on database '{alias}': missing {', '.join(missing)}.",
+                hint=f'Add a migration that reruns the DDL from {INDEX_MIGRATION[1]}.',
+                id='api.E001',
+            ))
+    return errors
+
+
+def _fts5_query(query):
+    """
+    Turn free text into a safe FTS5 expression: every word is quoted (so
+    operators and punctuation in user input cannot cause syntax errors),
+    words are AND-ed, and the last one matches as a prefix.
+    """
+    terms = re.findall(r'\w+', query)
+    if not terms:
+        return None
+    quoted = ['"%s"' % term for term in terms]
+    quoted[-1] += '*'
+    return ' '.join(quoted)
+
+
+def search_issues(queryset, query):
+    """
+    Restrict ``queryset`` to issues matching ``query`` and annotate each with
+    ``search_rank`` (higher is more relevant). The queryset keeps any filters
+    already applied, such as the role scoping from ``IssueViewSet``.
+    """
+    vendor = connection.vendor
+
+    if vendor == 'sqlite':
+        match = _fts5_query(query)
+        if match is None:
+            return queryset.none()
+        # bm25() is lower-is-better; negate it so both backends sort descending.
+        # Titles are weighted above descriptions.
+        return queryset.filter(
+            id__in=RawSQL(
+                f"SELECT rowid FROM {SQLITE_FTS_TABLE} WHERE {SQLITE_FTS_TABLE} MATCH %s",
+                [match],
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"SELECT -bm25({SQLITE_FTS_TABLE}, 10.0, 1.0) FROM {SQLITE_FTS_TABLE} "
+                f"WHERE {SQLITE_FTS_TABLE} MATCH %s AND rowid = {ISSUE_TABLE}.id",
+                [match],
+                output_field=FloatField(),
+            )
+        )
+
+    if vendor == 'postgresql':
+        tsquery = f"websearch_to_tsquery('{POSTGRES_SEARCH_CONFIG}', %s)"
+        return queryset.filter(
+            RawSQL(
+                f"{ISSUE_TABLE}.{POSTGRES_SEARCH_COLUMN} @@ {tsquery}",
+                [query],
+                output_field=BooleanField(),
+            )
+        ).annotate(
+            search_rank=RawSQL(
+                f"ts_rank({ISSUE_TABLE}.{POSTGRES_SEARCH_COLUMN}, {tsquery})",
+                [query],
+                output_field=FloatField(),
+            )
+        )
+
+    return queryset.filter(
+        Q(title__icontains=query) | Q(description__icontains=query)
+    ).annotate(search_rank=Value(0.0, output_field=FloatField()))
@@ -1,8 +1,11 @@
 # backend/api/serializers.py
+from django.conf import settings
 from rest_framework import serializers
 from users.models import User
 from .models import College, Department, Course, Issue, Notification
 from users.serializers import UserSerializer
+from .notification_templates import render_notification
+from .optimization import SparseFieldsetMixin
 
 # Course related serializers
 class CourseSerializer(serializers.Serializer):
@@ -84,7 +87,9 @@ class CollegeSerializer(serializers.ModelSerializer):
         model = College
         fields = ['id', 'name', 'code', 'description', 'created_at', 'updated_at']
 
-class DepartmentSerializer(serializers.ModelSerializer):
+class DepartmentSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    select_related_fields = ('college',)
+
     college = CollegeSerializer(read_only=True)
     college_name = serializers.SerializerMethodField()
     college_id = serializers.PrimaryKeyRelatedField(
@@ -101,7 +106,9 @@ class DepartmentSerializer(serializers.ModelSerializer):
     def get_college_name(self, obj):
         return obj.college.name if obj.college else None
 
-class CourseSerializer(serializers.ModelSerializer):
+class CourseSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    select_related_fields = ('department',)
+
     department_name = serializers.CharField(source="department.department_name", read_only=True)  # Get department name
     department_code = serializers.CharField(source="department.department_code", read_only=True)  # Get department code
 
@@ -109,7 +116,34 @@ class CourseSerializer(serializers.ModelSerializer):
         model = Course  # Correct the model
         fields = ['id', 'course_code', 'course_name', 'details', 'department', 'department_name', 'department_code', 'created_at', 'updated_at']
 
-class IssueSerializer(serializers.ModelSerializer):
+class CourseTreeSerializer(serializers.ModelSerializer):
+    issue_count = serializers.IntegerField(read_only=True)
+
+    class Meta:
+        model = Course
+        fields = ['id', 'course_code', 'course_name', 'issue_count']
+
+class DepartmentTreeSerializer(serializers.ModelSerializer):
+    issue_count = serializers.IntegerField(read_only=True)
+    courses = CourseTreeSerializer(source='course_set', many=True, read_only=True)
+
+    class Meta:
+        model = Department
+        fields = ['id', 'department_name', 'department_code', 'issue_count', 'courses']
+
+class CollegeTreeSerializer(serializers.ModelSerializer):
+    """A college with its departments and courses; serialize ``api.catalog.catalog_tree()``."""
+    issue_count = serializers.IntegerField(read_only=True)
+    departments = DepartmentTreeSerializer(source='department_set', many=True, read_only=True)
+
+    class Meta:
+        model = College
+        fields = ['id', 'name', 'code', 'issue_count', 'departments']
+
+class IssueSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    # course__department is contributed by the nested CourseSerializer
+    select_related_fields = ('student', 'assigned_to')
+
     student = UserSerializer(read_only=True)
     course = CourseSerializer(read_only=True)
     assigned_to = UserSerializer(read_only=True)
@@ -138,7 +172,45 @@ class IssueCreateSerializer(serializers.ModelSerializer):
         # Create and return the issue
         return Issue.objects.create(**validated_data)
 
-class NotificationSerializer(serializers.ModelSerializer):
+class IssueBulkSerializer(serializers.Serializer):
+    issue_ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=getattr(settings, 'ISSUE_BULK_MAX_IDS', 1000)
+    )
+
+    def validate_issue_ids(self, value):
+        return sorted(set(value))
+
+class IssueBulkAssignSerializer(IssueBulkSerializer):
+    user_id = serializers.IntegerField()
+
+class IssueBulkStatusSerializer(IssueBulkSerializer):
+    status = serializers.ChoiceField(choices=Issue.STATUS_CHOICES)
+
+class NotificationMarkReadSerializer(serializers.Serializer):
+    ids = serializers.ListField(
+        child=serializers.IntegerField(min_value=1),
+        allow_empty=False,
+        max_length=getattr(settings, 'NOTIFICATION_MARK_READ_MAX_IDS', 1000)
+    )
+
+class NotificationMessageField(serializers.CharField):
+    """Renders the notification's template; text written to it is stored as is."""
+    def __init__(self, **kwargs):
+        super().__init__(source='*', required=False, allow_blank=True, max_length=255, **kwargs)
+
+    def to_representation(self, notification):
+        return render_notification(notification)
+
+    def to_internal_value(self, data):
+        return {'message': super().to_internal_value(data)}
+
+class NotificationSerializer(SparseFieldsetMixin, serializers.ModelSerializer):
+    select_related_fields = ('issue__course',)
+
+    message = NotificationMessageField()
+
     class Meta:
         model = Notification
         fields = ['id', 'user', 'issue', 'message', 'notification_type', 'created_at', 'read']
@@ -0,0 +1,379 @@
+# backend/api/signals.py
+from django.conf import settings
+from django.db.models.signals import post_delete, post_init, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from . import statistics
+from .dashboard_cache import ADMIN_SCOPE, CATALOG_SCOPE, invalidate, invalidate_issue_audience, user_scope
+from .models import College, Course, Department, Issue, IssueStatusHistory, IssueTombstone, Notification
+from .notifications import NotificationFanout, bump_unread
+from .recipients import department_hods_scope, invalidate_recipients
+from .tasks import enqueue
+
+
+def _course_department_id(course_id):
+    return Course.objects.filter(pk=course_id).values_list('department_id', flat=True).first()
+
+
+def _issue_department_id(issue):
+    # The course is usually cached on the instance already (e.g. by the serializer)
+    if Issue.course.is_cached(issue):
+        return issue.course.department_id
+    return _course_department_id(issue.course_id)
+
+
+def _loaded_values(instance, fields):
+    """
+    The values of ``fields`` the instance was loaded with, or None when one of
+    them is deferred (``only()``/``defer()``). Read from ``__dict__``: loading
+    a deferred field in post_init would build another instance, firing
+    post_init again.
+    """
+    values = instance.__dict__
+    if not set(fields) <= values.keys():
+        return None
+    return tuple(values[name] for name in fields)
+
+
+def _stored_values(instance, fields):
+    """The stored values of ``fields``, for a row loaded with some of them deferred."""
+    values = type(instance)._base_manager.filter(pk=instance.pk).values_list(*fields).first()
+    return values or (None,) * len(fields)
+
+
+def _load_deferred(instance, fields=None):
+    # For pre_delete: post_delete receivers can no longer load the row's fields
+    deferred = instance.get_deferred_fields()
+    if fields is not None:
+        deferred &= set(fields)
+    if deferred:
+        instance.refresh_from_db(fields=deferred)
+
+
+def _remember_field(instance, field, attribute):
+    # Unknown (unset) when the field is deferred; see _complete_field
+    values = _loaded_values(instance, (field,))
+    if values is not None:
+        setattr(instance, attribute, values[0])
+
+
+def _complete_field(instance, field, attribute):
+    if not hasattr(instance, attribute):
+        setattr(instance, attribute, _stored_values(instance, (field,))[0])
+
+
+ISSUE_STATE_FIELDS = ('assigned_to_id', 'status', 'issue_type', 'course_id')
+
+
+def _remember_issue_state(issue, state):
+    issue._loaded_assigned_to_id = state[0]
+    issue._loaded_counted = state[1:]
+
+
+@receiver(post_init, sender=Issue)
+def remember_issue_state(sender, instance, **kwargs):
+    """
+    Keep the values the row was loaded with, so reassignments and counter
+    moves can be detected on save without re-reading the row. For rows
+    loaded with some of them deferred, they are read before a save or delete.
+    """
+    state = _loaded_values(instance, ISSUE_STATE_FIELDS)
+    if state is not None:
+        _remember_issue_state(instance, state)
+    _remember_field(instance, 'title', '_loaded_title')
+
+
+@receiver(pre_save, sender=Issue)
+def complete_issue_state(sender, instance, **kwargs):
+    if not hasattr(instance, '_loaded_counted'):
+        _remember_issue_state(instance, _stored_values(instance, ISSUE_STATE_FIELDS))
+    _complete_field(instance, 'title', '_loaded_title')
+
+
+@receiver(pre_delete, sender=Issue)
+def load_deleted_issue(sender, instance, **kwargs):
+    _load_deferred(instance)
+    if not hasattr(instance, '_loaded_counted'):
+        _remember_issue_state(instance, _loaded_values(instance, ISSUE_STATE_FIELDS))
+
+
+@receiver(post_save, sender=Issue)
+def invalidate_issue_dashboards(sender, instance, created, **kwargs):
+    # Registered before the receivers below, which refresh the loaded values.
+    # The admin dashboard shows the counters and the titles of recent issues.
+    admin = (
+        created or instance.title != instance._loaded_title
+        or instance._loaded_counted != (instance.status, instance.issue_type, instance.course_id)
+    )
+    invalidate_issue_audience(
+        [instance.student_id, instance.assigned_to_id, instance._loaded_assigned_to_id],
+        [instance.course_id, instance._loaded_counted[2]],
+        admin=admin,
+    )
+    instance._loaded_title = instance.title
+
+
+@receiver(post_save, sender=Issue)
+def record_issue_history(sender, instance, created, **kwargs):
+    """
+    Append a history row when an issue is created or its status or assignee
+    changes. Views set ``_changed_by`` on the instance to record the actor.
+    """
+    from_status = None if created else instance._loaded_counted[0]
+    from_assignee_id = None if created else instance._loaded_assigned_to_id
+    if not created and from_status == instance.status and from_assignee_id == instance.assigned_to_id:
+        return
+    IssueStatusHistory.objects.create(
+        issue=instance,
+        from_status=from_status,
+        to_status=instance.status,
+        from_assignee_id=from_assignee_id,
+        to_assignee_id=instance.assigned_to_id,
+        changed_by=getattr(instance, '_changed_by', None) or (instance.student if created else None),
+    )
+
+
+@receiver(post_save, sender=Issue)
+def notify_issue_changes(sender, instance, created, **kwargs):
+    """
+    Notify on creation, reassignment and status changes. Moving to InProgress
+    as part of an assignment is covered by the assignment notification. The
+    creation fan-out, which reaches every admin, runs as a background task.
+    """
+    if created:
+        enqueue('api.notify_issue_created', {'issue_id': instance.pk})
+        return
+
+    fanout = NotificationFanout()
+    assigned = instance.assigned_to_id and instance.assigned_to_id != instance._loaded_assigned_to_id
+    if assigned:
+        fanout.issue_assigned(instance.pk, instance.student_id, instance.assigned_to)
+    if instance.status != instance._loaded_counted[0] and not (assigned and instance.status == 'InProgress'):
+        changed_by = getattr(instance, '_changed_by', None)
+        fanout.status_changed(
+            instance.pk, instance.student_id, instance.assigned_to_id,
+            instance.status, changed_by.pk if changed_by else None,
+        )
+    fanout.send()
+
+
+@receiver(post_save, sender=Issue)
+def record_issue_unassignment(sender, instance, created, **kwargs):
+    """
+    Leave a tombstone for the previous assignee when an issue is reassigned,
+    since it drops out of their issue list.
+    """
+    previous = instance._loaded_assigned_to_id
+    if not created and previous and previous != instance.assigned_to_id:
+        IssueTombstone.objects.create(
+            issue_id=instance.pk,
+            assigned_to_id=previous,
+            reason='UNASSIGNED',
+        )
+    instance._loaded_assigned_to_id = instance.assigned_to_id
+
+
+@receiver(post_save, sender=Issue)
+def count_issue_save(sender, instance, created, **kwargs):
+    current = (instance.status, instance.issue_type, instance.course_id)
+    previous = instance._loaded_counted
+    instance._loaded_counted = current
+    if not created and previous == current:
+        return
+
+    new_keys = statistics.issue_keys(*current, _issue_department_id(instance))
+    if created:
+        old_keys = []
+    else:
+        old_department = (
+            _course_department_id(previous[2]) if previous[2] != current[2] else new_keys[-1][1]
+        )
+        old_keys = statistics.issue_keys(*previous, old_department)
+    statistics.bump_counters(statistics.diff(old_keys, new_keys))
+
+
+@receiver(post_delete, sender=Issue)
+def record_issue_deletion(sender, instance, **kwargs):
+    invalidate_issue_audience([instance.student_id, instance.assigned_to_id], [instance.course_id])
+    IssueTombstone.objects.create(
+        issue_id=instance.pk,
+        student_id=instance.student_id,
+        assigned_to_id=instance.assigned_to_id,
+        reason='DELETED',
+    )
+    statistics.bump_counters(statistics.diff(
+        statistics.issue_keys(*instance._loaded_counted, _issue_department_id(instance)), []
+    ))
+
+
+def _recipient_state(user):
+    # Read from __dict__ so deferred fields are not loaded; unknown counts as changed
+    values = user.__dict__
+    if not {'role', 'is_staff', 'department_id'} <= values.keys():
+        return None
+    return values['role'], values['is_staff'], values['department_id']
+
+
+@receiver(post_init, sender=settings.AUTH_USER_MODEL)
+def remember_user_role(sender, instance, **kwargs):
+    _remember_field(instance, 'role', '_loaded_role')
+    _remember_field(instance, 'email', '_loaded_email')
+    instance._loaded_recipient_state = _recipient_state(instance)
+
+
+@receiver(pre_save, sender=settings.AUTH_USER_MODEL)
+@receiver(pre_delete, sender=settings.AUTH_USER_MODEL)
+def complete_user_role(sender, instance, **kwargs):
+    _complete_field(instance, 'role', '_loaded_role')
+    _complete_field(instance, 'email', '_loaded_email')
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_dashboards(sender, instance, created, update_fields=None, **kwargs):
+    if update_fields and set(update_fields) <= {'last_login'}:
+        return
+    scopes = [user_scope(instance.pk)]
+    if created or instance.role != instance._loaded_role or instance.email != instance._loaded_email:
+        # The admin dashboard counts users by role and shows students' emails
+        scopes.append(ADMIN_SCOPE)
+    instance._loaded_email = instance.email
+    if not created:
+        # Lecturers see the names of the students whose issues they handle
+        assignees = (
+            Issue.objects.filter(student=instance)
+            .exclude(assigned_to=None)
+            .values_list('assigned_to_id', flat=True)
+            .distinct()
+        )
+        scopes.extend(user_scope(pk) for pk in assignees)
+    invalidate(*scopes)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_user_recipients(sender, instance, created, **kwargs):
+    old = None if created else instance._loaded_recipient_state
+    new = _recipient_state(instance)
+    if old is None and not created:
+        # Unknown previous state: the user may have left any set they could be in
+        old = (instance._loaded_role, True, None)
+    invalidate_recipients(old, new)
+    instance._loaded_recipient_state = new
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def count_user_save(sender, instance, created, **kwargs):
+    old_keys = [] if created else statistics.user_keys(instance._loaded_role)
+    instance._loaded_role = instance.role
+    statistics.bump_counters(statistics.diff(old_keys, statistics.user_keys(instance.role)))
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def invalidate_deleted_user_recipients(sender, instance, **kwargs):
+    invalidate_recipients(_recipient_state(instance), None)
+
+
+@receiver(post_delete, sender=settings.AUTH_USER_MODEL)
+def count_user_delete(sender, instance, **kwargs):
+    invalidate(ADMIN_SCOPE, user_scope(instance.pk))
+    statistics.bump_counters(statistics.diff(statistics.user_keys(instance._loaded_role), []))
+
+
+@receiver(post_save, sender=College)
+@receiver(post_delete, sender=College)
+def invalidate_college_catalog(sender, instance, **kwargs):
+    # Departments are listed with their college
+    invalidate(CATALOG_SCOPE)
+
+
+@receiver(post_init, sender=Course)
+def remember_course_department(sender, instance, **kwargs):
+    _remember_field(instance, 'department_id', '_loaded_department_id')
+
+
+@receiver(pre_save, sender=Course)
+def complete_course_department(sender, instance, **kwargs):
+    _complete_field(instance, 'department_id', '_loaded_department_id')
+
+
+@receiver(post_save, sender=Course)
+def count_course_save(sender, instance, created, **kwargs):
+    previous = instance._loaded_department_id
+    instance._loaded_department_id = instance.department_id
+    # The admin dashboard counts courses and issues per department, but shows no course names
+    if created or previous != instance.department_id:
+        invalidate(ADMIN_SCOPE, CATALOG_SCOPE)
+    else:
+        invalidate(CATALOG_SCOPE)
+    if created:
+        statistics.bump_counters({('catalog', 'courses'): 1})
+    elif previous != instance.department_id:
+        # Move the course's issues to the new department's counter
+        moved = instance.issues.count()
+        statistics.bump_counters({
+            ('issues.department', str(previous)): -moved,
+            ('issues.department', str(instance.department_id)): moved,
+        })
+
+
+@receiver(post_delete, sender=Course)
+def count_course_delete(sender, instance, **kwargs):
+    invalidate(ADMIN_SCOPE, CATALOG_SCOPE)
+    statistics.bump_counters({('catalog', 'courses'): -1})
+
+
+DEPARTMENT_LISTED_FIELDS = ('department_name', 'department_code')
+
+
+@receiver(post_init, sender=Department)
+def remember_department_listing(sender, instance, **kwargs):
+    instance._loaded_listing = _loaded_values(instance, DEPARTMENT_LISTED_FIELDS)
+
+
+@receiver(post_save, sender=Department)
+def count_department_save(sender, instance, created, **kwargs):
+    # The admin dashboard lists every department's name and code
+    listing = _loaded_values(instance, DEPARTMENT_LISTED_FIELDS)
+    if created or listing != instance._loaded_listing:
+        invalidate(ADMIN_SCOPE, CATALOG_SCOPE)
+    else:
+        invalidate(CATALOG_SCOPE)
+    instance._loaded_listing = listing
+    if created:
+        statistics.bump_counters({('catalog', 'departments'): 1})
+
+
+@receiver(post_delete, sender=Department)
+def count_department_delete(sender, instance, **kwargs):
+    # Its HODs were detached with a queryset update, which sends no signals
+    invalidate(ADMIN_SCOPE, CATALOG_SCOPE, department_hods_scope(instance.pk))
+    statistics.bump_counters({('catalog', 'departments'): -1})
+
+
+@receiver(post_init, sender=Notification)
+def remember_notification_read(sender, instance, **kwargs):
+    _remember_field(instance, 'read', '_loaded_read')
+
+
+@receiver(pre_save, sender=Notification)
+def complete_notification_read(sender, instance, **kwargs):
+    _complete_field(instance, 'read', '_loaded_read')
+
+
+@receiver(pre_delete, sender=Notification)
+def load_deleted_notification(sender, instance, **kwargs):
+    _load_deferred(instance, ('user_id', 'read'))
+    if not hasattr(instance, '_loaded_read'):
+        instance._loaded_read = instance.read
+
+
+@receiver(post_save, sender=Notification)
+def count_notification_save(sender, instance, created, **kwargs):
+    was_unread = not created and not instance._loaded_read
+    instance._loaded_read = instance.read
+    bump_unread({instance.user_id: int(not instance.read) - int(was_unread)})
+
+
+@receiver(post_delete, sender=Notification)
+def count_notification_delete(sender, instance, **kwargs):
+    if not instance._loaded_read:
+        bump_unread({instance.user_id: -1})
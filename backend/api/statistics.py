@@ -0,0 +1,144 @@
+# backend/api/statistics.py
+"""
+Incrementally maintained dashboard statistics.
+
+Counters live in ``StatCounter`` rows keyed by ``(scope, key)``:
+
+- ``users`` / ``total`` and ``users.role`` / <role>
+- ``issues`` / ``total``, ``issues.status`` / <status>, ``issues.type`` / <type>,
+  ``issues.course`` / <course id> and ``issues.department`` / <department id>
+- ``catalog`` / ``departments`` and ``catalog`` / ``courses``
+
+The receivers in ``api.signals`` (and the bulk paths in ``api.bulk``, which
+bypass signals) apply deltas in the same transaction as the write that caused
+them. ``manage.py rebuild_statistics`` recomputes everything from scratch.
+"""
+from collections import Counter
+from functools import reduce
+from operator import or_
+
+from django.apps import apps as global_apps
+from django.db import transaction
+from django.db.models import BigIntegerField, Case, Count, F, Q, Value, When
+
+
+def issue_keys(status, issue_type, course_id, department_id):
+    keys = [
+        ('issues', 'total'),
+        ('issues.status', status),
+        ('issues.type', issue_type),
+        ('issues.course', str(course_id)),
+    ]
+    if department_id is not None:
+        keys.append(('issues.department', str(department_id)))
+    return keys
+
+
+def user_keys(role):
+    return [('users', 'total'), ('users.role', role)]
+
+
+def diff(old_keys, new_keys):
+    """Deltas moving one row's contribution from ``old_keys`` to ``new_keys``."""
+    deltas = Counter()
+    for key in old_keys:
+        deltas[key] -= 1
+    for key in new_keys:
+        deltas[key] += 1
+    return deltas
+
+
+def bump_counters(deltas):
+    """
+    Apply ``{(scope, key): delta}`` in two queries whatever the number of
+    counters: an INSERT of missing rows and one UPDATE with a CASE per row.
+    """
+    from .models import StatCounter
+
+    deltas = {key: delta for key, delta in deltas.items() if delta}
+    if not deltas:
+        return
+    with transaction.atomic():
+        StatCounter.objects.bulk_create(
+            [StatCounter(scope=scope, key=key) for scope, key in deltas],
+            ignore_conflicts=True,
+        )
+        StatCounter.objects.filter(
+            reduce(or_, (Q(scope=scope, key=key) for scope, key in deltas))
+        ).update(value=F('value') + Case(
+            *[When(scope=scope, key=key, then=Value(delta)) for (scope, key), delta in deltas.items()],
+            default=Value(0),
+            output_field=BigIntegerField(),
+        ))
+
+
+def rebuild_statistics(apps=global_apps):
+    """
+    Recompute every counter with GROUP BY queries. ``apps`` may be a
+    migration's historical app registry.
+    """
+    StatCounter = apps.get_model('api', 'StatCounter')
+    Issue = apps.get_model('api', 'Issue')
+    Course = apps.get_model('api', 'Course')
+    Department = apps.get_model('api', 'Department')
+    User = apps.get_model('users', 'User')
+
+    counts = Counter()
+    for row in User.objects.order_by().values('role').annotate(n=Count('id')):
+        counts[('users.role', row['role'])] += row['n']
+        counts[('users', 'total')] += row['n']
+
+    grouped = (
+        Issue.objects.order_by()
+        .values('status', 'issue_type', 'course_id', 'course__department_id')
+        .annotate(n=Count('id'))
+    )
+    for row in grouped:
+        for key in issue_keys(row['status'], row['issue_type'], row['course_id'], row['course__department_id']):
+            counts[key] += row['n']
+
+    counts[('catalog', 'departments')] = Department.objects.count()
+    counts[('catalog', 'courses')] = Course.objects.count()
+
+    with transaction.atomic():
+        StatCounter.objects.all().delete()
+        StatCounter.objects.bulk_create([
+            StatCounter(scope=scope, key=key, value=value)
+            for (scope, key), value in counts.items()
+        ])
+    return counts
+
+
+def read_statistics():
+    """
+    Dashboard statistics from the counter table in a single query.
+    """
+    from .models import StatCounter
+
+    values = {}
+    for scope, key, value in StatCounter.objects.filter(value__gt=0).values_list('scope', 'key', 'value'):
+        values.setdefault(scope, {})[key] = value
+
+    def get(scope, key):
+        return values.get(scope, {}).get(key, 0)
+
+    return {
+        "users": {
+            "total": get('users', 'total'),
+            "students": get('users.role', 'STUDENT'),
+            "lecturers": get('users.role', 'LECTURER'),
+            "hods": get('users.role', 'HOD'),
+            "admins": get('users.role', 'ADMIN'),
+        },
+        "issues": {
+            "total": get('issues', 'total'),
+            "pending": get('issues.status', 'Pending'),
+            "in_progress": get('issues.status', 'InProgress'),
+            "solved": get('issues.status', 'Solved'),
+            "by_type": values.get('issues.type', {}),
+            "by_department": values.get('issues.department', {}),
+            "by_course": values.get('issues.course', {}),
+        },
+        "departments": get('catalog', 'departments'),
+        "courses": get('catalog', 'courses'),
+    }
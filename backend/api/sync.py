@@ -0,0 +1,101 @@
+# backend/api/sync.py
+"""
+Delta sync for issue lists.
+
+Clients hold an opaque watermark issued by the server and ask for the issues
+created, updated or removed after it. A watermark is either the time of a
+completed sync, or a ``(updated_at, id)`` position inside a batch that was cut
+off at the size limit.
+
+Rows get their ``updated_at`` when they are saved, not when their
+transaction commits, so a completed-sync watermark is rewound by
+``ISSUE_SYNC_OVERLAP_SECONDS`` on the next request. Clients may therefore see
+an issue twice and should upsert by id.
+"""
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+
+from .models import IssueTombstone
+
+SYNC_BATCH_SIZE = getattr(settings, 'ISSUE_SYNC_BATCH_SIZE', 500)
+SYNC_OVERLAP = timedelta(seconds=getattr(settings, 'ISSUE_SYNC_OVERLAP_SECONDS', 2))
+
+
+class InvalidWatermark(ValueError):
+    pass
+
+
+def encode_watermark(timestamp, last_id=None):
+    payload = {'t': timestamp.isoformat()}
+    if last_id is not None:
+        payload['i'] = last_id
+    return base64.urlsafe_b64encode(
+        json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    ).decode('ascii')
+
+
+def decode_watermark(token):
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(token.encode('ascii')).decode('utf-8'))
+        timestamp = parse_datetime(payload['t'])
+        last_id = payload.get('i')
+        if timestamp is None or (last_id is not None and not isinstance(last_id, int)):
+            raise ValueError
+    except Exception:
+        raise InvalidWatermark('Invalid watermark')
+    return timestamp, last_id
+
+
+def tombstones_for(user):
+    """
+    Tombstones relevant to ``user``, mirroring ``IssueViewSet.get_queryset``.
+    Admins never lose sight of an issue through reassignment.
+    """
+    if user.is_staff or user.role == 'ADMIN':
+        return IssueTombstone.objects.filter(reason='DELETED')
+    if user.role in ['LECTURER', 'HOD']:
+        return IssueTombstone.objects.filter(assigned_to_id=user.pk)
+    return IssueTombstone.objects.filter(student_id=user.pk, reason='DELETED')
+
+
+def issue_changes(issues, tombstones, token, limit=SYNC_BATCH_SIZE):
+    """
+    Return ``(changed_issues, deleted_ids, watermark, has_more)`` for the
+    already role-scoped ``issues`` and ``tombstones`` querysets.
+    """
+    now = timezone.now()
+    since, last_id = decode_watermark(token)
+
+    if last_id is None:
+        since -= SYNC_OVERLAP
+        position = Q(updated_at__gt=since)
+    else:
+        # Continuing a truncated batch: resume exactly after the last row sent
+        position = Q(updated_at__gt=since) | Q(updated_at=since, id__gt=last_id)
+
+    changed = list(
+        issues.filter(position, updated_at__lte=now).order_by('updated_at', 'id')[:limit + 1]
+    )
+    has_more = len(changed) > limit
+    changed = changed[:limit]
+
+    # An issue that came back into view after leaving it is reported as changed
+    changed_ids = {issue.pk for issue in changed}
+    deleted = sorted(
+        set(
+            tombstones.filter(deleted_at__gt=since, deleted_at__lte=now)
+            .order_by().values_list('issue_id', flat=True)
+        ) - changed_ids
+    )
+
+    if has_more:
+        watermark = encode_watermark(changed[-1].updated_at, changed[-1].pk)
+    else:
+        watermark = encode_watermark(now)
+    return changed, deleted, watermark, has_more
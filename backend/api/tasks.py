@@ -0,0 +1,214 @@
+# backend/api/tasks.py
+"""
+Database-backed background tasks.
+
+``enqueue()`` inserts a ``Task`` row, inside the caller's transaction, so a
+job only becomes visible to workers if the write that produced it commits.
+``manage.py run_tasks`` claims due rows (``SELECT ... FOR UPDATE SKIP LOCKED``
+where the database supports it, a single UPDATE otherwise), runs them in a
+thread pool, and retries failures with exponential backoff. Periodic jobs are
+declared in ``settings.TASK_PERIODIC`` and kept scheduled by the workers; they
+are always queued as rows, so without a resident worker they only run when
+``manage.py run_tasks --once`` does (e.g. from cron).
+
+With ``TASKS_EAGER`` set (the default), tasks run in-process once the
+transaction commits, so nothing is left waiting when no worker is deployed.
+"""
+import logging
+import random
+import traceback
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import IntegrityError, connection, transaction
+from django.db.models import F, Max
+from django.utils import timezone
+
+from .models import Task
+
+logger = logging.getLogger(__name__)
+
+TASKS_EAGER = getattr(settings, 'TASKS_EAGER', True)
+TASK_MAX_ATTEMPTS = getattr(settings, 'TASK_MAX_ATTEMPTS', 5)
+TASK_BACKOFF_BASE_SECONDS = getattr(settings, 'TASK_BACKOFF_BASE_SECONDS', 10)
+TASK_BACKOFF_MAX_SECONDS = getattr(settings, 'TASK_BACKOFF_MAX_SECONDS', 3600)
+TASK_LOCK_TIMEOUT_SECONDS = getattr(settings, 'TASK_LOCK_TIMEOUT_SECONDS', 600)
+TASK_RETENTION_DAYS = getattr(settings, 'TASK_RETENTION_DAYS', 7)
+TASK_PERIODIC = getattr(settings, 'TASK_PERIODIC', {})
+
+PENDING = ('QUEUED', 'RUNNING')
+
+_registry = {}
+
+
+def task(name=None, max_attempts=None):
+    """Register a function as a task under ``name`` (default ``<app>.<function>``)."""
+    def decorator(func):
+        task_name = name or f"{func.__module__.split('.')[0]}.{func.__name__}"
+        _registry[task_name] = (func, max_attempts or TASK_MAX_ATTEMPTS)
+        func.task_name = task_name
+        return func
+    return decorator
+
+
+def enqueue(name, kwargs=None, *, delay=None, run_at=None, dedupe_key=None):
+    """
+    Queue task ``name`` with JSON-serialisable ``kwargs``. With a
+    ``dedupe_key``, an already queued or running task with the same key is
+    returned instead of adding another.
+    """
+    func, max_attempts = _registry[name]
+    kwargs = kwargs or {}
+    if TASKS_EAGER:
+        transaction.on_commit(lambda: func(**kwargs))
+        return None
+
+    if run_at is None:
+        run_at = timezone.now() + (delay or timedelta())
+    return _insert(name, kwargs, run_at, max_attempts, dedupe_key)
+
+
+def _insert(name, kwargs, run_at, max_attempts, dedupe_key):
+    try:
+        with transaction.atomic():
+            return Task.objects.create(
+                name=name, kwargs=kwargs, run_at=run_at, max_attempts=max_attempts, dedupe_key=dedupe_key,
+            )
+    except IntegrityError:
+        if dedupe_key is None:
+            raise
+        return Task.objects.filter(dedupe_key=dedupe_key, status__in=PENDING).first()
+
+
+def claim_tasks(worker_id, limit):
+    """Mark up to ``limit`` due tasks as running for this worker and return them."""
+    now = timezone.now()
+    token = f"{worker_id}:{uuid.uuid4().hex[:12]}"
+    due = Task.objects.filter(status='QUEUED', run_at__lte=now).order_by('run_at', 'id')
+    with transaction.atomic():
+        if connection.features.has_select_for_update_skip_locked:
+            ids = list(due.select_for_update(skip_locked=True).values_list('id', flat=True)[:limit])
+            if not ids:
+                return []
+            claimed = Task.objects.filter(id__in=ids)
+        else:
+            # Pick and claim the rows in one UPDATE. On SQLite the transaction
+            # then takes the write lock with its first statement, waiting for
+            # other workers, instead of upgrading a read lock, which fails
+            # outright while another worker holds the write lock.
+            claimed = Task.objects.filter(id__in=due.values('id')[:limit])
+        if not claimed.update(status='RUNNING', locked_by=token, locked_at=now, attempts=F('attempts') + 1):
+            return []
+        return list(Task.objects.filter(locked_by=token))
+
+
+def _backoff(attempts):
+    delay = min(TASK_BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), TASK_BACKOFF_MAX_SECONDS)
+    return timedelta(seconds=delay * random.uniform(1, 1.25))
+
+
+def run_task(task):
+    """Run a claimed task and record the outcome. Returns True on success."""
+    # Only the worker holding the claim may record the result
+    claimed = Task.objects.filter(pk=task.pk, locked_by=task.locked_by)
+    try:
+        if task.name not in _registry:
+            raise LookupError(f"Unknown task {task.name!r}")
+        func, _ = _registry[task.name]
+        with transaction.atomic():
+            func(**task.kwargs)
+    except Exception:
+        error = traceback.format_exc()
+        if task.attempts < task.max_attempts:
+            logger.warning("Task %s failed (attempt %s), retrying", task, task.attempts)
+            claimed.update(
+                status='QUEUED', run_at=timezone.now() + _backoff(task.attempts),
+                locked_by='', locked_at=None, last_error=error,
+            )
+        else:
+            logger.error("Task %s failed permanently:\n%s", task, error)
+            claimed.update(status='FAILED', finished_at=timezone.now(), last_error=error)
+        return False
+    claimed.update(status='DONE', finished_at=timezone.now())
+    return True
+
+
+def recover_stale_tasks():
+    """Requeue (or fail) tasks whose worker died mid-run."""
+    stale = Task.objects.filter(
+        status='RUNNING', locked_at__lt=timezone.now() - timedelta(seconds=TASK_LOCK_TIMEOUT_SECONDS)
+    )
+    stale.filter(attempts__gte=F('max_attempts')).update(
+        status='FAILED', finished_at=timezone.now(), last_error='Worker lost while running the task',
+    )
+    return stale.update(status='QUEUED', locked_by='', locked_at=None)
+
+
+def schedule_periodic_tasks():
+    """
+    Make sure every job in ``TASK_PERIODIC`` has a queued run, due ``every``
+    seconds after its last run finished. Queued as rows even with
+    ``TASKS_EAGER``, since the rows are the schedule.
+    """
+    if not TASK_PERIODIC:
+        return
+    keys = {f'periodic:{name}': name for name in TASK_PERIODIC}
+    pending = set(Task.objects.filter(dedupe_key__in=keys, status__in=PENDING).values_list('dedupe_key', flat=True))
+    last_runs = dict(
+        Task.objects.filter(dedupe_key__in=set(keys) - pending)
+        .values('dedupe_key').annotate(last=Max('finished_at'))
+        .values_list('dedupe_key', 'last')
+    )
+    for key, name in keys.items():
+        if key in pending:
+            continue
+        job = TASK_PERIODIC[name]
+        last = last_runs.get(key)
+        run_at = last + timedelta(seconds=job['every']) if last else timezone.now()
+        _insert(job['task'], job.get('kwargs') or {}, run_at, _registry[job['task']][1], key)
+
+
+# Task definitions
+
+@task()
+def notify_issue_created(issue_id):
+    from .models import Issue
+    from .notifications import NotificationFanout
+
+    issue = Issue.objects.select_related('course').filter(pk=issue_id).first()
+    if issue is None:
+        return
+    fanout = NotificationFanout()
+    fanout.issue_created(issue)
+    fanout.send()
+
+
+@task()
+def rebuild_statistics():
+    from .notifications import rebuild_unread_counts
+    from .statistics import rebuild_statistics as rebuild
+
+    rebuild()
+    rebuild_unread_counts()
+
+
+@task()
+def enforce_notification_retention():
+    from .retention import enforce_retention
+
+    enforce_retention()
+
+
+@task()
+def deliver_email_digests():
+    from .digests import deliver_digests
+
+    deliver_digests()
+
+
+@task()
+def prune_tasks():
+    Task.objects.filter(
+        status__in=['DONE', 'FAILED'], finished_at__lt=timezone.now() - timedelta(days=TASK_RETENTION_DAYS)
+    ).delete()
@@ -1,3 +1,1228 @@
+import csv
+import io
+import json
+import time
+from datetime import datetime, timedelta
+from unittest import mock
+from urllib.parse import quote
+
+from django.core import mail, signing
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from users.models import User
+from users.tokens import ClaimsRefreshToken, forget_token_version
+
+from .bulk import bulk_assign_issues
+from .catalog import CATALOG_CACHE_MAX_AGE, CATALOG_CACHE_TIMEOUT
+from .dashboard_cache import DASHBOARD_CACHE_ALIAS, DASHBOARD_CACHE_TIMEOUT, cached_value
+from .digests import EMAIL_MAX_ATTEMPTS, build_digests, last_period, send_digests
+from .models import (
+    College, Course, Department, EmailDigest, Issue, IssueStatusHistory, IssueTombstone, Notification,
+    NotificationArchive, Task,
+)
+from .notification_templates import TEMPLATES, parse_legacy_message, render_message
+from .notifications import NotificationFanout, rebuild_unread_counts, unread_count
+from .policies import department_policy, issue_policy, staff_department_policy
+from .recipients import RECIPIENT_CACHE_TIMEOUT, admin_ids, department_hod_ids
+from .retention import enforce_retention
+from .search import check_search_index, missing_search_objects
+from .statistics import read_statistics, rebuild_statistics
+from .sync import encode_watermark
+from .tasks import claim_tasks, enqueue, recover_stale_tasks, run_task, schedule_periodic_tasks, task
+
+
+class APITestCase(TestCase):
+    """A college with one department and two courses, a user per role and ``issue_count`` issues."""
+    issue_count = 10
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.college = College.objects.create(name='Science', code='SCI')
+        cls.department = Department.objects.create(
+            department_name='Computer Science', department_code='CS', college=cls.college
+        )
+        cls.courses = [
+            Course.objects.create(course_name='Intro', course_code='CS101', department=cls.department),
+            Course.objects.create(course_name='Algorithms', course_code='CS201', department=cls.department),
+        ]
+        cls.admin = User.objects.create_user('admin@example.com', 'pw', role='ADMIN', is_staff=True)
+        cls.hod = User.objects.create_user('hod@example.com', 'pw', role='HOD', department=cls.department)
+        cls.lecturer = User.objects.create_user('lecturer@example.com', 'pw', role='LECTURER', department=cls.department)
+        cls.student = User.objects.create_user('student@example.com', 'pw', role='STUDENT')
+        for i in range(cls.issue_count):
+            cls.create_issue(title=f'Issue {i}', course=cls.courses[i % 2])
+
+    @classmethod
+    def create_issue(cls, **fields):
+        fields = {
+            'student': cls.student, 'course': cls.courses[0], 'issue_type': 'Appeals',
+            'title': 'Issue', 'description': 'Details', 'status': 'Pending', **fields,
+        }
+        return Issue.objects.create(**fields)
+
+    def setUp(self):
+        # Cache versions are bumped on commit, which never happens inside a test
+        for cache in caches.all():
+            cache.clear()
+
+    def client_for(self, user):
+        client = APIClient()
+        client.force_authenticate(user)
+        return client
+
+    def assertStatisticsConsistent(self):
+        """The incrementally maintained counters match a recount."""
+        maintained = read_statistics()
+        rebuild_statistics()
+        self.assertEqual(maintained, read_statistics())
+
+
+class SparseFieldsetTests(APITestCase):
+    def test_issue_list(self):
+        with self.assertNumQueries(2):
+            response = self.client_for(self.admin).get('/api/issues/?fields=id,title&page_size=100')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), self.issue_count)
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title'})
+
+    def test_issue_changes(self):
+        since = encode_watermark(timezone.now() - timedelta(hours=1))
+        with self.assertNumQueries(2):
+            response = self.client_for(self.admin).get(f'/api/issues/changes/?since={since}&fields=id,title')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['issues']), self.issue_count)
+        self.assertEqual(set(response.data['issues'][0]), {'id', 'title'})
+
+    def test_course_lists(self):
+        client = self.client_for(self.admin)
+        for url in ('/api/course/?fields=id,course_name', f'/api/department/{self.department.pk}/courses/?fields=id'):
+            with self.subTest(url=url), self.assertNumQueries(2):
+                response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(len(response.data), len(self.courses))
+
+    def test_notification_list(self):
+        Notification.objects.bulk_create([
+            Notification(user=self.student, notification_type='STATUS_CHANGED', message=f'Message {i}')
+            for i in range(10)
+        ])
+        with self.assertNumQueries(2):
+            response = self.client_for(self.student).get('/api/notifications/?fields=id')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data), 10)
+        self.assertEqual(set(response.data[0]), {'id'})
+
+    def test_saving_a_sparse_issue_keeps_its_history(self):
+        issue = Issue.objects.only('id').get(title='Issue 0')
+        issue.status = 'Solved'
+        issue.save()
+        self.assertEqual(
+            list(issue.history.order_by('id').values_list('from_status', 'to_status')),
+            [(None, 'Pending'), ('Pending', 'Solved')],
+        )
+
+
+class RecipientCacheTests(APITestCase):
+    def test_role_change_updates_recipients(self):
+        self.assertEqual(admin_ids(), {self.admin.pk})
+        self.assertEqual(department_hod_ids([self.department.pk]), {self.hod.pk})
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.hod.role = 'LECTURER'
+            self.hod.save()
+            self.lecturer.role = 'ADMIN'
+            self.lecturer.save()
+
+        self.assertEqual(admin_ids(), {self.admin.pk, self.lecturer.pk})
+        self.assertEqual(department_hod_ids([self.department.pk]), set())
+
+    def test_changes_missed_by_this_process_expire(self):
+        self.assertEqual(admin_ids(), {self.admin.pk})
+        # As made by another process, whose invalidation this one does not see
+        User.objects.filter(pk=self.student.pk).update(role='ADMIN')
+        self.assertEqual(admin_ids(), {self.admin.pk})
+        with mock.patch('time.time', return_value=time.time() + RECIPIENT_CACHE_TIMEOUT + 1):
+            self.assertEqual(admin_ids(), {self.admin.pk, self.student.pk})
+
+
+class CatalogCacheTests(APITestCase):
+    def test_served_from_cache(self):
+        response = self.client.get('/api/course/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response['Cache-Control'], f'public, max-age={CATALOG_CACHE_MAX_AGE}')
+        with self.assertNumQueries(0):
+            cached = self.client.get('/api/course/')
+            not_modified = self.client.get('/api/course/', HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(cached.content, response.content)
+        self.assertEqual(not_modified.status_code, 304)
+
+    def test_writes_invalidate(self):
+        etag = self.client.get('/api/department/')['ETag']
+        with self.captureOnCommitCallbacks(execute=True):
+            self.college.name = 'Natural Sciences'
+            self.college.save()
+        response = self.client.get('/api/department/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['college_name'], 'Natural Sciences')
+
+    def test_changes_missed_by_this_process_expire(self):
+        etag = self.client.get('/api/college/')['ETag']
+        # As made by another process, whose invalidation this one does not see
+        College.objects.filter(pk=self.college.pk).update(name='Natural Sciences')
+        self.assertEqual(self.client.get('/api/college/', HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        with mock.patch('time.time', return_value=time.time() + CATALOG_CACHE_TIMEOUT + 1):
+            response = self.client.get('/api/college/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]['name'], 'Natural Sciences')
+
+    def test_cached_and_uncached_lists_share_the_meta_ordering(self):
+        cached = [course['course_name'] for course in self.client.get('/api/course/').json()]
+        rendered = [course['course_name'] for course in self.client.get('/api/course/?fields=course_name').json()]
+        self.assertEqual(cached, ['Algorithms', 'Intro'])
+        self.assertEqual(rendered, cached)
+
+
+class IssuePaginationTests(APITestCase):
+    issue_count = 30
+
+    def test_issue_lists_are_paginated(self):
+        Issue.objects.update(assigned_to=self.lecturer)
+        client = self.client_for(self.admin)
+        for url in (
+            '/api/issues/',
+            f'/api/department/{self.department.pk}/issues/',
+            f'/api/users/{self.lecturer.pk}/issues/',
+        ):
+            with self.subTest(url=url):
+                response = client.get(url)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.data['results']), 25)
+                self.assertIsNotNone(response.data['next'])
+
+    def test_page_size(self):
+        client = self.client_for(self.admin)
+        self.assertEqual(len(client.get('/api/issues/?page_size=10').data['results']), 10)
+        # Capped at ISSUE_MAX_PAGE_SIZE; larger sizes do not unbound the page
+        self.assertEqual(len(client.get('/api/issues/?page_size=1000').data['results']), self.issue_count)
+
+    def test_cursor_round_trip(self):
+        client = self.client_for(self.admin)
+        expected = list(Issue.objects.order_by('-created_at', '-id').values_list('id', flat=True))
+
+        seen, pages, url = [], [], '/api/issues/?page_size=7'
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            pages.append(response.data)
+            seen.extend(issue['id'] for issue in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+        self.assertIsNone(pages[0]['previous'])
+
+        # Walking back from the last page returns the pages before it
+        response = client.get(pages[-1]['previous'])
+        self.assertEqual(response.data['results'], pages[-2]['results'])
+
+    def test_invalid_cursor(self):
+        client = self.client_for(self.admin)
+        for url in ('/api/issues/?cursor=not-a-cursor', '/api/notifications/inbox/?cursor=not-a-cursor'):
+            with self.subTest(url=url):
+                self.assertEqual(client.get(url).status_code, 404)
+
+
+class NotificationFanoutTests(APITestCase):
+    def notifications(self, issue, notification_type):
+        return set(
+            Notification.objects.filter(issue=issue, notification_type=notification_type).values_list('user_id', flat=True)
+        )
+
+    def test_issue_created(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            issue = self.create_issue()
+        self.assertEqual(self.notifications(issue, 'ISSUE_CREATED'), {self.admin.pk, self.hod.pk})
+        self.assertEqual(unread_count(self.admin.pk), 1)
+
+    def test_queries_do_not_depend_on_the_number_of_recipients(self):
+        issue = self.create_issue()
+
+        def fanout_queries():
+            for cache in caches.all():
+                cache.clear()
+            fanout = NotificationFanout()
+            with CaptureQueriesContext(connection) as queries:
+                fanout.issue_created(issue)
+                fanout.send()
+            return len(queries)
+
+        queries = fanout_queries()
+        for i in range(20):
+            User.objects.create_user(f'admin{i}@example.com', 'pw', role='ADMIN')
+        self.assertEqual(fanout_queries(), queries)
+        self.assertEqual(len(self.notifications(issue, 'ISSUE_CREATED')), 22)
+
+    def test_assignment_and_status_change(self):
+        issue = Issue.objects.get(pk=self.create_issue().pk)
+        issue.assigned_to = self.lecturer
+        issue.status = 'InProgress'
+        issue.save()
+        # Moving to InProgress on assignment is covered by the assignment notification
+        self.assertEqual(self.notifications(issue, 'ISSUE_ASSIGNED'), {self.lecturer.pk, self.student.pk})
+        self.assertEqual(self.notifications(issue, 'STATUS_CHANGED'), set())
+
+        issue._changed_by = self.lecturer
+        issue.status = 'Solved'
+        issue.save()
+        # The assignee made the change, so only the student hears of it
+        self.assertEqual(self.notifications(issue, 'STATUS_CHANGED'), {self.student.pk})
+
+    def test_creation_fanout_with_a_worker(self):
+        with mock.patch('api.tasks.TASKS_EAGER', False):
+            with self.captureOnCommitCallbacks(execute=True):
+                issue = self.create_issue()
+        self.assertEqual(self.notifications(issue, 'ISSUE_CREATED'), set())
+
+        [task] = claim_tasks('test', 10)
+        self.assertEqual(task.name, 'api.notify_issue_created')
+        self.assertTrue(run_task(task))
+        self.assertEqual(self.notifications(issue, 'ISSUE_CREATED'), {self.admin.pk, self.hod.pk})
+
+
+calls = []
+
+
+@task(name='tests.record', max_attempts=2)
+def record_call(value, fail=False):
+    calls.append(value)
+    if fail:
+        raise ValueError(value)
+
+
+@mock.patch('api.tasks.TASKS_EAGER', False)
+class TaskQueueTests(TestCase):
+    def setUp(self):
+        calls.clear()
+
+    def test_workers_claim_disjoint_tasks(self):
+        for i in range(3):
+            enqueue('tests.record', {'value': i})
+        enqueue('tests.record', {'value': 'later'}, delay=timedelta(hours=1))
+
+        first, second = claim_tasks('a', 2), claim_tasks('b', 2)
+        self.assertEqual([task.kwargs['value'] for task in first + second], [0, 1, 2])
+        self.assertEqual({task.status for task in first + second}, {'RUNNING'})
+        self.assertEqual(claim_tasks('c', 2), [])
+
+        self.assertTrue(all(run_task(task) for task in first + second))
+        self.assertEqual(calls, [0, 1, 2])
+        self.assertEqual(Task.objects.filter(status='DONE').count(), 3)
+
+    def test_retry_with_backoff(self):
+        enqueue('tests.record', {'value': 'x', 'fail': True})
+        [task] = claim_tasks('a', 1)
+        with self.assertLogs('api.tasks', 'WARNING'):
+            self.assertFalse(run_task(task))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts, task.locked_by), ('QUEUED', 1, ''))
+        self.assertGreater(task.run_at, timezone.now())
+        self.assertIn('ValueError', task.last_error)
+
+        Task.objects.update(run_at=timezone.now())
+        [task] = claim_tasks('a', 1)
+        with self.assertLogs('api.tasks', 'ERROR'):
+            self.assertFalse(run_task(task))
+        task.refresh_from_db()
+        self.assertEqual((task.status, task.attempts), ('FAILED', 2))
+        self.assertEqual(calls, ['x', 'x'])
+
+    def test_only_the_claiming_worker_records_the_outcome(self):
+        enqueue('tests.record', {'value': 1})
+        [task] = claim_tasks('a', 1)
+        Task.objects.update(locked_by='someone else')
+        run_task(task)
+        self.assertEqual(Task.objects.get().status, 'RUNNING')
+
+    def test_stale_tasks_are_recovered(self):
+        enqueue('tests.record', {'value': 1})
+        claim_tasks('a', 1)
+        Task.objects.update(locked_at=timezone.now() - timedelta(days=1))
+        self.assertEqual(recover_stale_tasks(), 1)
+        self.assertEqual(len(claim_tasks('b', 1)), 1)
+
+    def test_dedupe_key(self):
+        first = enqueue('tests.record', {'value': 1}, dedupe_key='only-one')
+        self.assertEqual(enqueue('tests.record', {'value': 2}, dedupe_key='only-one'), first)
+        self.assertEqual(Task.objects.count(), 1)
+
+    @mock.patch('api.tasks.TASKS_EAGER', True)
+    @mock.patch('api.tasks.TASK_PERIODIC', {'job': {'task': 'tests.record', 'every': 60, 'kwargs': {'value': 'p'}}})
+    def test_periodic_jobs_are_queued_without_a_worker(self):
+        schedule_periodic_tasks()
+        schedule_periodic_tasks()
+        [task] = claim_tasks('cron', 10)
+        self.assertEqual(task.dedupe_key, 'periodic:job')
+        run_task(task)
+
+        # The next run is due ``every`` seconds after this one finished
+        schedule_periodic_tasks()
+        queued = Task.objects.get(status='QUEUED')
+        self.assertGreater(queued.run_at, timezone.now() + timedelta(seconds=50))
+        self.assertEqual(claim_tasks('cron', 10), [])
+
+
+class BulkActionTests(APITestCase):
+    def test_bulk_assign(self):
+        issues = list(Issue.objects.order_by('id')[:4])
+        Issue.objects.filter(pk=issues[0].pk).update(assigned_to=self.lecturer, status='InProgress')
+        Issue.objects.filter(pk=issues[1].pk).update(assigned_to=self.hod)
+        rebuild_statistics()
+        unchanged = Issue.objects.get(pk=issues[0].pk).updated_at
+
+        response = self.client_for(self.admin).post('/api/issues/bulk_assign/', {
+            'issue_ids': [issue.pk for issue in issues], 'user_id': self.lecturer.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 3)
+
+        self.assertEqual(set(Issue.objects.filter(pk__in=[issue.pk for issue in issues]).values_list(
+            'assigned_to_id', 'status')), {(self.lecturer.pk, 'InProgress')})
+        # The issue that already belonged to the lecturer is left alone
+        self.assertEqual(Issue.objects.get(pk=issues[0].pk).updated_at, unchanged)
+        self.assertEqual(
+            set(Notification.objects.filter(notification_type='ISSUE_ASSIGNED', user=self.lecturer)
+                .values_list('issue_id', flat=True)),
+            {issue.pk for issue in issues[1:]},
+        )
+        self.assertEqual(IssueStatusHistory.objects.filter(to_assignee=self.lecturer).count(), 3)
+        self.assertEqual(list(IssueTombstone.objects.values_list('issue_id', 'assigned_to_id')), [(issues[1].pk, self.hod.pk)])
+        self.assertStatisticsConsistent()
+
+    def test_bulk_assign_is_all_or_nothing(self):
+        other = Department.objects.create(department_name='Mathematics', department_code='MA', college=self.college)
+        outside = self.create_issue(course=Course.objects.create(course_name='Calculus', course_code='MA101', department=other))
+        inside = Issue.objects.filter(course__department=self.department).first()
+
+        response = self.client_for(self.hod).post('/api/issues/bulk_assign/', {
+            'issue_ids': [inside.pk, outside.pk], 'user_id': self.lecturer.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+        self.assertEqual(response.data['issue_ids'], [outside.pk])
+        self.assertFalse(Issue.objects.filter(assigned_to=self.lecturer).exists())
+
+        response = self.client_for(self.lecturer).post('/api/issues/bulk_assign/', {
+            'issue_ids': [inside.pk], 'user_id': self.lecturer.pk,
+        }, format='json')
+        self.assertEqual(response.status_code, 403)
+
+    def test_bulk_update_status(self):
+        issues = list(Issue.objects.order_by('id')[:3])
+        Issue.objects.filter(pk=issues[0].pk).update(status='Solved')
+        rebuild_statistics()
+
+        response = self.client_for(self.admin).post('/api/issues/bulk_update_status/', {
+            'issue_ids': [issue.pk for issue in issues], 'status': 'Solved',
+        }, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['updated'], 2)
+        self.assertEqual(
+            set(Notification.objects.filter(notification_type='STATUS_CHANGED').values_list('issue_id', flat=True)),
+            {issue.pk for issue in issues[1:]},
+        )
+        self.assertEqual(IssueStatusHistory.objects.filter(to_status='Solved', changed_by=self.admin).count(), 2)
+        self.assertStatisticsConsistent()
+
+
+class StatisticsConsistencyTests(APITestCase):
+    """The admin dashboard counters match a recount after every kind of write."""
+
+    def test_issue_writes(self):
+        client = self.client_for(self.admin)
+        issue = self.create_issue(course=self.courses[1])
+        self.assertStatisticsConsistent()
+
+        response = client.patch(f'/api/issues/{issue.pk}/update_status/', {'status': 'InProgress'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertStatisticsConsistent()
+
+        issue = Issue.objects.get(pk=issue.pk)
+        issue.course = self.courses[0]
+        issue.issue_type = 'Corrections'
+        issue.save()
+        self.assertStatisticsConsistent()
+
+        ids = list(Issue.objects.values_list('id', flat=True)[:4])
+        response = client.post('/api/issues/bulk_update_status/', {'issue_ids': ids, 'status': 'Solved'}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertStatisticsConsistent()
+
+        Issue.objects.only('id').get(pk=issue.pk).delete()
+        self.assertStatisticsConsistent()
+
+    def test_course_move_and_user_writes(self):
+        other = Department.objects.create(department_name='Mathematics', department_code='MA', college=self.college)
+        course = Course.objects.only('id').get(pk=self.courses[1].pk)
+        course.department = other
+        course.save()
+        self.assertStatisticsConsistent()
+
+        user = User.objects.only('id').get(pk=self.student.pk)
+        user.role = 'LECTURER'
+        user.save()
+        self.assertStatisticsConsistent()
+
+        User.objects.get(pk=self.lecturer.pk).delete()
+        self.assertStatisticsConsistent()
+
+    def test_admin_dashboard_reads_the_counters(self):
+        with self.assertNumQueries(1):
+            statistics = read_statistics()
+        self.assertEqual(statistics['issues']['total'], self.issue_count)
+        self.assertEqual(statistics['issues']['by_type'], {'Appeals': self.issue_count})
+        self.assertEqual(statistics['users']['students'], 1)
+
+        response = self.client_for(self.admin).get('/api/dashboard/admin/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['statistics'], statistics)
+
+
+class UnreadCounterTests(APITestCase):
+    def assertUnreadConsistent(self, user):
+        self.assertEqual(unread_count(user.pk), Notification.objects.filter(user=user, read=False).count())
+
+    def notify(self, user, count):
+        for i in range(count):
+            Notification.objects.create(user=user, notification_type='STATUS_CHANGED', message=f'Message {i}')
+
+    def test_counter_follows_writes(self):
+        client = self.client_for(self.student)
+        Notification.objects.bulk_create([
+            Notification(user=self.student, notification_type='STATUS_CHANGED', message=f'Bulk {i}')
+            for i in range(5)
+        ])
+        rebuild_unread_counts()
+        self.notify(self.student, 3)
+        self.assertUnreadConsistent(self.student)
+
+        ids = list(Notification.objects.filter(user=self.student).values_list('id', flat=True))
+        response = client.post(f'/api/notifications/{ids[0]}/mark_as_read/')
+        self.assertEqual(response.status_code, 200)
+        self.assertUnreadConsistent(self.student)
+
+        response = client.post('/api/notifications/mark_as_read/', {'ids': ids[:3]}, format='json')
+        self.assertEqual(response.data, {'updated': 2, 'unread': 5})
+        self.assertUnreadConsistent(self.student)
+
+        notification = Notification.objects.only('id').get(pk=ids[1])
+        notification.read = False
+        notification.save()
+        self.assertUnreadConsistent(self.student)
+
+        Notification.objects.filter(pk__in=ids[1:5]).delete()
+        self.assertUnreadConsistent(self.student)
+
+        client.post('/api/notifications/mark_all_as_read/')
+        self.assertEqual(client.get('/api/notifications/unread_count/').data, {'unread': 0})
+        self.assertUnreadConsistent(self.student)
+
+    def test_batch_only_reaches_own_notifications(self):
+        self.notify(self.lecturer, 2)
+        ids = list(Notification.objects.values_list('id', flat=True))
+        response = self.client_for(self.student).post('/api/notifications/mark_as_read/', {'ids': ids}, format='json')
+        self.assertEqual(response.data, {'updated': 0, 'unread': 0})
+        self.assertEqual(unread_count(self.lecturer.pk), 2)
+
+    def test_unread_count_is_one_query(self):
+        self.notify(self.student, 3)
+        client = self.client_for(self.student)
+        with self.assertNumQueries(1):
+            self.assertEqual(client.get('/api/notifications/unread_count/').data, {'unread': 3})
+
+    def test_inbox(self):
+        self.notify(self.student, 7)
+        oldest = Notification.objects.filter(user=self.student).order_by('id')[:2]
+        Notification.objects.filter(pk__in=list(oldest.values_list('id', flat=True))).update(read=True)
+        expected = list(
+            Notification.objects.filter(user=self.student, read=False).order_by('-created_at', '-id').values_list('id', flat=True)
+        )
+        client = self.client_for(self.student)
+        seen, url = [], '/api/notifications/inbox/?read=false&page_size=2'
+        while url:
+            response = client.get(url)
+            seen.extend(notification['id'] for notification in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, expected)
+
+
+class ConditionalGetTests(APITestCase):
+    def assertRevalidates(self, client, url, change, modified=True):
+        etag = client.get(url)['ETag']
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        change()
+        self.assertEqual(client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200 if modified else 304)
+
+    def test_issue_list(self):
+        client = self.client_for(self.admin)
+        self.assertRevalidates(client, '/api/issues/', lambda: Issue.objects.filter(title='Issue 0').update(
+            status='Solved', updated_at=timezone.now() + timedelta(seconds=1),
+        ))
+
+    def test_issue_detail(self):
+        client = self.client_for(self.admin)
+        issue = Issue.objects.get(title='Issue 0')
+        response = client.get(f'/api/issues/{issue.pk}/')
+        self.assertEqual(
+            client.get(f'/api/issues/{issue.pk}/', HTTP_IF_NONE_MATCH=response['ETag']).status_code, 304
+        )
+        self.assertEqual(
+            client.get(f'/api/issues/{issue.pk}/', HTTP_IF_MODIFIED_SINCE=response['Last-Modified']).status_code, 304
+        )
+
+    def test_validators_are_per_user(self):
+        etag = self.client_for(self.admin).get('/api/issues/')['ETag']
+        response = self.client_for(self.student).get('/api/issues/', HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+
+    def test_nested_changes(self):
+        Issue.objects.update(assigned_to=self.lecturer)
+        client = self.client_for(self.admin)
+        issue = Issue.objects.get(title='Issue 0')
+
+        def rename(instance, **fields):
+            def change():
+                for name, value in fields.items():
+                    setattr(instance, name, value)
+                instance.updated_at = timezone.now() + timedelta(seconds=1)
+                instance.save()
+            return change
+
+        for url in ('/api/issues/', f'/api/issues/{issue.pk}/'):
+            with self.subTest(url=url):
+                self.assertRevalidates(client, url, rename(User.objects.get(pk=self.student.pk), first_name='Ada'))
+                self.assertRevalidates(client, url, rename(User.objects.get(pk=self.lecturer.pk), last_name='Lovelace'))
+                self.assertRevalidates(client, url, rename(Course.objects.get(pk=self.courses[0].pk), course_name='Intro II'))
+                self.assertRevalidates(client, url, rename(Department.objects.get(pk=self.department.pk), department_code='CSC'))
+
+        # Deleting the assignee nulls assigned_to without touching the issues
+        self.assertRevalidates(client, '/api/issues/', lambda: User.objects.filter(pk=self.lecturer.pk).delete())
+
+    def test_notification_messages_follow_the_issue(self):
+        issue = Issue.objects.get(title='Issue 0')
+        Notification.objects.create(user=self.student, issue=issue, notification_type='STATUS_CHANGED',
+                                    template='own_issue_status_changed', params={'status': 'Solved'})
+        client = self.client_for(self.student)
+        self.assertRevalidates(client, '/api/notifications/', lambda: Issue.objects.filter(pk=issue.pk).update(
+            title='Renamed', updated_at=timezone.now() + timedelta(seconds=1),
+        ))
+        self.assertIn('Renamed', client.get('/api/notifications/').data[0]['message'])
+
+    def test_catalog_details(self):
+        course = self.courses[0]
+        self.assertRevalidates(
+            self.client_for(self.admin), f'/api/course/{course.pk}/',
+            lambda: Department.objects.filter(pk=self.department.pk).update(
+                department_name='Computing', updated_at=timezone.now() + timedelta(seconds=1),
+            ),
+        )
+
+
+class SearchTests(APITestCase):
+    def search(self, query, user=None):
+        response = self.client_for(user or self.admin).get('/api/issues/search/', {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return [issue['title'] for issue in response.data['results']]
+
+    def test_index_is_installed(self):
+        self.assertEqual(missing_search_objects(connection), [])
+        self.assertEqual(check_search_index(databases=['default']), [])
+
+    def test_check_reports_missing_triggers(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite triggers')
+        with connection.cursor() as cursor:
+            cursor.execute('DROP TRIGGER api_issue_fts_au')
+        self.assertEqual(missing_search_objects(connection), ['api_issue_fts_au'])
+        self.assertEqual([error.id for error in check_search_index(databases=['default'])], ['api.E001'])
+
+    def test_ranking_and_prefix(self):
+        self.create_issue(title='Missing marks', description='Exam')
+        self.create_issue(title='Exam timetable', description='Missing room')
+        self.assertEqual(self.search('missing'), ['Missing marks', 'Exam timetable'])
+        self.assertEqual(self.search('timet'), ['Exam timetable'])
+        self.assertEqual(self.search('"unbalanced OR'), [])
+
+    def test_index_follows_writes(self):
+        issue = self.create_issue(title='Wrong grade')
+        self.assertEqual(self.search('grade'), ['Wrong grade'])
+        Issue.objects.filter(pk=issue.pk).update(title='Wrong score')
+        self.assertEqual(self.search('grade'), [])
+        self.assertEqual(self.search('score'), ['Wrong score'])
+        issue.delete()
+        self.assertEqual(self.search('score'), [])
+
+    def test_scoped_to_visible_issues(self):
+        self.create_issue(title='Lost transcript')
+        other = User.objects.create_user('other@example.com', 'pw', role='STUDENT')
+        self.assertEqual(self.search('transcript', self.student), ['Lost transcript'])
+        self.assertEqual(self.search('transcript', other), [])
+
+
+class NotificationTemplateTests(APITestCase):
+    def test_render_reads_the_issue(self):
+        issue = self.create_issue(title='Missing marks')
+        Notification.objects.create(
+            user=self.student, issue=issue, notification_type='STATUS_UPDATE',
+            template='own_issue_status_changed', params={'status': 'Solved'},
+        )
+        client = self.client_for(self.student)
+        self.assertEqual(
+            [item['message'] for item in client.get('/api/notifications/').data],
+            ["Your issue 'Missing marks' status changed to Solved"],
+        )
+        Issue.objects.filter(pk=issue.pk).update(title='Missing exam marks')
+        self.assertEqual(
+            [item['message'] for item in client.get('/api/notifications/').data],
+            ["Your issue 'Missing exam marks' status changed to Solved"],
+        )
+
+    def test_render_without_template(self):
+        self.assertEqual(render_message('', {}, 'Free text'), 'Free text')
+        self.assertEqual(render_message('retired_template', {}, 'Old text'), 'Old text')
+        self.assertEqual(
+            render_message('issue_created_for_course', {}, title='Lost transcript', course='Intro'),
+            "New issue 'Lost transcript' has been created for Intro",
+        )
+
+    def test_parse_legacy_message(self):
+        self.assertEqual(
+            parse_legacy_message("Your issue 'Wrong grade' status has been updated to InProgress", 'Wrong grade'),
+            ('own_issue_status_updated', {'status': 'InProgress'}),
+        )
+        self.assertEqual(
+            parse_legacy_message("New issue 'It's late' has been created by ada@example.com", "It's late"),
+            ('issue_created_by', {'student': 'ada@example.com'}),
+        )
+        # The title must be the issue's, or the text is kept as is
+        self.assertIsNone(parse_legacy_message("Issue 'Renamed' has been assigned to you", 'Wrong grade'))
+        self.assertIsNone(parse_legacy_message('Welcome!', 'Wrong grade'))
+
+    def test_parse_round_trips(self):
+        for template, text in TEMPLATES.items():
+            params = {'status': 'Solved', 'student': 'ada@example.com', 'assignee': 'Grace Hopper'}
+            message = text.format(title='Wrong grade', course='Intro', **params)
+            parsed_template, parsed_params = parse_legacy_message(message, 'Wrong grade')
+            self.assertEqual(
+                render_message(parsed_template, parsed_params, title='Wrong grade', course='Intro'), message,
+            )
+
+
+class NotificationStreamTests(APITestCase):
+    def ticket(self, user=None):
+        response = self.client_for(user or self.student).post('/api/notifications/stream/ticket/')
+        self.assertEqual(response.status_code, 200)
+        return response.data['ticket']
+
+    def poll(self, **params):
+        response = APIClient().get('/api/notifications/stream/', params)
+        if response.status_code != 200:
+            return response.status_code, []
+        events = []
+        for block in response.content.decode().split('\n\n'):
+            fields = dict(line.split(': ', 1) for line in block.splitlines() if not line.startswith('retry'))
+            if 'event' in fields:
+                events.append((fields['event'], fields.get('id'), json.loads(fields['data'])))
+        return response.status_code, events
+
+    def notify(self, age):
+        notification = Notification.objects.create(
+            user=self.student, notification_type='STATUS_UPDATE', message='Solved',
+        )
+        Notification.objects.filter(pk=notification.pk).update(updated_at=timezone.now() - age)
+        return notification
+
+    def test_ticket_opens_the_stream(self):
+        status, events = self.poll(ticket=self.ticket())
+        self.assertEqual(status, 200)
+        self.assertEqual(events[-1][0], 'unread_count')
+
+    def test_rejected_credentials(self):
+        access = str(ClaimsRefreshToken.for_user(self.student).access_token)
+        self.assertEqual(self.poll(token=access)[0], 403)
+        self.assertEqual(self.poll(ticket=access)[0], 403)
+        # Signed for another purpose
+        self.assertEqual(self.poll(ticket=signing.dumps({'user': self.student.pk, 'ver': 0}))[0], 403)
+        ticket = self.ticket()
+        with mock.patch('api.events.SSE_TICKET_SECONDS', -1):
+            self.assertEqual(self.poll(ticket=ticket)[0], 403)
+
+    def test_ticket_dies_with_the_tokens(self):
+        ticket = self.ticket()
+        with self.captureOnCommitCallbacks(execute=True):
+            User.objects.filter(pk=self.student.pk).update(token_version=self.student.token_version + 1)
+            forget_token_version(self.student.pk)
+        self.assertEqual(self.poll(ticket=ticket)[0], 403)
+
+    def test_polling_sends_each_event_once(self):
+        ticket = self.ticket()
+        first, second = self.notify(timedelta(seconds=30)), self.notify(timedelta(seconds=20))
+        status, events = self.poll(ticket=ticket, last_event_id=encode_watermark(timezone.now() - timedelta(minutes=1)))
+        self.assertEqual([data['id'] for name, _, data in events if name == 'notification'], [first.pk, second.pk])
+        resume = events[-1][1]
+
+        third = self.notify(timedelta(0))
+        later = timezone.now() + timedelta(seconds=5)
+        with mock.patch('api.events.timezone.now', return_value=later):
+            status, events = self.poll(ticket=ticket, last_event_id=resume)
+            self.assertEqual([data['id'] for name, _, data in events if name == 'notification'], [third.pk])
+
+            status, events = self.poll(ticket=ticket, last_event_id=events[-1][1])
+            self.assertEqual([name for name, _, _ in events], ['unread_count'])
+
+    def test_polling_waits_for_rows_to_settle(self):
+        ticket = self.ticket()
+        resume = self.poll(ticket=ticket)[1][-1][1]
+        recent = self.notify(timedelta(0))
+        self.assertEqual([name for name, _, _ in self.poll(ticket=ticket, last_event_id=resume)[1]], ['unread_count'])
+        with mock.patch('api.events.timezone.now', return_value=timezone.now() + timedelta(seconds=5)):
+            status, events = self.poll(ticket=ticket, last_event_id=resume)
+        self.assertEqual([data['id'] for name, _, data in events if name == 'notification'], [recent.pk])
+
+
+class DashboardCacheTests(APITestCase):
+    def cache_header(self, user, url):
+        response = self.client_for(user).get(url)
+        self.assertEqual(response.status_code, 200)
+        return response['X-Dashboard-Cache']
+
+    def assertInvalidates(self, change, admin, lecturer=False):
+        """Warm both dashboards, make ``change`` and check which of them missed."""
+        dashboards = {'admin': (self.admin, '/api/dashboard/admin/'), 'lecturer': (self.lecturer, '/api/dashboard/lecturer/')}
+        for user, url in dashboards.values():
+            self.cache_header(user, url)
+            self.assertEqual(self.cache_header(user, url), 'HIT')
+        with self.captureOnCommitCallbacks(execute=True):
+            change()
+        expected = {'admin': 'MISS' if admin else 'HIT', 'lecturer': 'MISS' if lecturer else 'HIT'}
+        self.assertEqual({name: self.cache_header(*dashboard) for name, dashboard in dashboards.items()}, expected)
+
+    def save_issue(self, **fields):
+        issue = Issue.objects.order_by('id').first()
+        for name, value in fields.items():
+            setattr(issue, name, value)
+        issue.save()
+
+    def test_assignment_keeps_admin_dashboard(self):
+        self.assertInvalidates(lambda: self.save_issue(assigned_to=self.lecturer), admin=False, lecturer=True)
+
+    def test_issue_changes_shown_to_admins(self):
+        self.assertInvalidates(lambda: self.save_issue(status='Solved'), admin=True)
+        self.assertInvalidates(lambda: self.save_issue(title='Renamed'), admin=True)
+        self.assertInvalidates(lambda: self.save_issue(description='More details'), admin=False)
+
+    def test_bulk_assignment(self):
+        issue = Issue.objects.get(title='Issue 0')
+        Issue.objects.filter(pk=issue.pk).update(status='InProgress')
+        self.assertInvalidates(
+            lambda: bulk_assign_issues(Issue.objects.all(), [issue.pk], self.lecturer), admin=False, lecturer=True,
+        )
+
+    def test_user_changes(self):
+        def rename():
+            student = User.objects.get(pk=self.student.pk)
+            student.first_name = 'Ada'
+            student.save()
+
+        def promote():
+            student = User.objects.get(pk=self.student.pk)
+            student.role = 'LECTURER'
+            student.save()
+
+        self.assertInvalidates(rename, admin=False)
+        self.assertInvalidates(promote, admin=True)
+
+    def test_catalog_changes(self):
+        def rename_course():
+            course = Course.objects.get(pk=self.courses[0].pk)
+            course.course_name = 'Introduction'
+            course.save()
+
+        def rename_department():
+            department = Department.objects.get(pk=self.department.pk)
+            department.department_name = 'Computing'
+            department.save()
+
+        self.assertInvalidates(rename_course, admin=False, lecturer=True)
+        self.assertInvalidates(rename_department, admin=True, lecturer=True)
+
+    def test_cached_values_expire(self):
+        cache = caches[DASHBOARD_CACHE_ALIAS]
+        with mock.patch.object(cache, 'set', wraps=cache.set) as cache_set:
+            self.assertEqual(cached_value('answer', ['tests'], lambda: 42), 42)
+        self.assertEqual(cache_set.call_args.kwargs['timeout'], DASHBOARD_CACHE_TIMEOUT)
+        self.assertEqual(cached_value('answer', ['tests'], lambda: 0), 42)
+
+
+class ExportTests(APITestCase):
+    def export(self, user, url):
+        response = self.client_for(user).get(url)
+        self.assertEqual(response.status_code, 200)
+        return b''.join(response.streaming_content).decode()
+
+    def test_issue_csv(self):
+        rows = list(csv.DictReader(io.StringIO(self.export(self.admin, '/api/issues/export/?format=csv'))))
+        self.assertEqual(len(rows), self.issue_count)
+        self.assertEqual({row['student_email'] for row in rows}, {self.student.email})
+        self.assertEqual({row['department'] for row in rows}, {self.department.department_name})
+
+    def test_issue_ndjson_is_scoped(self):
+        other = User.objects.create_user('other@example.com', 'pw', role='STUDENT')
+        self.create_issue(student=other, title='Not mine')
+        lines = self.export(self.student, '/api/issues/export/?format=ndjson').splitlines()
+        self.assertEqual(len(lines), self.issue_count)
+        self.assertNotIn('Not mine', {json.loads(line)['title'] for line in lines})
+
+    def test_csv_formulas_are_escaped(self):
+        self.create_issue(title='=HYPERLINK("http://example.com")', description='-2+3')
+        rows = list(csv.DictReader(io.StringIO(self.export(self.admin, '/api/issues/export/?format=csv'))))
+        row = next(row for row in rows if 'HYPERLINK' in row['title'])
+        self.assertEqual(row['title'], '\'=HYPERLINK("http://example.com")')
+        self.assertEqual(row['description'], "'-2+3")
+        self.assertIn('Issue 0', {row['title'] for row in rows})
+
+        ndjson = self.export(self.admin, '/api/issues/export/?format=ndjson').splitlines()
+        self.assertIn('=HYPERLINK("http://example.com")', {json.loads(line)['title'] for line in ndjson})
+
+    def test_notification_csv(self):
+        issue = self.create_issue(title='Missing marks')
+        Notification.objects.create(
+            user=self.student, issue=issue, notification_type='STATUS_UPDATE',
+            template='own_issue_status_changed', params={'status': 'Solved'},
+        )
+        rows = list(csv.DictReader(io.StringIO(self.export(self.admin, '/api/notifications/export/?format=csv'))))
+        self.assertEqual([row['message'] for row in rows], ["Your issue 'Missing marks' status changed to Solved"])
+        self.assertEqual(self.client_for(self.student).get('/api/notifications/export/').status_code, 403)
+
+
+class CatalogTreeTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.maths = Department.objects.create(department_name='Mathematics', department_code='MA', college=cls.college)
+        algebra = Course.objects.create(course_name='Algebra', course_code='MA101', department=cls.maths)
+        for i in range(3):
+            cls.create_issue(title=f'Algebra {i}', course=algebra)
+        College.objects.create(name='Arts', code='ART')
+
+    def tree(self, query=''):
+        with self.assertNumQueries(3):
+            response = self.client_for(self.student).get(f'/api/catalog/tree/{query}')
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_counts(self):
+        science, arts = self.tree()
+        self.assertEqual(science['issue_count'], self.issue_count + 3)
+        self.assertEqual(
+            [(department['department_code'], department['issue_count']) for department in science['departments']],
+            [('CS', self.issue_count), ('MA', 3)],
+        )
+        self.assertEqual([course['issue_count'] for course in science['departments'][0]['courses']], [5, 5])
+        self.assertEqual((arts['issue_count'], arts['departments']), (0, []))
+
+    def test_narrowed_to_a_department(self):
+        [science] = self.tree(f'?department={self.maths.pk}')
+        self.assertEqual(science['issue_count'], 3)
+        self.assertEqual([department['department_code'] for department in science['departments']], ['MA'])
+
+    def test_narrowed_to_a_college(self):
+        [science] = self.tree(f'?college={self.college.pk}')
+        self.assertEqual(science['issue_count'], self.issue_count + 3)
+        self.assertEqual(len(science['departments']), 2)
+
+
+class PolicyTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        cls.maths = Department.objects.create(department_name='Mathematics', department_code='MA', college=cls.college)
+        cls.algebra = Course.objects.create(course_name='Algebra', course_code='MA101', department=cls.maths)
+        cls.role_admin = User.objects.create_user('role-admin@example.com', 'pw', role='ADMIN')
+
+    def status_codes(self, user, urls):
+        client = self.client_for(user)
+        return [client.get(url).status_code for url in urls]
+
+    def test_department_endpoints_admit_staff_only(self):
+        urls = [f'/api/department/{self.department.pk}/{name}/' for name in ('issues', 'staff', 'courses')]
+        self.assertEqual(self.status_codes(self.admin, urls), [200, 200, 200])
+        self.assertEqual(self.status_codes(self.hod, urls), [200, 200, 200])
+        self.assertEqual(self.status_codes(self.role_admin, urls), [403, 403, 403])
+        self.assertEqual(self.status_codes(self.lecturer, urls), [403, 403, 403])
+
+        other = [f'/api/department/{self.maths.pk}/{name}/' for name in ('issues', 'staff', 'courses')]
+        self.assertEqual(self.status_codes(self.hod, other), [403, 403, 403])
+        self.assertEqual(self.status_codes(self.admin, ['/api/department/0/issues/']), [404])
+
+    def test_detail_outside_the_department(self):
+        for url in (f'/api/department/{self.maths.pk}/', f'/api/course/{self.algebra.pk}/'):
+            self.assertEqual(self.status_codes(self.hod, [url]), [403])
+            self.assertEqual(self.status_codes(self.role_admin, [url]), [200])
+        # HODs cannot tell a missing object from another department's
+        self.assertEqual(self.status_codes(self.hod, ['/api/department/0/', '/api/course/0/']), [403, 403])
+        self.assertEqual(self.status_codes(self.admin, ['/api/department/0/', '/api/course/0/']), [404, 404])
+
+    def test_detail_in_the_department(self):
+        urls = [f'/api/department/{self.department.pk}/', f'/api/course/{self.courses[0].pk}/']
+        self.assertEqual(self.status_codes(self.hod, urls), [200, 200])
+        self.assertEqual(self.status_codes(self.lecturer, urls), [403, 403])
+
+    def test_scope(self):
+        self.create_issue(title='Algebra', course=self.algebra)
+        self.assertEqual(issue_policy.scope(self.hod).count(), self.issue_count)
+        self.assertEqual(issue_policy.scope(self.role_admin).count(), self.issue_count + 1)
+        self.assertEqual(issue_policy.scope(self.lecturer).count(), 0)
+        self.assertFalse(staff_department_policy.allows(self.role_admin, self.maths))
+        self.assertTrue(department_policy.allows(self.role_admin, self.maths))
+
+
+class IssueFilterTests(APITestCase):
+    def titles(self, query, user=None):
+        response = self.client_for(user or self.admin).get(f'/api/issues/?page_size=100&{query}')
+        self.assertEqual(response.status_code, 200)
+        return {issue['title'] for issue in response.data['results']}
+
+    def test_choices_and_ids(self):
+        solved = self.create_issue(title='Solved', status='Solved', issue_type='Corrections')
+        self.assertEqual(self.titles('status=Solved'), {'Solved'})
+        self.assertEqual(len(self.titles('status=Pending,Solved')), self.issue_count + 1)
+        self.assertEqual(self.titles('issue_type=Corrections'), {'Solved'})
+        self.assertEqual(len(self.titles(f'course={self.courses[1].pk}')), self.issue_count // 2)
+        self.assertEqual(len(self.titles(f'department={self.department.pk}&college={self.college.pk}')), self.issue_count + 1)
+        Issue.objects.filter(pk=solved.pk).update(assigned_to=self.lecturer)
+        self.assertEqual(self.titles(f'assigned_to={self.lecturer.pk}'), {'Solved'})
+        self.assertEqual(len(self.titles('assigned_to=none')), self.issue_count)
+
+    def test_date_bounds(self):
+        old = self.create_issue(title='Old')
+        Issue.objects.filter(pk=old.pk).update(created_at=timezone.now() - timedelta(days=10))
+        day = (timezone.now() - timedelta(days=10)).date().isoformat()
+        self.assertEqual(self.titles(f'created_before={day}'), {'Old'})
+        self.assertEqual(self.titles(f'created_after={day}&created_before={day}'), {'Old'})
+        self.assertNotIn('Old', self.titles(f'created_after={timezone.now().date().isoformat()}'))
+        bound = (timezone.now() - timedelta(days=5)).isoformat()
+        self.assertEqual(self.titles(f'created_before={quote(bound)}'), {'Old'})
+
+    def test_filters_keep_role_scope(self):
+        other = User.objects.create_user('other@example.com', 'pw', role='STUDENT')
+        self.create_issue(student=other, title='Not mine', status='Solved')
+        self.assertEqual(self.titles('status=Solved', self.student), set())
+
+    def test_invalid_values(self):
+        client = self.client_for(self.admin)
+        for query in (
+            'status=Lost', 'issue_type=Grades', 'course=abc', 'created_after=yesterday',
+            'updated_before=2026-02-30', 'ordering=title',
+        ):
+            response = client.get(f'/api/issues/?{query}')
+            self.assertEqual(response.status_code, 400, query)
+            self.assertIn(query.split('=')[0], response.data)
+
+    def test_ordering(self):
+        client = self.client_for(self.admin)
+        ids = [issue['id'] for issue in client.get('/api/issues/?ordering=created_at&page_size=100').data['results']]
+        self.assertEqual(ids, sorted(ids))
+        ids = [issue['id'] for issue in client.get('/api/issues/?page_size=100').data['results']]
+        self.assertEqual(ids, sorted(ids, reverse=True))
+
+
+class IssueHistoryTests(APITestCase):
+    def history(self, issue):
+        return list(
+            issue.history.order_by('id').values_list('from_status', 'to_status', 'from_assignee', 'to_assignee', 'changed_by')
+        )
+
+    def test_transitions_are_recorded(self):
+        issue = self.create_issue()
+        issue = Issue.objects.get(pk=issue.pk)
+        issue.title = 'Renamed'
+        issue.save()
+        issue.assigned_to, issue.status, issue._changed_by = self.lecturer, 'InProgress', self.hod
+        issue.save()
+        issue.status, issue._changed_by = 'Solved', self.lecturer
+        issue.save()
+        self.assertEqual(self.history(issue), [
+            (None, 'Pending', None, None, self.student.pk),
+            ('Pending', 'InProgress', None, self.lecturer.pk, self.hod.pk),
+            ('InProgress', 'Solved', self.lecturer.pk, self.lecturer.pk, self.lecturer.pk),
+        ])
+
+
+class ResolutionTimeAnalyticsTests(APITestCase):
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        created = timezone.now() - timedelta(days=1)
+        for hours, course in ((1, 0), (2, 0), (3, 0), (4, 0), (10, 1)):
+            issue = cls.create_issue(course=cls.courses[course], issue_type='Corrections')
+            Issue.objects.filter(pk=issue.pk).update(created_at=created)
+            history = IssueStatusHistory.objects.create(
+                issue=issue, from_status='Pending', to_status='Solved', to_assignee=cls.lecturer,
+            )
+            IssueStatusHistory.objects.filter(pk=history.pk).update(changed_at=created + timedelta(hours=hours))
+
+    def get(self, user, query=''):
+        return self.client_for(user).get(f'/api/analytics/resolution-times/{query}')
+
+    def test_percentiles(self):
+        response = self.get(self.admin, '?group_by=course&percentiles=50,90')
+        self.assertEqual(response.status_code, 200)
+        intro, algorithms = response.data['by_course']
+        self.assertEqual(intro['name'], 'CS101')
+        self.assertEqual(intro['time_to_solve'], {'count': 4, 'p50': 7200.0, 'p90': 14400.0, 'max': 14400.0})
+        self.assertEqual(algorithms['time_to_solve'], {'count': 1, 'p50': 36000.0, 'p90': 36000.0, 'max': 36000.0})
+        self.assertEqual(intro['time_to_assign'], intro['time_to_solve'])
+
+    def test_filters_and_groups(self):
+        response = self.get(self.admin, f'?course={self.courses[1].pk}')
+        self.assertEqual(set(response.data), {'percentiles', 'by_department', 'by_course', 'by_issue_type'})
+        [department] = response.data['by_department']
+        self.assertEqual(department['time_to_solve']['count'], 1)
+        # Issues that were never assigned or solved do not count
+        [corrections] = self.get(self.admin, '?group_by=issue_type').data['by_issue_type']
+        self.assertEqual((corrections['name'], corrections['time_to_solve']['count']), ('Corrections', 5))
+
+    def test_access_and_validation(self):
+        self.assertEqual(self.get(self.hod).status_code, 200)
+        self.assertEqual(self.get(self.lecturer).status_code, 403)
+        self.assertEqual(self.get(self.admin, '?group_by=student').status_code, 400)
+        self.assertEqual(self.get(self.admin, '?percentiles=0,50').status_code, 400)
+
+
+class RetentionTests(APITestCase):
+    def notify(self, notification_type, days, read=False, issue=None, user=None):
+        notification = Notification.objects.create(
+            user=user or self.student, issue=issue, notification_type=notification_type, read=read, message='Text',
+        )
+        Notification.objects.filter(pk=notification.pk).update(created_at=timezone.now() - timedelta(days=days))
+        return notification.pk
+
+    def assertUnreadConsistent(self):
+        for user in (self.student, self.lecturer):
+            self.assertEqual(unread_count(user.pk), Notification.objects.filter(user=user, read=False).count())
+
+    def test_expiry_per_type_and_state(self):
+        kept = [
+            self.notify('ISSUE_CREATED', 20),
+            self.notify('STATUS_UPDATE', 20, read=True),
+            self.notify('STATUS_UPDATE', 100),
+        ]
+        self.notify('ISSUE_CREATED', 20, read=True)
+        self.notify('ISSUE_CREATED', 100)
+        self.notify('STATUS_UPDATE', 40, read=True)
+        self.notify('NEW_ISSUE', 200, user=self.lecturer)
+
+        removed = enforce_retention(archive=False, batch_size=2)
+        self.assertEqual(removed, {
+            'collapsed': 0, 'default:read': 1, 'default:unread': 1, 'ISSUE_CREATED:read': 1, 'ISSUE_CREATED:unread': 1,
+        })
+        self.assertEqual(sorted(Notification.objects.values_list('id', flat=True)), kept)
+        self.assertUnreadConsistent()
+
+    def test_archive(self):
+        issue = self.create_issue(title='Missing marks')
+        pk = Notification.objects.create(
+            user=self.student, issue=issue, notification_type='ISSUE_ASSIGNED',
+            template='own_issue_assigned', params={'assignee': 'Grace'}, read=True,
+        ).pk
+        Notification.objects.filter(pk=pk).update(created_at=timezone.now() - timedelta(days=60))
+        self.assertEqual(enforce_retention(archive=True)['default:read'], 1)
+        archived = NotificationArchive.objects.get(notification_id=pk)
+        self.assertEqual(archived.message, "Your issue 'Missing marks' has been assigned to Grace")
+        self.assertEqual((archived.user_id, archived.issue_id, archived.read), (self.student.pk, issue.pk, True))
+        self.assertFalse(Notification.objects.filter(pk=pk).exists())
+
+    def test_collapse_keeps_the_latest(self):
+        first, second = self.create_issue(), self.create_issue()
+        updates = [self.notify('STATUS_UPDATE', 1, issue=first) for _ in range(3)]
+        other_issue = self.notify('STATUS_UPDATE', 1, issue=second)
+        other_user = self.notify('STATUS_UPDATE', 1, issue=first, user=self.lecturer)
+        assigned = [self.notify('ISSUE_ASSIGNED', 1, issue=first) for _ in range(2)]
+
+        self.assertEqual(enforce_retention(batch_size=1)['collapsed'], 2)
+        self.assertEqual(
+            sorted(Notification.objects.values_list('id', flat=True)),
+            sorted([updates[-1], other_issue, other_user, *assigned]),
+        )
+        self.assertUnreadConsistent()
+
+    def test_dry_run(self):
+        self.notify('ISSUE_CREATED', 20, read=True)
+        out = io.StringIO()
+        call_command('prune_notifications', '--dry-run', stdout=out)
+        self.assertIn('ISSUE_CREATED:read: 1', out.getvalue())
+        self.assertEqual(Notification.objects.count(), 1)
+
+
+class DigestTests(APITestCase):
+    now = timezone.make_aware(datetime(2026, 10, 14, 9, 30))
+
+    def notify(self, user, created_at, read=False, message='Text'):
+        pk = Notification.objects.create(
+            user=user, notification_type='STATUS_UPDATE', read=read, message=message,
+        ).pk
+        Notification.objects.filter(pk=pk).update(created_at=created_at)
+
+    def setUp(self):
+        super().setUp()
+        yesterday = self.now - timedelta(days=1)
+        self.notify(self.student, yesterday, message='First')
+        self.notify(self.student, yesterday + timedelta(hours=1), message='Second')
+        self.notify(self.student, yesterday, read=True)
+        self.notify(self.student, self.now)
+        self.notify(self.lecturer, yesterday)
+        # Weekly for admins
+        self.notify(self.admin, yesterday)
+
+    def test_build_once_per_period(self):
+        self.assertEqual(build_digests('DAILY', self.now), 2)
+        self.assertEqual(build_digests('DAILY', self.now), 0)
+        digest = EmailDigest.objects.get(user=self.student)
+        self.assertEqual((digest.period_start, digest.period_end), last_period('DAILY', self.now))
+        self.assertEqual(digest.notification_count, 2)
+        self.assertEqual(digest.subject, 'Your daily issue tracker digest: 2 unread')
+        self.assertEqual(digest.body, (
+            "You have 2 unread notifications:\n\n"
+            "- 2026-10-13 09:30  First\n"
+            "- 2026-10-13 10:30  Second\n"
+        ))
+        self.assertEqual(build_digests('WEEKLY', self.now), 0)
+        self.assertEqual(build_digests('WEEKLY', self.now + timedelta(days=7)), 1)
+
+    def test_items_are_capped(self):
+        with mock.patch('api.digests.EMAIL_DIGEST_MAX_ITEMS', 1):
+            build_digests('DAILY', self.now)
+        body = EmailDigest.objects.get(user=self.student).body
+        self.assertIn('First', body)
+        self.assertTrue(body.endswith('... and 1 more.\n'))
+
+    def test_send(self):
+        build_digests('DAILY', self.now)
+        self.assertEqual(send_digests(batch_size=1), (2, 0))
+        self.assertEqual(sorted(message.to[0] for message in mail.outbox), [self.lecturer.email, self.student.email])
+        self.assertEqual(set(EmailDigest.objects.values_list('status', 'attempts')), {('SENT', 1)})
+        self.assertEqual(send_digests(), (0, 0))
 
-# Create your tests here.
+    def test_failures_are_retried(self):
+        build_digests('DAILY', self.now)
+        failing = mock.patch('api.digests.EmailMessage.send', side_effect=OSError('Connection refused'))
+        with failing, self.assertLogs('api.digests', 'WARNING'):
+            for attempt in range(1, EMAIL_MAX_ATTEMPTS + 1):
+                self.assertEqual(send_digests(), (0, 2))
+                status = 'FAILED' if attempt == EMAIL_MAX_ATTEMPTS else 'PENDING'
+                self.assertEqual(set(EmailDigest.objects.values_list('status', 'attempts')), {(status, attempt)})
+        self.assertEqual(send_digests(), (0, 0))
+        self.assertEqual(EmailDigest.objects.first().last_error, 'Connection refused')
@@ -5,6 +5,9 @@ from .views import (
     StudentDashboardView, 
     LecturerDashboardView, 
     AdminDashboardView,
+    DashboardCacheStatsView,
+    ResolutionTimeAnalyticsView,
+    notification_stream,
     CollegeListView,
     CollegeDetailView,
     CollegeCreateView,
@@ -14,6 +17,7 @@ from .views import (
     CourseListView,
     CourseDetailView,
     CourseCreateView,
+    CatalogTreeView,
     IssueViewSet,
     IssueCreateView,
     # New HOD-specific views
@@ -36,6 +40,8 @@ urlpatterns = [
     path('dashboard/student/', StudentDashboardView.as_view(), name='student_dashboard'),
     path('dashboard/lecturer/', LecturerDashboardView.as_view(), name='lecturer_dashboard'),
     path('dashboard/admin/', AdminDashboardView.as_view(), name='admin_dashboard'),
+    path('dashboard/cache-stats/', DashboardCacheStatsView.as_view(), name='dashboard_cache_stats'),
+    path('analytics/resolution-times/', ResolutionTimeAnalyticsView.as_view(), name='resolution_time_analytics'),
     path('college/', CollegeListView.as_view(), name='college_list'),  
     path('college/<int:pk>/', CollegeDetailView.as_view(), name='college-detail'),
     path('admin/api/college/add/', CollegeCreateView.as_view(), name='college-add'),
@@ -45,6 +51,7 @@ urlpatterns = [
     path('course/', CourseListView.as_view(), name='course-list'),
     path('course/<int:pk>/', CourseDetailView.as_view(), name='course-detail'),
     path('admin/api/course/add/', CourseCreateView.as_view(), name='course-add'),
+    path('catalog/tree/', CatalogTreeView.as_view(), name='catalog-tree'),
     path('admin/api/issue/add/', IssueCreateView.as_view(), name='issue-add'),
     
     # New HOD-specific URL patterns
@@ -55,6 +62,8 @@ urlpatterns = [
     path('department/<int:dept_id>/issues/<int:issue_id>/assign/', hod_assign_issue, name='hod-assign-issue'),
     path('users/<int:user_id>/department/', get_user_department, name='user-department'),
     path('users/<int:user_id>/issues/', get_staff_issues, name='staff-issues'),
+    # Server-Sent Events; must precede the router's notifications/<pk>/ route
+    path('notifications/stream/', notification_stream, name='notification-stream'),
     
     # Include the router URLs
     path('', include(router.urls)),
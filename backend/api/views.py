@@ -5,22 +5,52 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from .models import College, Department, Course, Issue, Notification
 from .serializers import CollegeSerializer, DepartmentSerializer, CourseSerializer, IssueSerializer, IssueCreateSerializer, NotificationSerializer
+from .serializers import CollegeTreeSerializer, IssueBulkAssignSerializer, IssueBulkStatusSerializer, NotificationMarkReadSerializer
+from .pagination import IssueCursorPagination, NotificationCursorPagination
+from .optimization import EagerLoadingViewMixin, optimize_queryset
+from .filters import IssueFilterBackend, IssueOrderingFilter, NotificationFilterBackend
+from .export import (
+    CSVRenderer, NDJSONRenderer, ISSUE_EXPORT_COLUMNS, NOTIFICATION_EXPORT_COLUMNS, stream_export
+)
+from .search import search_issues
+from .bulk import BulkPermissionDenied, bulk_assign_issues, bulk_update_issue_status
+from .sync import InvalidWatermark, encode_watermark, issue_changes, tombstones_for
+from .statistics import read_statistics
+from .dashboard_cache import ADMIN_SCOPE, cache_stats, cached_dashboard
+from .analytics import DEFAULT_PERCENTILES, DIMENSIONS, resolution_time_percentiles
+from .events import SSE_TICKET_SECONDS, notification_stream, notifications_changed, stream_ticket
+from .notifications import mark_read, unread_count as get_unread_count
+from .catalog import catalog_response, catalog_tree
+from .policies import (
+    PolicyPermission, course_policy, department_policy, is_admin, issue_policy, staff_department_policy,
+)
+from .conditional import (
+    ConditionalGetMixin, collection_validators, object_validators, not_modified, set_validators
+)
 from rest_framework.permissions import IsAdminUser, AllowAny
+from rest_framework.renderers import JSONRenderer
 from rest_framework.decorators import action
 from rest_framework.decorators import api_view, permission_classes
-from django.db.models import Count
-from django.contrib.auth import get_user_model
+from django.db import transaction
+from django.db.models import Count, Q
 from django.utils import timezone
-from django.db.models.signals import post_save
-from django.dispatch import receiver
 
 class CollegeListView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
+        response = catalog_response(
+            request, 'colleges', lambda: CollegeSerializer(College.objects.all(), many=True).data
+        )
+        if response is not None:
+            return response
         colleges = College.objects.all()
+        validators = collection_validators(request, colleges)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
         serializer = CollegeSerializer(colleges, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), validators)
 
     def post(self, request):
         serializer = CollegeSerializer(data=request.data)
@@ -65,8 +95,12 @@ class CollegeDetailView(APIView):
         college = self.get_object(pk)
         if not college:
             return Response({"detail": "College not found"}, status=status.HTTP_404_NOT_FOUND)
+        validators = object_validators(request, college)
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
         serializer = CollegeSerializer(college)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), validators)
     
     def put(self, request, pk):
         college = self.get_object(pk)
@@ -100,9 +134,18 @@ class DepartmentListView(APIView):
     permission_classes = [AllowAny]
 
     def get(self, request):
-        departments = Department.objects.all()
-        serializer = DepartmentSerializer(departments, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = catalog_response(request, 'departments', lambda: DepartmentSerializer(
+            optimize_queryset(Department.objects.all(), DepartmentSerializer), many=True,
+        ).data)
+        if response is not None:
+            return response
+        departments = optimize_queryset(Department.objects.all(), DepartmentSerializer, request)
+        validators = collection_validators(request, departments, related=('college',))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        serializer = DepartmentSerializer(departments, many=True, context={'request': request})
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), validators)
 
     def post(self, request):
         serializer = DepartmentSerializer(data=request.data)
@@ -111,39 +154,28 @@ class DepartmentListView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class IsAdminOrHOD(permissions.BasePermission):
+class IsAdminOrHOD(PolicyPermission):
     """
     Custom permission to allow department access to admins and HODs.
     """
-    def has_permission(self, request, view):
-        # Staff can access anything
-        if request.user.is_staff or request.user.role == 'ADMIN':
-            return True
-        
-        # HODs can access their own department
-        if request.user.role == 'HOD' and hasattr(request.user, 'department'):
-            # For detail views, we need to check the pk against the user's department
-            if 'pk' in view.kwargs:
-                return str(request.user.department.id) == str(view.kwargs['pk'])
-            return True
-        
-        return False
+    policy = department_policy
 
 class DepartmentDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminOrHOD]
     
     def get_object(self, pk):
-        try:
-            return Department.objects.get(pk=pk)
-        except Department.DoesNotExist:
-            return None
+        return department_policy.get(self.request, pk)
     
     def get(self, request, pk):
         department = self.get_object(pk)
         if not department:
             return Response({"detail": "Department not found"}, status=status.HTTP_404_NOT_FOUND)
-        serializer = DepartmentSerializer(department)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        validators = object_validators(request, department, related=('college',))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        serializer = DepartmentSerializer(department, context={'request': request})
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), validators)
     
     def put(self, request, pk):
         # Extra check - only admins can edit
@@ -186,9 +218,18 @@ class CourseListView(APIView):
     permission_classes = [AllowAny]
     
     def get(self, request):
-        courses = Course.objects.all()
-        serializer = CourseSerializer(courses, many=True)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        response = catalog_response(request, 'courses', lambda: CourseSerializer(
+            optimize_queryset(Course.objects.all(), CourseSerializer), many=True,
+        ).data)
+        if response is not None:
+            return response
+        courses = optimize_queryset(Course.objects.all(), CourseSerializer, request)
+        validators = collection_validators(request, courses, related=('department',))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        serializer = CourseSerializer(courses, many=True, context={'request': request})
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), validators)
     
     def post(self, request):
         serializer = CourseSerializer(data=request.data)
@@ -220,43 +261,28 @@ class CourseListView(APIView):
         course.delete()
         return Response(status=status.HTTP_204_NO_CONTENT)
 
-class IsAdminOrHODForCourse(permissions.BasePermission):
+class IsAdminOrHODForCourse(PolicyPermission):
     """
     Custom permission to allow course access to admins and HODs.
     """
-    def has_permission(self, request, view):
-        # Staff can access anything
-        if request.user.is_staff or request.user.role == 'ADMIN':
-            return True
-        
-        # HODs can access courses in their department
-        if request.user.role == 'HOD' and hasattr(request.user, 'department') and request.user.department:
-            # For detail views, we need to check the course's department against the user's department
-            if 'pk' in view.kwargs:
-                try:
-                    course = Course.objects.get(pk=view.kwargs['pk'])
-                    return str(request.user.department.id) == str(course.department.id)
-                except Course.DoesNotExist:
-                    return False
-            return True
-        
-        return False
+    policy = course_policy
 
 class CourseDetailView(APIView):
     permission_classes = [permissions.IsAuthenticated, IsAdminOrHODForCourse]
     
     def get_object(self, pk):
-        try:
-            return Course.objects.get(pk=pk)
-        except Course.DoesNotExist:
-            return None
+        return course_policy.get(self.request, pk)
     
     def get(self, request, pk):
         course = self.get_object(pk)
         if not course:
             return Response({"detail": "Course not found"}, status=status.HTTP_404_NOT_FOUND)
-        serializer = CourseSerializer(course)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+        validators = object_validators(request, course, related=('department',))
+        response = not_modified(request, validators)
+        if response is not None:
+            return response
+        serializer = CourseSerializer(course, context={'request': request})
+        return set_validators(Response(serializer.data, status=status.HTTP_200_OK), validators)
     
     def put(self, request, pk):
         # Extra check - only admins can edit
@@ -295,6 +321,30 @@ class CourseCreateView(APIView):
             return Response(serializer.data, status=201)
         return Response(serializer.errors, status=400)
 
+class CatalogTreeView(APIView):
+    """
+    The college -> department -> course hierarchy with issue counts per node,
+    in three queries.
+    - ?college=<id> or ?department=<id> narrows it to one college or department
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        filters = {}
+        for param in ('college', 'department'):
+            value = request.query_params.get(param)
+            if value is None:
+                continue
+            try:
+                filters[f'{param}_id'] = int(value)
+            except ValueError:
+                return Response(
+                    {"detail": f"{param} must be an integer id."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+        serializer = CollegeTreeSerializer(catalog_tree(**filters), many=True)
+        return Response(serializer.data)
+
 class IsOwnerOrStaff(permissions.BasePermission):
     """
     Custom permission to only allow owners of an object or staff to access it.
@@ -317,12 +367,15 @@ class IssueCreateView(APIView):
             return Response(serializer.data, status=status.HTTP_201_CREATED)
         return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
-class IssueViewSet(viewsets.ModelViewSet):
+class IssueViewSet(ConditionalGetMixin, EagerLoadingViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing issues.
     """
     serializer_class = IssueSerializer
     permission_classes = [permissions.IsAuthenticated, IsOwnerOrStaff]
+    pagination_class = IssueCursorPagination
+    filter_backends = [IssueFilterBackend, IssueOrderingFilter]
+    last_modified_related = ('student', 'assigned_to', 'course', 'course__department')
     
     def get_queryset(self):
         """
@@ -355,23 +408,90 @@ class IssueViewSet(viewsets.ModelViewSet):
     def create(self, request, *args, **kwargs):
         serializer = self.get_serializer(data=request.data, context={'request': request})
         serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
+        # Admins and department HODs are notified by api.signals
+        with transaction.atomic():
+            self.perform_create(serializer)
         
         # Return the complete issue object using the standard serializer
         issue = serializer.instance
         response_serializer = IssueSerializer(issue)
         
-        # Create notification for admin users
-        admin_users = User.objects.filter(is_staff=True) | User.objects.filter(role='ADMIN')
-        for admin in admin_users:
-            Notification.objects.create(
-                user=admin,
-                issue=issue,
-                message=f"New issue created: {issue.title}",
-                notification_type='ISSUE_CREATED'
+        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+    
+    def perform_update(self, serializer):
+        # Attribute status/assignment changes in the issue history
+        serializer.instance._changed_by = self.request.user
+        with transaction.atomic():
+            serializer.save()
+    
+    @action(detail=False, methods=['get'])
+    def search(self, request):
+        """
+        Full-text search over issue titles and descriptions via ``?q=``.
+        Results are ranked by relevance, limited to the issues the user can
+        see, and accept the same filter parameters as the list endpoint.
+        """
+        query = request.query_params.get('q', '').strip()
+        if not query:
+            return Response(
+                {"detail": "A search query is required (?q=)."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        queryset = IssueFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        queryset = optimize_queryset(search_issues(queryset, query), IssueSerializer, request)
+        
+        # Page through results by relevance rather than by date
+        self.keyset_ordering = ('-search_rank', '-id')
+        page = self.paginate_queryset(queryset)
+        serializer = self.get_serializer(page, many=True)
+        return self.get_paginated_response(serializer.data)
+    
+    @action(detail=False, methods=['get'], renderer_classes=[JSONRenderer, CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """
+        Stream the issues visible to the user as CSV (default) or NDJSON
+        (``?format=ndjson``). Accepts the same filters and ordering as the
+        list endpoint.
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        export_format = getattr(request.accepted_renderer, 'format', None)
+        return stream_export(
+            queryset, ISSUE_EXPORT_COLUMNS, 'ndjson' if export_format == 'ndjson' else 'csv', 'issues'
+        )
+    
+    @action(detail=False, methods=['get'])
+    def changes(self, request):
+        """
+        Delta sync: issues created, updated or removed from the user's view
+        since the ``?since=`` watermark, plus a new watermark to send next
+        time. Without ``since`` only a starting watermark is returned; take it
+        before loading the full list.
+        """
+        token = request.query_params.get('since')
+        if not token:
+            return Response({
+                "issues": [],
+                "deleted": [],
+                "watermark": encode_watermark(timezone.now()),
+                "has_more": False,
+            })
+        
+        issues = optimize_queryset(self.get_queryset(), IssueSerializer, request)
+        try:
+            changed, deleted, watermark, has_more = issue_changes(
+                issues, tombstones_for(request.user), token
             )
+        except InvalidWatermark as e:
+            return Response({"detail": str(e)}, status=status.HTTP_400_BAD_REQUEST)
         
-        return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+        serializer = self.get_serializer(changed, many=True)
+        return Response({
+            "issues": serializer.data,
+            "deleted": deleted,
+            "watermark": watermark,
+            "has_more": has_more,
+        })
     
     @action(detail=True, methods=['patch'])
     def update_status(self, request, pk=None):
@@ -382,7 +502,6 @@ class IssueViewSet(viewsets.ModelViewSet):
         - Lecturers and HODs can update issues assigned to them
         """
         issue = self.get_object()
-        old_status = issue.status
         new_status = request.data.get('status')
         
         # Check permissions - allow lecturers/HODs to update status of issues assigned to them
@@ -404,27 +523,11 @@ class IssueViewSet(viewsets.ModelViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
         
+        # The student and assignee are notified of a change by api.signals
         issue.status = new_status
-        issue.save()
-        
-        # Create notification for student when status changes
-        if old_status != new_status:
-            # Create notification for student
-            Notification.objects.create(
-                user=issue.student,
-                issue=issue,
-                message=f"Your issue '{issue.title}' status changed to {new_status}",
-                notification_type='STATUS_CHANGED'
-            )
-            
-            # Create notification for assigned staff if exists
-            if issue.assigned_to and issue.assigned_to != user:
-                Notification.objects.create(
-                    user=issue.assigned_to,
-                    issue=issue,
-                    message=f"Issue '{issue.title}' status changed to {new_status}",
-                    notification_type='STATUS_CHANGED'
-                )
+        issue._changed_by = user
+        with transaction.atomic():
+            issue.save()
         
         serializer = self.get_serializer(issue)
         return Response(serializer.data)
@@ -466,23 +569,10 @@ class IssueViewSet(viewsets.ModelViewSet):
             # Assign the issue
             issue.assigned_to = assigned_user
             issue.status = 'InProgress'  # Update status to in progress
-            issue.save()
-            
-            # Create notification for the assigned staff
-            Notification.objects.create(
-                user=assigned_user,
-                issue=issue,
-                message=f"Issue '{issue.title}' has been assigned to you",
-                notification_type='ISSUE_ASSIGNED'
-            )
-            
-            # Notify student that their issue has been assigned
-            Notification.objects.create(
-                user=issue.student,
-                issue=issue,
-                message=f"Your issue '{issue.title}' has been assigned to {assigned_user.first_name} {assigned_user.last_name}",
-                notification_type='ISSUE_ASSIGNED'
-            )
+            issue._changed_by = request.user
+            # The assignee and the student are notified by api.signals
+            with transaction.atomic():
+                issue.save()
             
             serializer = self.get_serializer(issue)
             return Response(serializer.data)
@@ -497,72 +587,127 @@ class IssueViewSet(viewsets.ModelViewSet):
                 {"detail": str(e)},
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
-
-@api_view(['GET'])
-@permission_classes([permissions.IsAuthenticated])
-def get_staff_issues(request, user_id):
-    try:
-        # Check if the requesting user is the same as the user_id, an admin, or an HOD
-        is_admin = request.user.is_staff
-        is_self = str(request.user.id) == str(user_id)
-        is_hod_of_same_dept = (
-            hasattr(request.user, 'role') and 
-            request.user.role == 'HOD' and 
-            hasattr(request.user, 'department') and 
-            request.user.department
-        )
+    
+    @action(detail=False, methods=['post'])
+    def bulk_assign(self, request):
+        """
+        Assign many issues to one lecturer or HOD in a single transaction.
+        - Admins can assign any issue
+        - HODs can assign issues in their department to staff in their department
+        """
+        serializer = IssueBulkAssignSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        issue_ids = serializer.validated_data['issue_ids']
         
-        if not (is_admin or is_self or is_hod_of_same_dept):
+        user = request.user
+        if user.is_staff:
+            assignable = Issue.objects.all()
+        elif user.role == 'HOD' and user.department_id:
+            assignable = Issue.objects.filter(course__department_id=user.department_id)
+        else:
             return Response(
-                {"detail": "You do not have permission to access this user's issues."},
+                {"detail": "You do not have permission to perform this action."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
-        # Get the staff user
         from users.models import User
-        staff_user = User.objects.get(pk=user_id)
+        try:
+            assigned_user = User.objects.get(id=serializer.validated_data['user_id'])
+        except User.DoesNotExist:
+            return Response({"detail": "User not found"}, status=status.HTTP_404_NOT_FOUND)
         
-        # Get issues assigned to this staff member
-        staff_issues = Issue.objects.filter(assigned_to=staff_user)
+        if assigned_user.role not in ['LECTURER', 'HOD']:
+            return Response(
+                {"detail": "Issues can only be assigned to lecturers or heads of department"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        if not user.is_staff and assigned_user.department_id and assigned_user.department_id != user.department_id:
+            return Response(
+                {"detail": "You can only assign issues to staff within your department."},
+                status=status.HTTP_400_BAD_REQUEST
+            )
         
-        # If an HOD is requesting, ensure they can only see issues from their department
-        if is_hod_of_same_dept and not is_admin:
-            # Get courses in HOD's department
-            dept_courses = Course.objects.filter(department=request.user.department)
-            # Filter issues to only include those for courses in the HOD's department
-            staff_issues = staff_issues.filter(course__in=dept_courses)
+        try:
+            updated = bulk_assign_issues(assignable, issue_ids, assigned_user, actor=user)
+        except BulkPermissionDenied as e:
+            return Response(
+                {"detail": str(e), "issue_ids": e.issue_ids},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response({"updated": updated, "issue_ids": issue_ids})
+    
+    @action(detail=False, methods=['post'])
+    def bulk_update_status(self, request):
+        """
+        Change the status of many issues in a single transaction.
+        - Admins and staff can update any issue
+        - Lecturers and HODs can update issues assigned to them
+        """
+        serializer = IssueBulkStatusSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
         
-        serializer = IssueSerializer(staff_issues, many=True)
-        return Response(serializer.data)
-    except User.DoesNotExist:
-        return Response(
-            {"detail": "User not found."},
-            status=status.HTTP_404_NOT_FOUND
-        )
-    except Exception as e:
-        return Response(
-            {"detail": str(e)},
-            status=status.HTTP_500_INTERNAL_SERVER_ERROR
-        )
+        user = request.user
+        if user.is_staff or user.role == 'ADMIN':
+            updatable = Issue.objects.all()
+        elif user.role in ['LECTURER', 'HOD']:
+            updatable = Issue.objects.filter(assigned_to=user)
+        else:
+            return Response(
+                {"detail": "You do not have permission to perform this action."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        issue_ids = serializer.validated_data['issue_ids']
+        try:
+            updated = bulk_update_issue_status(
+                updatable, issue_ids, serializer.validated_data['status'], user
+            )
+        except BulkPermissionDenied as e:
+            return Response(
+                {"detail": str(e), "issue_ids": e.issue_ids},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        return Response({"updated": updated, "issue_ids": issue_ids})
+
+def issue_statistics(issues):
+    """
+    Total and per-status issue counts in a single conditional-aggregate query.
+    """
+    return issues.order_by().aggregate(
+        total=Count('id'),
+        pending=Count('id', filter=Q(status='Pending')),
+        in_progress=Count('id', filter=Q(status='InProgress')),
+        solved=Count('id', filter=Q(status='Solved')),
+    )
+
+def paginate_dashboard_issues(request, issues, view):
+    """
+    Return one keyset page of ``issues`` and its pagination links.
+    """
+    paginator = IssueCursorPagination()
+    page = paginator.paginate_queryset(issues, request, view=view)
+    return page, {
+        "next": paginator.get_next_link(),
+        "previous": paginator.get_previous_link(),
+    }
 
 class StudentDashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
+    @cached_dashboard()
     def get(self, request):
         if not request.user.is_student():
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
         
         # Get student's issues
         issues = Issue.objects.filter(student=request.user)
+        page, pagination = paginate_dashboard_issues(request, issues.select_related('course'), self)
         
         # Get courses student has issues in
-        course_ids = issues.values_list('course', flat=True).distinct()
-        courses = Course.objects.filter(id__in=course_ids)
+        courses = Course.objects.filter(issues__student=request.user).select_related('department').distinct()
         
         # Calculate issue stats
-        pending_issues = issues.filter(status='Pending').count()
-        in_progress_issues = issues.filter(status='InProgress').count()
-        solved_issues = issues.filter(status='Solved').count()
+        statistics = issue_statistics(issues)
         
         # Format data
         data = {
@@ -596,35 +741,32 @@ class StudentDashboardView(APIView):
                         "course_name": issue.course.course_name,
                         "course_code": issue.course.course_code
                     }
-                } for issue in issues
+                } for issue in page
             ],
-            "issue_statistics": {
-                "total": issues.count(),
-                "pending": pending_issues,
-                "in_progress": in_progress_issues,
-                "solved": solved_issues
-            }
+            "issues_pagination": pagination,
+            "issue_statistics": statistics
         }
         return Response(data)
 
 class LecturerDashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
+    @cached_dashboard()
     def get(self, request):
         if not request.user.is_lecturer() and not request.user.is_hod():
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
         
         # Get issues assigned to the lecturer
         assigned_issues = Issue.objects.filter(assigned_to=request.user)
+        page, pagination = paginate_dashboard_issues(
+            request, assigned_issues.select_related('course', 'student'), self
+        )
         
         # Get courses for which issues are assigned
-        course_ids = assigned_issues.values_list('course', flat=True).distinct()
-        courses = Course.objects.filter(id__in=course_ids)
+        courses = Course.objects.filter(issues__assigned_to=request.user).select_related('department').distinct()
         
         # Calculate issue stats
-        pending_issues = assigned_issues.filter(status='Pending').count()
-        in_progress_issues = assigned_issues.filter(status='InProgress').count()
-        solved_issues = assigned_issues.filter(status='Solved').count()
+        statistics = issue_statistics(assigned_issues)
         
         # Format data
         data = {
@@ -653,8 +795,9 @@ class LecturerDashboardView(APIView):
                         "first_name": issue.student.first_name,
                         "last_name": issue.student.last_name
                     }
-                } for issue in assigned_issues
+                } for issue in page
             ],
+            "assigned_issues_pagination": pagination,
             "courses": [
                 {
                     "id": course.id,
@@ -666,46 +809,29 @@ class LecturerDashboardView(APIView):
                     } if course.department else None
                 } for course in courses
             ],
-            "issue_statistics": {
-                "total": assigned_issues.count(),
-                "pending": pending_issues,
-                "in_progress": in_progress_issues,
-                "solved": solved_issues
-            }
+            "issue_statistics": statistics
         }
         return Response(data)
 
 class AdminDashboardView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
+    # Department changes it shows bump ADMIN_SCOPE (api.signals)
+    @cached_dashboard(ADMIN_SCOPE, catalog=False)
     def get(self, request):
         if not request.user.is_admin() and not request.user.is_staff:
             return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
         
-        # Get all users
-        User = get_user_model()
-        users = User.objects.all()
-        student_count = users.filter(role='STUDENT').count()
-        lecturer_count = users.filter(role='LECTURER').count()
-        hod_count = users.filter(role='HOD').count()
-        admin_count = users.filter(role='ADMIN').count()
-        
+        # Counters are maintained on write (see api.statistics)
+        statistics = read_statistics()
+
         # Get all departments
         departments = Department.objects.all()
-        
-        # Get all issues
-        issues = Issue.objects.all()
-        pending_issues = issues.filter(status='Pending').count()
-        in_progress_issues = issues.filter(status='InProgress').count()
-        solved_issues = issues.filter(status='Solved').count()
-        
-        # Get all courses
-        courses = Course.objects.all()
-        
+
         # Recent issues (last 10)
-        recent_issues = Issue.objects.order_by('-created_at')[:10]
-        
-        # Format data
+        recent_issues = Issue.objects.select_related('student').order_by('-created_at')[:10]
+
+        # Format data; the user list is served (paginated) by /users/
         data = {
             "user": {
                 "id": request.user.id,
@@ -714,15 +840,6 @@ class AdminDashboardView(APIView):
                 "last_name": request.user.last_name,
                 "role": request.user.role
             },
-            "users": [
-                {
-                    "id": user.id,
-                    "email": user.email,
-                    "first_name": user.first_name,
-                    "last_name": user.last_name,
-                    "role": user.role
-                } for user in users
-            ],
             "departments": [
                 {
                     "id": dept.id,
@@ -730,23 +847,7 @@ class AdminDashboardView(APIView):
                     "department_code": dept.department_code
                 } for dept in departments
             ],
-            "statistics": {
-                "users": {
-                    "total": users.count(),
-                    "students": student_count,
-                    "lecturers": lecturer_count,
-                    "hods": hod_count,
-                    "admins": admin_count
-                },
-                "issues": {
-                    "total": issues.count(),
-                    "pending": pending_issues,
-                    "in_progress": in_progress_issues,
-                    "solved": solved_issues
-                },
-                "departments": departments.count(),
-                "courses": courses.count()
-            },
+            "statistics": statistics,
             "recent_issues": [
                 {
                     "id": issue.id,
@@ -762,94 +863,141 @@ class AdminDashboardView(APIView):
         }
         return Response(data)
 
+class DashboardCacheStatsView(APIView):
+    """
+    Hit/miss counters of the dashboard cache (admins only).
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        if not request.user.is_admin() and not request.user.is_staff:
+            return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+        return Response(cache_stats())
+
+class ResolutionTimeAnalyticsView(APIView):
+    """
+    Time-to-assign and time-to-solve percentiles (seconds) grouped by
+    department, course and issue type.
+    - Admins see every issue; HODs see their department's issues
+    - ?group_by=department,course,issue_type selects the groupings
+    - ?percentiles=50,90,95 selects the percentiles
+    - Issue filters (course, department, issue_type, created_after, ...) apply
+    """
+    permission_classes = [permissions.IsAuthenticated]
+
+    def get(self, request):
+        user = request.user
+        if not (is_admin(user) or (user.is_hod() and user.department_id)):
+            return Response({"error": "Not authorized"}, status=status.HTTP_403_FORBIDDEN)
+        issues = IssueFilterBackend().filter_queryset(request, issue_policy.scope(user), self)
+
+        group_by = request.query_params.get('group_by')
+        dimensions = [part.strip() for part in group_by.split(',')] if group_by else list(DIMENSIONS)
+        invalid = [dimension for dimension in dimensions if dimension not in DIMENSIONS]
+        if invalid:
+            return Response(
+                {"detail": f"group_by must be among: {', '.join(DIMENSIONS)}"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        percentiles = DEFAULT_PERCENTILES
+        if request.query_params.get('percentiles'):
+            try:
+                percentiles = sorted({int(part) for part in request.query_params['percentiles'].split(',')})
+            except ValueError:
+                percentiles = None
+            if not percentiles or not all(0 < p <= 100 for p in percentiles):
+                return Response(
+                    {"detail": "percentiles must be integers between 1 and 100."},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+
+        return Response({
+            "percentiles": list(percentiles),
+            **{
+                f"by_{dimension}": resolution_time_percentiles(issues, dimension, percentiles)
+                for dimension in dimensions
+            },
+        })
+
 # New Views for HOD access - Add these at the end of the file
 class DepartmentIssuesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, pk):
-        try:
-            # Get the department
-            department = Department.objects.get(pk=pk)
-            
-            # Check if user is admin or HOD of this department
-            user = request.user
-            if not user.is_staff and not (hasattr(user, 'role') and user.role == 'HOD' and user.department and str(user.department.id) == str(pk)):
-                return Response(
-                    {"detail": "You do not have permission to access this department's issues."},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-            
-            # Get issues for this department
-            department_courses = Course.objects.filter(department=department)
-            department_issues = Issue.objects.filter(course__in=department_courses)
-            
-            serializer = IssueSerializer(department_issues, many=True)
-            return Response(serializer.data)
-        except Department.DoesNotExist:
+        department = staff_department_policy.get(request, pk)
+        if department is None:
             return Response(
                 {"detail": "Department not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        if not staff_department_policy.allows(request.user, department):
+            return Response(
+                {"detail": "You do not have permission to access this department's issues."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Get issues for this department
+        department_issues = optimize_queryset(
+            Issue.objects.filter(course__department=department), IssueSerializer, request
+        )
+        
+        paginator = IssueCursorPagination()
+        page = paginator.paginate_queryset(department_issues, request, view=self)
+        serializer = IssueSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
 
 class DepartmentStaffView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, pk):
-        try:
-            # Get the department
-            department = Department.objects.get(pk=pk)
-            
-            # Check if user is admin or HOD of this department
-            user = request.user
-            if not user.is_staff and not (hasattr(user, 'role') and user.role == 'HOD' and user.department and str(user.department.id) == str(pk)):
-                return Response(
-                    {"detail": "You do not have permission to access this department's staff."},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-            
-            # Get staff (lecturers and HOD) for this department
-            from users.models import User
-            from users.serializers import UserSerializer
-            
-            department_staff = User.objects.filter(
-                department=department, 
-                role__in=['HOD', 'LECTURER']
-            )
-            
-            serializer = UserSerializer(department_staff, many=True)
-            return Response(serializer.data)
-        except Department.DoesNotExist:
+        department = staff_department_policy.get(request, pk)
+        if department is None:
             return Response(
                 {"detail": "Department not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        if not staff_department_policy.allows(request.user, department):
+            return Response(
+                {"detail": "You do not have permission to access this department's staff."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Get staff (lecturers and HOD) for this department
+        from users.models import User
+        from users.serializers import UserSerializer
+        
+        department_staff = User.objects.filter(
+            department=department, 
+            role__in=['HOD', 'LECTURER']
+        )
+        
+        serializer = UserSerializer(department_staff, many=True)
+        return Response(serializer.data)
 
 class DepartmentCoursesView(APIView):
     permission_classes = [permissions.IsAuthenticated]
     
     def get(self, request, pk):
-        try:
-            # Get the department
-            department = Department.objects.get(pk=pk)
-            
-            # Check if user is admin or HOD of this department
-            user = request.user
-            if not user.is_staff and not (hasattr(user, 'role') and user.role == 'HOD' and user.department and str(user.department.id) == str(pk)):
-                return Response(
-                    {"detail": "You do not have permission to access this department's courses."},
-                    status=status.HTTP_403_FORBIDDEN
-                )
-            
-            # Get courses for this department
-            department_courses = Course.objects.filter(department=department)
-            
-            serializer = CourseSerializer(department_courses, many=True)
-            return Response(serializer.data)
-        except Department.DoesNotExist:
+        department = staff_department_policy.get(request, pk)
+        if department is None:
             return Response(
                 {"detail": "Department not found."},
                 status=status.HTTP_404_NOT_FOUND
             )
+        if not staff_department_policy.allows(request.user, department):
+            return Response(
+                {"detail": "You do not have permission to access this department's courses."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        
+        # Get courses for this department
+        department_courses = optimize_queryset(
+            Course.objects.filter(department=department), CourseSerializer, request
+        )
+        
+        serializer = CourseSerializer(department_courses, many=True, context={'request': request})
+        return Response(serializer.data)
 
 @api_view(['GET'])
 @permission_classes([permissions.IsAuthenticated])
@@ -895,8 +1043,7 @@ def get_staff_issues(request, user_id):
         is_hod_of_same_dept = (
             hasattr(request.user, 'role') and 
             request.user.role == 'HOD' and 
-            hasattr(request.user, 'department') and 
-            request.user.department
+            request.user.department_id
         )
         
         if not (is_admin or is_self or is_hod_of_same_dept):
@@ -914,13 +1061,13 @@ def get_staff_issues(request, user_id):
         
         # If an HOD is requesting, ensure they can only see issues from their department
         if is_hod_of_same_dept and not is_admin:
-            # Get courses in HOD's department
-            dept_courses = Course.objects.filter(department=request.user.department)
-            # Filter issues to only include those for courses in the HOD's department
-            staff_issues = staff_issues.filter(course__in=dept_courses)
+            # Only issues for courses in the HOD's department
+            staff_issues = issue_policy.scope(request.user, staff_issues)
         
-        serializer = IssueSerializer(staff_issues, many=True)
-        return Response(serializer.data)
+        paginator = IssueCursorPagination()
+        page = paginator.paginate_queryset(optimize_queryset(staff_issues, IssueSerializer, request), request)
+        serializer = IssueSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
     except User.DoesNotExist:
         return Response(
             {"detail": "User not found."},
@@ -941,23 +1088,25 @@ def hod_assign_issue(request, dept_id, issue_id):
     Only HODs can use this endpoint for their own department issues.
     """
     try:
-        # Get the issue and department
-        issue = Issue.objects.get(pk=issue_id)
-        department = Department.objects.get(pk=dept_id)
+        # Get the issue (with its course) and department
+        issue = issue_policy.get(request, issue_id)
+        if issue is None:
+            raise Issue.DoesNotExist
+        department = department_policy.get(request, dept_id)
+        if department is None:
+            raise Department.DoesNotExist
         
         # Check if user is HOD of this department
         user = request.user
         if not (hasattr(user, 'role') and user.role == 'HOD' and 
-                hasattr(user, 'department') and user.department and 
-                str(user.department.id) == str(dept_id)):
+                str(user.department_id) == str(dept_id)):
             return Response(
                 {"detail": "You must be the HOD of this department to assign issues."},
                 status=status.HTTP_403_FORBIDDEN
             )
         
         # Check if issue belongs to a course in the HOD's department
-        course = issue.course
-        if not course or course.department.id != department.id:
+        if issue_policy.department_id(issue) != department.id:
             return Response(
                 {"detail": "This issue does not belong to your department."},
                 status=status.HTTP_403_FORBIDDEN
@@ -984,7 +1133,7 @@ def hod_assign_issue(request, dept_id, issue_id):
                 )
             
             # Check if user belongs to the same department
-            if hasattr(assigned_user, 'department') and assigned_user.department and assigned_user.department.id != department.id:
+            if assigned_user.department_id and assigned_user.department_id != department.id:
                 return Response(
                     {"detail": "You can only assign issues to staff within your department."},
                     status=status.HTTP_400_BAD_REQUEST
@@ -993,7 +1142,9 @@ def hod_assign_issue(request, dept_id, issue_id):
             # Assign the issue
             issue.assigned_to = assigned_user
             issue.status = 'InProgress'  # Update status to in progress
-            issue.save()
+            issue._changed_by = user
+            with transaction.atomic():
+                issue.save()
             
             serializer = IssueSerializer(issue)
             return Response(serializer.data)
@@ -1026,25 +1177,27 @@ class HODDepartmentDetailView(APIView):
     
     def get(self, request, pk):
         try:
-            # Get the department
-            department = Department.objects.get(pk=pk)
+            # Get the department, with its college for the serializer
+            department = department_policy.get(request, pk)
+            if department is None:
+                raise Department.DoesNotExist
             
             # Check if user is admin or HOD of this department
             user = request.user
             # For admin and staff, allow access to any department
             if user.is_staff or user.role == 'ADMIN':
-                serializer = DepartmentSerializer(department)
+                serializer = DepartmentSerializer(department, context={'request': request})
                 return Response(serializer.data)
                 
             # For HOD, check if they are HOD of this specific department
             if hasattr(user, 'role') and user.role == 'HOD':
-                if hasattr(user, 'department') and user.department:
-                    if str(user.department.id) == str(pk):
-                        serializer = DepartmentSerializer(department)
+                if user.department_id:
+                    if str(user.department_id) == str(pk):
+                        serializer = DepartmentSerializer(department, context={'request': request})
                         return Response(serializer.data)
                     else:
                         return Response(
-                            {"detail": f"You are HOD of department {user.department.id}, not department {pk}."},
+                            {"detail": f"You are HOD of department {user.department_id}, not department {pk}."},
                             status=status.HTTP_403_FORBIDDEN
                         )
                 else:
@@ -1064,12 +1217,14 @@ class HODDepartmentDetailView(APIView):
             )
 
 # Add an API endpoint for Notifications
-class NotificationViewSet(viewsets.ModelViewSet):
+class NotificationViewSet(ConditionalGetMixin, EagerLoadingViewMixin, viewsets.ModelViewSet):
     """
     API endpoint for managing notifications.
     """
     serializer_class = NotificationSerializer
     permission_classes = [permissions.IsAuthenticated]
+    # Messages are rendered with the issue title and course name
+    last_modified_related = ('issue', 'issue__course')
     
     def get_queryset(self):
         """
@@ -1085,79 +1240,69 @@ class NotificationViewSet(viewsets.ModelViewSet):
         notification = self.get_object()
         notification.read = True
         notification.save()
+        notifications_changed()
         return Response({"status": "success"})
     
+    @action(detail=False, methods=['get'], renderer_classes=[JSONRenderer, CSVRenderer, NDJSONRenderer])
+    def export(self, request):
+        """
+        Stream all notifications as CSV (default) or NDJSON
+        (``?format=ndjson``). Admin only.
+        """
+        if not (request.user.is_staff or request.user.role == 'ADMIN'):
+            return Response(
+                {"detail": "Only admin users can export notifications."},
+                status=status.HTTP_403_FORBIDDEN
+            )
+        queryset = NotificationFilterBackend().filter_queryset(request, Notification.objects.all(), self)
+        export_format = getattr(request.accepted_renderer, 'format', None)
+        return stream_export(
+            queryset, NOTIFICATION_EXPORT_COLUMNS, 'ndjson' if export_format == 'ndjson' else 'csv', 'notifications'
+        )
+    
     @action(detail=False, methods=['post'])
     def mark_all_as_read(self, request):
         """
         Mark all notifications for the current user as read.
         """
-        Notification.objects.filter(user=request.user, read=False).update(read=True)
+        mark_read(request.user)
         return Response({"status": "success"})
-
-# Signal handler for issue assignment in the HOD view
-@receiver(post_save, sender=Issue)
-def handle_issue_assignment(sender, instance, created, **kwargs):
-    """
-    Signal handler for issue assignments through HOD view.
-    Creates notifications when issues are assigned or status changes.
-    """
-    User = get_user_model()
     
-    # When a new issue is created
-    if created:
-        # Notify admin users about new issue
-        admin_users = User.objects.filter(role='ADMIN')
-        for admin in admin_users:
-            Notification.objects.create(
-                user=admin,
-                issue=instance,
-                message=f"New issue '{instance.title}' has been created by {instance.student.username if instance.student else 'a user'}",
-                notification_type='NEW_ISSUE'
-            )
-        
-        # Notify department HODs if applicable
-        if instance.course and instance.course.department:
-            hod_users = User.objects.filter(
-                role='HOD', 
-                department=instance.course.department
-            )
-            for hod in hod_users:
-                Notification.objects.create(
-                    user=hod,
-                    issue=instance,
-                    message=f"New issue '{instance.title}' has been created for {instance.course.course_name}",
-                    notification_type='NEW_ISSUE'
-                )
+    @action(detail=False, methods=['post'], url_path='mark_as_read')
+    def mark_many_as_read(self, request):
+        """
+        Mark the notifications listed in ``ids`` as read with one UPDATE.
+        Ids that are not the user's or already read are ignored.
+        """
+        serializer = NotificationMarkReadSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        updated = mark_read(request.user, serializer.validated_data['ids'])
+        return Response({"updated": updated, "unread": get_unread_count(request.user.pk)})
     
-    # When an issue is assigned
-    elif instance.assigned_to:
-        # Check if this is a new assignment (we'd need to store previous state to accurately detect this)
-        # For simplicity, we'll always check if there's an assigned_to user set
-        
-        # Create notification for the assigned staff if not already notified
-        recent_notifications = Notification.objects.filter(
-            user=instance.assigned_to,
-            issue=instance,
-            notification_type='ISSUE_ASSIGNED',
-            created_at__gt=timezone.now() - timezone.timedelta(minutes=5)
-        )
-        
-        if not recent_notifications.exists():
-            Notification.objects.create(
-                user=instance.assigned_to,
-                issue=instance,
-                message=f"Issue '{instance.title}' has been assigned to you",
-                notification_type='ISSUE_ASSIGNED'
-            )
+    @action(detail=False, methods=['get'])
+    def unread_count(self, request):
+        """
+        Number of unread notifications, read from the user's counter.
+        """
+        return Response({"unread": get_unread_count(request.user.pk)})
     
-    # When issue status changes
-    if not created and instance.status:
-        # Notify the student who created the issue
-        if instance.student:
-            Notification.objects.create(
-                user=instance.student,
-                issue=instance,
-                message=f"Your issue '{instance.title}' status has been updated to {instance.status}",
-                notification_type='STATUS_UPDATE'
-            )
+    @action(detail=False, methods=['post'], url_path='stream/ticket')
+    def stream_ticket(self, request):
+        """
+        Short-lived ticket for ``notifications/stream/?ticket=``, which
+        EventSource can send where it cannot send the access token.
+        """
+        return Response({"ticket": stream_ticket(request.user), "expires_in": SSE_TICKET_SECONDS})
+    
+    @action(detail=False, methods=['get'])
+    def inbox(self, request):
+        """
+        Keyset-paginated notifications, newest first.
+        Filters: ?read=true|false, ?notification_type=A,B, ?created_after=, ?created_before=
+        """
+        queryset = NotificationFilterBackend().filter_queryset(request, self.get_queryset(), self)
+        queryset = optimize_queryset(queryset, NotificationSerializer, request)
+        paginator = NotificationCursorPagination()
+        page = paginator.paginate_queryset(queryset, request, view=self)
+        serializer = NotificationSerializer(page, many=True, context={'request': request})
+        return paginator.get_paginated_response(serializer.data)
@@ -70,6 +70,8 @@ DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        # Seconds a writer waits for the write lock (e.g. behind run_tasks threads)
+        'OPTIONS': {'timeout': 20},
     }
 }
 
@@ -82,7 +84,8 @@ AUTH_USER_MODEL = 'users.User'
 # REST Framework settings
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': [
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        # simplejwt's JWTAuthentication, minus the user lookup (users.tokens)
+        'users.authentication.ClaimsJWTAuthentication',
         'rest_framework.authentication.TokenAuthentication',
     ],
     'DEFAULT_PERMISSION_CLASSES': [
@@ -90,12 +93,131 @@ REST_FRAMEWORK = {
     ],
 }
 
+# Keyset pagination for issue listings
+ISSUE_PAGE_SIZE = 25
+ISSUE_MAX_PAGE_SIZE = 100
+
+# Upper bound on issue ids per bulk assign / status request
+ISSUE_BULK_MAX_IDS = 1000
+
+# Rows fetched per round trip by streaming exports
+EXPORT_CHUNK_SIZE = 2000
+
+# Delta sync (issues/changes/): rows per batch and watermark rewind
+ISSUE_SYNC_BATCH_SIZE = 500
+ISSUE_SYNC_OVERLAP_SECONDS = 2
+
+# Caches. Dashboard payloads use their own alias: process-local memory by
+# default, or a shared Redis cache when DASHBOARD_CACHE_URL is set (needed for
+# invalidation to reach every worker process; uses the redis package).
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'dashboard': {
+        'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+        'LOCATION': os.environ['DASHBOARD_CACHE_URL'],
+    } if os.environ.get('DASHBOARD_CACHE_URL') else {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'dashboard',
+        'OPTIONS': {'MAX_ENTRIES': 10000},
+    },
+}
+DASHBOARD_CACHE_ALIAS = 'dashboard'
+DASHBOARD_CACHE_TIMEOUT = 300
+# Lifetime of the cached notification recipient sets (api.recipients) and
+# catalog lists (api.catalog). Without DASHBOARD_CACHE_URL a write only
+# invalidates the copies of the process that made it; this bounds how long
+# other web workers and the run_tasks worker keep serving stale ones.
+RECIPIENT_CACHE_TIMEOUT = 60
+CATALOG_CACHE_TIMEOUT = 60
+
+# Browser/proxy lifetime of the public college, department and course lists
+# (api.catalog); they are revalidated with their ETag afterwards
+CATALOG_CACHE_MAX_AGE = 3600
+
+# Background tasks (api.tasks). They run in-process once the enqueuing
+# transaction commits unless TASKS_EAGER=0, which needs a `manage.py run_tasks`
+# worker running next to the web server (see README).
+TASKS_EAGER = os.environ.get('TASKS_EAGER', '1') == '1'
+TASK_MAX_ATTEMPTS = 5
+TASK_BACKOFF_BASE_SECONDS = 10
+TASK_BACKOFF_MAX_SECONDS = 3600
+TASK_LOCK_TIMEOUT_SECONDS = 600
+TASK_RETENTION_DAYS = 7
+# Run by a resident worker, or by `manage.py run_tasks --once` from cron when
+# there is none (see README)
+TASK_PERIODIC = {
+    # Corrects any drift in the incrementally maintained counters
+    'rebuild-statistics': {'task': 'api.rebuild_statistics', 'every': 24 * 3600},
+    'prune-tasks': {'task': 'api.prune_tasks', 'every': 3600},
+    'notification-retention': {'task': 'api.enforce_notification_retention', 'every': 24 * 3600},
+    # Builds each day's/week's digests once the period is over, then sends
+    'email-digests': {'task': 'api.deliver_email_digests', 'every': 3600},
+}
+
+# Notification inbox pages and batched mark-as-read
+NOTIFICATION_PAGE_SIZE = 25
+NOTIFICATION_MAX_PAGE_SIZE = 100
+NOTIFICATION_MARK_READ_MAX_IDS = 1000
+
+# Notification retention (manage.py prune_notifications): days read and
+# unread rows are kept per type, None to keep them forever
+NOTIFICATION_RETENTION = {
+    'default': {'read': 30, 'unread': 180},
+    'ISSUE_CREATED': {'read': 14, 'unread': 90},
+}
+# Only the latest of these is kept per issue and recipient
+NOTIFICATION_COLLAPSE_TYPES = ('STATUS_CHANGED', 'STATUS_UPDATE')
+# Move expired rows to NotificationArchive instead of deleting them
+NOTIFICATION_ARCHIVE = os.environ.get('NOTIFICATION_ARCHIVE') == '1'
+NOTIFICATION_RETENTION_BATCH_SIZE = 1000
+
+# Email (console backend unless configured, e.g.
+# EMAIL_BACKEND=django.core.mail.backends.smtp.EmailBackend)
+EMAIL_BACKEND = os.environ.get('EMAIL_BACKEND', 'django.core.mail.backends.console.EmailBackend')
+EMAIL_HOST = os.environ.get('EMAIL_HOST', 'localhost')
+EMAIL_PORT = int(os.environ.get('EMAIL_PORT', 25))
+EMAIL_HOST_USER = os.environ.get('EMAIL_HOST_USER', '')
+EMAIL_HOST_PASSWORD = os.environ.get('EMAIL_HOST_PASSWORD', '')
+EMAIL_USE_TLS = os.environ.get('EMAIL_USE_TLS') == '1'
+DEFAULT_FROM_EMAIL = os.environ.get('DEFAULT_FROM_EMAIL', 'webmaster@localhost')
+
+# Notification digests (api.digests): frequency per role, None for no email
+EMAIL_DIGEST_FREQUENCIES = {
+    'ADMIN': 'WEEKLY',
+    'HOD': 'DAILY',
+    'LECTURER': 'DAILY',
+    'STUDENT': 'DAILY',
+}
+EMAIL_DIGEST_CHUNK_SIZE = 2000
+EMAIL_DIGEST_MAX_ITEMS = 20
+# Digests sent per connection
+EMAIL_BATCH_SIZE = 100
+EMAIL_MAX_ATTEMPTS = 3
+
+# Live notification stream (notifications/stream/). It streams when served
+# over ASGI (uvicorn, see README); under WSGI clients poll every interval
+SSE_POLL_INTERVAL_SECONDS = 2
+SSE_HEARTBEAT_SECONDS = 15
+SSE_BATCH_SIZE = 500
+# Lifetime of the ?ticket= issued by notifications/stream/ticket/
+SSE_TICKET_SECONDS = 60
+
 # JWT Settings
 from datetime import timedelta
 SIMPLE_JWT = {
     "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
+    # Embed role, is_staff, department_id and the token version
+    "TOKEN_OBTAIN_SERIALIZER": "users.tokens.ClaimsTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.tokens.ClaimsTokenRefreshSerializer",
 }
+# Token versions are cached here; with a cache shared by all workers, role
+# changes and deactivations revoke tokens immediately, otherwise within
+# TOKEN_VERSION_CACHE_SECONDS
+TOKEN_VERSION_CACHE_ALIAS = 'dashboard'
+TOKEN_VERSION_CACHE_SECONDS = 60
 
 # CORS settings
 # For development only - allows all origins (not recommended for production)
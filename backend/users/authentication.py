@@ -0,0 +1,33 @@
+# backend/users/authentication.py
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+
+from .models import User
+from .tokens import CLAIMS, VERSION_CLAIM, current_token_version
+
+
+class ClaimsJWTAuthentication(JWTAuthentication):
+    """
+    JWT authentication that builds ``request.user`` from the token's claims
+    (see ``users.tokens``) instead of loading it: checking the token version
+    is a cache lookup. Tokens issued without claims load the user as usual.
+    """
+    def get_user(self, validated_token):
+        if VERSION_CLAIM not in validated_token:
+            return super().get_user(validated_token)
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        version = current_token_version(user_id)
+        if version is None:
+            raise AuthenticationFailed(_("User not found or inactive"), code="user_inactive")
+        if version != validated_token[VERSION_CLAIM]:
+            raise InvalidToken(_("Token claims are out of date"))
+        return User.from_claims(
+            id=user_id, is_active=True, token_version=version,
+            **{name: validated_token.get(name) for name in CLAIMS},
+        )
@@ -75,6 +75,10 @@ class User(AbstractUser):
         null=True,
         blank=True
     )
+    # Bumped whenever a claim embedded in access tokens changes; see users.tokens
+    token_version = models.PositiveIntegerField(default=0, editable=False)
+    # Validates issue responses that nest the user (api.conditional)
+    updated_at = models.DateTimeField(auto_now=True)
     
     USERNAME_FIELD = 'email'  # Use email for authentication
     REQUIRED_FIELDS = []  # Email is already required
@@ -93,5 +97,25 @@ class User(AbstractUser):
     def is_admin(self):
         return self.role == self.Role.ADMIN
 
+    @classmethod
+    def from_claims(cls, **claims):
+        """
+        A user built from access-token claims (``users.authentication``)
+        without reading the database. Only the claimed fields are loaded; the
+        first access to any other field loads all of them with one query.
+        """
+        names = [field.attname for field in cls._meta.concrete_fields if field.attname in claims]
+        user = cls.from_db(None, names, [claims[name] for name in names])
+        user._load_deferred_together = True
+        return user
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        if getattr(self, '_load_deferred_together', False) and fields is not None:
+            deferred = self.get_deferred_fields()
+            if deferred and set(fields) <= deferred:
+                # Every field, so the row loaded for the refresh has no deferred fields either
+                fields = [field.attname for field in self._meta.concrete_fields]
+        super().refresh_from_db(using, fields, from_queryset)
+
     def __str__(self):
-        return f"{self.email} - {self.get_role_display()}"
\ No newline at end of file
+        return f"{self.email} - {self.get_role_display()}"
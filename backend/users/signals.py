@@ -0,0 +1,38 @@
+# backend/users/signals.py
+from django.db.models import F
+from django.db.models.signals import post_init, post_save
+from django.dispatch import receiver
+
+from .models import User
+from .tokens import forget_token_version
+
+# Fields whose change invalidates the user's tokens (see users.tokens)
+TOKEN_FIELDS = ('role', 'is_staff', 'department_id', 'is_active', 'password')
+# save(update_fields=...) may name the department by field or attribute name
+_TOKEN_FIELD_NAMES = {*TOKEN_FIELDS, 'department'}
+
+
+def _token_state(user):
+    # Read from __dict__ so deferred fields are not loaded; None when unknown
+    values = user.__dict__
+    if not set(TOKEN_FIELDS) <= values.keys():
+        return None
+    return tuple(values[name] for name in TOKEN_FIELDS)
+
+
+@receiver(post_init, sender=User)
+def remember_token_state(sender, instance, **kwargs):
+    instance._loaded_token_state = _token_state(instance)
+
+
+@receiver(post_save, sender=User)
+def bump_token_version(sender, instance, created, update_fields=None, **kwargs):
+    state = _token_state(instance)
+    if created or (update_fields is not None and not _TOKEN_FIELD_NAMES & set(update_fields)):
+        instance._loaded_token_state = state
+        return
+    if state is None or state != instance._loaded_token_state:
+        User.objects.filter(pk=instance.pk).update(token_version=F('token_version') + 1)
+        instance.refresh_from_db(fields=['token_version'])
+        forget_token_version(instance.pk)
+    instance._loaded_token_state = state
@@ -1,3 +1,96 @@
+from django.core.cache import caches
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
 
-# Create your tests here.
+from .models import User
+from .tokens import ClaimsRefreshToken, VERSION_CLAIM
+
+
+class UserListTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.users = [
+            User.objects.create_user(f'user{i}@example.com', 'pw', role='STUDENT') for i in range(30)
+        ]
+
+    def setUp(self):
+        for cache in caches.all():
+            cache.clear()
+
+    def test_keyset_pages(self):
+        client = APIClient()
+        client.force_authenticate(self.users[0])
+        seen, url = [], '/api/users/users/'
+        while url:
+            response = client.get(url)
+            self.assertEqual(response.status_code, 200)
+            self.assertLessEqual(len(response.data['results']), 25)
+            seen.extend(user['id'] for user in response.data['results'])
+            url = response.data['next']
+        self.assertEqual(seen, [user.pk for user in self.users])
+
+
+class TokenInvalidationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('student@example.com', 'pw', role='STUDENT')
+
+    def setUp(self):
+        # Token versions are cached; the cache is only cleared on commit
+        for cache in caches.all():
+            cache.clear()
+
+    def get_me(self, access):
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        return client.get('/api/users/me/')
+
+    def change_user(self, **fields):
+        user = User.objects.get(pk=self.user.pk)
+        for name, value in fields.items():
+            setattr(user, name, value)
+        with self.captureOnCommitCallbacks(execute=True):
+            user.save()
+        return user
+
+    def test_role_change_invalidates_tokens(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        self.assertEqual(self.get_me(refresh.access_token).status_code, 200)
+
+        user = self.change_user(role='LECTURER')
+        self.assertEqual(user.token_version, self.user.token_version + 1)
+        self.assertEqual(self.get_me(refresh.access_token).status_code, 401)
+
+        response = self.get_me(ClaimsRefreshToken.for_user(user).access_token)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['role'], 'LECTURER')
+
+    def test_refresh_stamps_current_claims(self):
+        refresh = ClaimsRefreshToken.for_user(self.user)
+        user = self.change_user(role='LECTURER')
+
+        response = APIClient().post('/api/users/token/refresh/', {'refresh': str(refresh)}, format='json')
+        self.assertEqual(response.status_code, 200)
+        access = ClaimsRefreshToken.access_token_class(response.data['access'])
+        self.assertEqual(access['role'], 'LECTURER')
+        self.assertEqual(access[VERSION_CLAIM], user.token_version)
+        self.assertEqual(self.get_me(response.data['access']).status_code, 200)
+
+    def test_other_changes_keep_tokens(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        user = self.change_user(first_name='Ada')
+        self.assertEqual(user.token_version, self.user.token_version)
+        self.assertEqual(self.get_me(access).status_code, 200)
+
+    def test_authentication_does_not_load_the_user(self):
+        access = ClaimsRefreshToken.for_user(self.user).access_token
+        self.get_me(access)
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f'Bearer {access}')
+        # The token version is cached; the claims stand in for the user row
+        with CaptureQueriesContext(connection) as queries:
+            response = client.get('/api/notifications/')
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse([query for query in queries if User._meta.db_table in query['sql']])
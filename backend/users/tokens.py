@@ -0,0 +1,80 @@
+# backend/users/tokens.py
+"""
+JWT claims.
+
+Tokens carry the user's ``role``, ``is_staff`` and ``department_id``, so
+``users.authentication.ClaimsJWTAuthentication`` can authorise requests
+without loading the user, plus ``ver``, the user's ``token_version``. The
+version is bumped (``users.signals``) whenever one of those claims, the
+password or ``is_active`` changes. Authentication then rejects older tokens
+as soon as it sees the new version: immediately with a shared cache, within
+``TOKEN_VERSION_CACHE_SECONDS`` otherwise. Refreshing re-reads the claims
+from the user's current row.
+"""
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import AccessToken, RefreshToken
+
+TOKEN_VERSION_CACHE_ALIAS = getattr(settings, 'TOKEN_VERSION_CACHE_ALIAS', 'default')
+TOKEN_VERSION_CACHE_SECONDS = getattr(settings, 'TOKEN_VERSION_CACHE_SECONDS', 60)
+
+CLAIMS = ('role', 'is_staff', 'department_id')
+VERSION_CLAIM = 'ver'
+
+# Cached for users that are missing or inactive
+_NO_VERSION = -1
+
+
+def add_claims(token, user):
+    for name in CLAIMS:
+        token[name] = getattr(user, name)
+    token[VERSION_CLAIM] = user.token_version
+    return token
+
+
+def _version_key(user_id):
+    return f'auth:token-version:{user_id}'
+
+
+def current_token_version(user_id):
+    """The user's token version, or None when the user is missing or inactive."""
+    cache = caches[TOKEN_VERSION_CACHE_ALIAS]
+    version = cache.get(_version_key(user_id))
+    if version is None:
+        version = get_user_model().objects.filter(pk=user_id, is_active=True).values_list(
+            'token_version', flat=True
+        ).first()
+        version = _NO_VERSION if version is None else version
+        cache.add(_version_key(user_id), version, timeout=TOKEN_VERSION_CACHE_SECONDS)
+    return None if version == _NO_VERSION else version
+
+
+def forget_token_version(user_id):
+    """Drop the cached version once the current transaction commits."""
+    transaction.on_commit(lambda: caches[TOKEN_VERSION_CACHE_ALIAS].delete(_version_key(user_id)))
+
+
+class ClaimsRefreshToken(RefreshToken):
+    @classmethod
+    def for_user(cls, user):
+        return add_claims(super().for_user(user), user)
+
+
+class ClaimsTokenObtainPairSerializer(TokenObtainPairSerializer):
+    token_class = ClaimsRefreshToken
+
+
+class ClaimsTokenRefreshSerializer(TokenRefreshSerializer):
+    """Refresh, stamping the new tokens with the user's current claims."""
+    def validate(self, attrs):
+        data = super().validate(attrs)
+        access = AccessToken(data['access'], verify=False)
+        user = get_user_model().objects.get(**{api_settings.USER_ID_FIELD: access[api_settings.USER_ID_CLAIM]})
+        data['access'] = str(add_claims(access, user))
+        if 'refresh' in data:
+            data['refresh'] = str(add_claims(RefreshToken(data['refresh'], verify=False), user))
+        return data
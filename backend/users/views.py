@@ -3,13 +3,15 @@ from rest_framework import status, generics
 from rest_framework import serializers
 from rest_framework.views import APIView
 from rest_framework.response import Response
-from rest_framework_simplejwt.tokens import RefreshToken
 from rest_framework.generics import RetrieveAPIView
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.exceptions import NotFound
 
+from api.pagination import KeysetPagination
+
 from .models import User
 from .serializers import UserSerializer, RegistrationSerializer
+from .tokens import ClaimsRefreshToken
 
 class UserInfoView(RetrieveAPIView):
     serializer_class = UserSerializer
@@ -21,12 +23,16 @@ class UserInfoView(RetrieveAPIView):
             raise NotFound("User not found.")
         return user
 
+class UserCursorPagination(KeysetPagination):
+    ordering = ('id',)
+
 class UserListView(generics.ListAPIView):
     serializer_class = UserSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = UserCursorPagination
 
     def get_queryset(self):
-        return User.objects.all()
+        return User.objects.order_by('id')
 
 class RegistrationView(APIView):
     permission_classes = [AllowAny]
@@ -43,7 +49,7 @@ class RegistrationView(APIView):
                 user.save()
                 
                 # Generate tokens for immediate login
-                refresh = RefreshToken.for_user(user)
+                refresh = ClaimsRefreshToken.for_user(user)
                 
                 return Response({
                     'message': 'User registered successfully',
@@ -111,7 +111,7 @@ const Admin = ({ user }) => {
       setIsLoading(true);
       const data = await getAdminDashboard();
       setDashboardData(data);
-      setUsers(data.users || []);
+      setUsers(await getUsers());
       setDept(data.departments || []);
       setStatisticsData(data.statistics || null);
     } catch (error) {
@@ -1175,13 +1175,7 @@ const Issues = () => {
     const fetchIssues = async () => {
       setIsLoading(true);
       try {
-        const response = await fetch('http://localhost:8000/api/issues/', {
-          headers: {
-            'Authorization': `Bearer ${localStorage.getItem('access_token')}`
-          }
-        });
-        const data = await response.json();
-        setIssues(data);
+        setIssues(await getIssues());
       } catch (error) {
         console.error('Error fetching issues:', error);
       } finally {
@@ -45,7 +45,8 @@ import {
   getLecturerIssues,
   logout,
   getDepartments,
-  getUsers
+  getUsers,
+  getAllPages
 } from '../../services/api';
 import Popper from "@mui/material/Popper";
 import Paper from "@mui/material/Paper";
@@ -355,19 +356,8 @@ const HeadOfDepartment = ({ user }) => {
       
       // Try to get department issues directly
       try {
-        const issuesResponse = await fetch(`http://localhost:8000/api/department/${deptId}/issues/`, {
-          headers: {
-            'Authorization': `Bearer ${localStorage.getItem('access_token')}`
-          }
-        });
-        
-        if (issuesResponse.ok) {
-          departmentIssues = await issuesResponse.json();
-          console.log("Direct API call for department issues successful:", departmentIssues);
-        } else {
-          console.warn("Direct API call for department issues failed:", issuesResponse.status);
-          errors.push("Failed to fetch department issues directly");
-        }
+        departmentIssues = await getAllPages(`/department/${deptId}/issues/`);
+        console.log("Direct API call for department issues successful:", departmentIssues);
       } catch (issuesError) {
         console.error("Error fetching department issues directly:", issuesError);
         errors.push(`Error fetching department issues: ${issuesError.message}`);
@@ -582,19 +572,9 @@ const HeadOfDepartment = ({ user }) => {
       
       // First try using the direct API call
       try {
-        const response = await fetch(`http://localhost:8000/api/users/${staffId}/issues/`, {
-          headers: {
-            'Authorization': `Bearer ${localStorage.getItem('access_token')}`
-          }
-        });
-        
-        if (response.ok) {
-          const data = await response.json();
-          console.log("Successfully fetched staff issues via direct API:", data);
-          return data;
-        } else {
-          console.warn("Direct API for staff issues failed with status:", response.status);
-        }
+        const data = await getAllPages(`/users/${staffId}/issues/`);
+        console.log("Successfully fetched staff issues via direct API:", data);
+        return data;
       } catch (directError) {
         console.error("Error with direct staff issues API call:", directError);
       }
@@ -639,20 +619,10 @@ const HeadOfDepartment = ({ user }) => {
       
       // Try the direct API endpoint first
       try {
-        const response = await fetch(`http://localhost:8000/api/users/${staffId}/issues/`, {
-          headers: {
-            'Authorization': `Bearer ${localStorage.getItem('access_token')}`
-          }
-        });
-        
-        if (response.ok) {
-          const data = await response.json();
-          console.log("Direct API call for staff issues successful:", data);
-          setStaffIssues(data);
-          return;
-        } else {
-          console.warn("Direct API call for staff issues failed:", response.status);
-        }
+        const data = await getAllPages(`/users/${staffId}/issues/`);
+        console.log("Direct API call for staff issues successful:", data);
+        setStaffIssues(data);
+        return;
       } catch (error) {
         console.error("Error with direct API call:", error);
       }
@@ -361,20 +361,8 @@ const DashboardContent = ({ user }) => {
     const fetchAssignedIssues = async () => {
       setIsLoading(true);
       try {
-        // Direct API call to get issues endpoint
-        // The backend will filter based on the current user being a lecturer
-        const response = await fetch('http://localhost:8000/api/issues/', {
-          headers: {
-            'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
-            'Content-Type': 'application/json'
-          }
-        });
-        
-        if (!response.ok) {
-          throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
+        // The backend filters the issues endpoint to the current lecturer
+        const data = await getIssues();
         console.log("Fetched assigned issues:", data);
         
         setAssignedIssues(data);
@@ -871,25 +859,14 @@ const Issues = ({ user }) => {
       
       try {
         // Use the issues endpoint directly - it will filter based on user permissions
-        const response = await fetch('http://localhost:8000/api/issues/', {
-          headers: {
-            'Authorization': `Bearer ${localStorage.getItem('access_token')}`,
-            'Content-Type': 'application/json'
-          }
-        });
-        
-        if (!response.ok) {
-          throw new Error(`HTTP error! status: ${response.status}`);
-        }
-        
-        const data = await response.json();
-        console.log("Fetched issues for Issues component:", data);
+        const issues = await getIssues();
+        console.log("Fetched issues for Issues component:", issues);
         
         // Ensure we have an array of issues
-        if (Array.isArray(data)) {
-          setAssignedIssues(data);
+        if (Array.isArray(issues)) {
+          setAssignedIssues(issues);
         } else {
-          console.error("Unexpected data format:", data);
+          console.error("Unexpected data format:", issues);
           setError("Received unexpected data format from server");
         }
       } catch (error) {
@@ -78,6 +78,18 @@ api.interceptors.response.use(
   }
 );
 
+// Listings (issues, users) are keyset-paginated: { next, previous, results }.
+// Follow `next` to the last page and return every result.
+export const getAllPages = async (url) => {
+  let response = await api.get(url, { params: { page_size: 100 } });
+  const results = [...response.data.results];
+  while (response.data.next) {
+    response = await api.get(response.data.next);
+    results.push(...response.data.results);
+  }
+  return results;
+};
+
 export const register = async (userData) => {
   try {
     const response = await axios.post(`${API_URL}/users/register/`, userData);
@@ -227,8 +239,7 @@ export const getAdminDashboard = async () => {
 // services/api.js (or your API utility file)
 export const getUsers = async () => {
   try {
-    const response = await api.get("/users/users/");
-    return response.data;
+    return await getAllPages("/users/users/");
   } catch (error) {
     console.error("Error fetching users:", error);
     return [];
@@ -275,8 +286,7 @@ export const deleteUser = async (userId) => {
 
 export const getLecturers = async () => {
   try {
-    const response = await api.get("/users/users/");
-    const data = response.data;
+    const data = await getAllPages("/users/users/");
     // Filter the data to only include lecturers
     const lecturers = data.filter((user) => user.role === "LECTURER");
     return lecturers;
@@ -380,8 +390,7 @@ export const deleteDepartment = async (departmentId) => {
 export const getIssues = async () => {
   try {
     // Use the api instance which already has token handling
-    const response = await api.get("/issues/");
-    return response.data;
+    return await getAllPages("/issues/");
   } catch (error) {
     console.error("Error fetching issues:", error);
     throw error;
@@ -462,16 +471,9 @@ export const getDepartmentIssues = async (departmentId) => {
     console.log(`Fetching issues for department ${deptId}`);
     
     // Fetch all issues from the API
-    const response = await api.get("/issues/");
-    
-    if (!response.data) {
-      console.error('No issue data received from API');
-      throw new Error('No data received from API');
-    }
-    
-    console.log(`Received ${response.data.length} issues from API`);
-    
-    const allIssues = response.data;
+    const allIssues = await getAllPages("/issues/");
+
+    console.log(`Received ${allIssues.length} issues from API`);
     
     // Filter issues related to the department
     // This filters issues where:
@@ -601,17 +603,12 @@ export const getDepartmentStaff = async (departmentId) => {
     console.log(`Fetching staff for department ${deptId}`);
     
     // Get all users/staff
-    const response = await api.get("/users/users/");
-    
-    if (!response.data) {
-      console.error('No user data received from API');
-      throw new Error('No data received from API');
-    }
+    const users = await getAllPages("/users/users/");
     
-    console.log(`Received ${response.data.length} users from API`);
+    console.log(`Received ${users.length} users from API`);
     
     // Filter for staff in this department with LECTURER or HOD role
-    const departmentStaff = response.data.filter(user => {
+    const departmentStaff = users.filter(user => {
       // For debugging
       console.log(`Checking user:`, {
         userId: user.id,
@@ -1091,14 +1088,10 @@ export const getLecturerIssues = async (lecturerId) => {
     console.log(`Fetching issues for lecturer ${lecturerId}`);
     
     // Fetch all issues from the API
-    const response = await api.get("/issues/");
-    
-    if (!response.data) {
-      throw new Error('No data received from API');
-    }
+    const allIssues = await getAllPages("/issues/");
     
     // Filter issues assigned to this lecturer
-    const assignedIssues = response.data.filter(issue => {
+    const assignedIssues = allIssues.filter(issue => {
       // Check if assigned_to is this lecturer
       return (
         (issue.assigned_to?.id === parseInt(lecturerId)) || 